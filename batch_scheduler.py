@@ -0,0 +1,194 @@
+import math
+from fractions import Fraction
+import numpy as np
+import scheduler as sc
+
+class BatchScheduler(object):
+    '''在同一处理器平台上同步模拟多组任务集的EDF调度
+    调度语义与 scheduler.Scheduler.run() 完全相同，但状态保存在按任务集填充对齐的 NumPy 数组中，
+    EDF 优先级排序、处理器分配和调度事件推进都对整批任务集向量化进行。
+    数组形状均为 (任务集数量, 最大任务数量)，不足的位置用 valid=False 填充
+    Attributes:
+        speeds:             处理器速度，按降序排序
+        scalar_threshold:   尚未得出结果的任务集少于这一数量时，向量化的每步开销不再划算，
+                            剩余任务集从当前状态起改用 Scheduler 的 "event_queue" 引擎逐个模拟
+        exact:              精确时间模式（见 SimulationContext），处理器速度和任务执行工作量放大 speed_scale 倍后都为整数。
+                            数组中的值都是小于 2**53 的整数，float64 的运算没有舍入误差；
+                            放大后超出这一范围的任务集改用 Scheduler 以 Python 整数逐个模拟
+        processor_speeds:   逐个模拟时 Processor 使用的速度，精确时间模式下为 int
+    '''
+    EXACT_FLOAT_LIMIT = 2 ** 53     # float64 能精确表示所有整数的上限
+
+    def __init__(self, speeds, scalar_threshold: int = 8, exact: bool = False):
+        self.exact = exact
+        self.speed_scale = 1
+        if exact:
+            speeds, self.speed_scale = sc.integer_speeds(speeds)
+        self.speeds = np.sort(np.asarray(speeds, dtype=np.float64))[::-1]
+        self.processor_speeds = sorted(speeds, reverse=True) if exact else self.speeds.tolist()
+        self.scalar_threshold = scalar_threshold
+        self.terminations = []      # 上一次模拟中每组任务集模拟结束的原因
+
+    def run(self, task_sets, truncated_lcm=-1, horizon: str = "fixed") -> np.ndarray:
+        '''模拟对多组任务集进行调度
+        task_sets:
+            每个元素是一组任务的 (e, d, T) 序列，任务的先后顺序用于期限相同时打破平局，与 Scheduler.add_task() 的顺序相同
+        horizon:
+            与 Scheduler.run() 相同。"adaptive" 下总利用率超过平台总速度的任务集不再模拟；
+            含有期限大于周期的任务的任务集需要比较系统状态，逐个用 Scheduler 模拟
+        返回一个布尔数组，每个元素对应一组任务集，可实时调度为True，不可实时调度为False。
+        每组任务集模拟结束的原因保存在 self.terminations 中，见 Scheduler.TERMINATIONS
+        '''
+        if horizon not in sc.Scheduler.HORIZONS:
+            raise ValueError(f"unknown simulation horizon: {horizon}")
+
+        batch_size = len(task_sets)
+        feasible = np.zeros(batch_size, dtype=bool)
+        self.terminations = [None] * batch_size
+        task_sets = [np.asarray(task_set, dtype=np.float64).reshape(-1, 3) for task_set in task_sets]
+
+        selected = []   # 需要同步模拟的任务集序号
+        total_speed = sum(Fraction(speed) for speed in self.processor_speeds) / self.speed_scale
+        for b, rows in enumerate(task_sets):
+            if horizon == "adaptive":
+                if sum(Fraction(e) / Fraction(T) for e, _, T in rows.tolist()) > total_speed:
+                    self.terminations[b] = "overload"
+                    continue
+                if np.any(rows[:, 1] > rows[:, 2]):
+                    feasible[b] = self.run_single(rows, truncated_lcm, horizon, b)
+                    continue
+            if self.exact and not self.exact_in_float(rows, truncated_lcm):
+                feasible[b] = self.run_single(rows, truncated_lcm, horizon, b)
+                continue
+            selected.append(b)
+        if not selected:
+            return feasible
+
+        max_tasks = max(len(task_sets[b]) for b in selected)
+        valid = np.zeros((len(selected), max_tasks), dtype=bool)
+        execution_time = np.zeros((len(selected), max_tasks))
+        deadline = np.zeros((len(selected), max_tasks))
+        period = np.zeros((len(selected), max_tasks))
+        lcm_period = np.empty(len(selected))
+        for row, b in enumerate(selected):
+            rows = task_sets[b]
+            valid[row, :len(rows)] = True
+            execution_time[row, :len(rows)], deadline[row, :len(rows)], period[row, :len(rows)] = rows.T
+            lcm_period[row] = math.lcm(*(int(T) for T in rows[:, 2]))
+        execution_time *= self.speed_scale
+
+        # 每个任务集的模拟时长为其周期的最小公倍数，并按 truncated_lcm 截断。
+        # "adaptive" 下剩余的任务集都是同时到达的约束期限任务集，模拟完一个超周期后的系统状态必然与开始时相同
+        limit = lcm_period if truncated_lcm < 0 else np.minimum(lcm_period, truncated_lcm)
+
+        remaining_time = np.where(valid, execution_time, 0.0)                   # 剩余执行工作量
+        abs_deadline = np.where(valid, deadline, np.inf)                        # 绝对期限
+        arrival_timepoint = np.where(valid, 0.0, np.inf)                        # 到达时刻
+        current_timepoint = np.zeros(len(selected))
+        batch_index = np.array(selected)                                        # 当前数组的行对应的任务集序号
+
+        num_of_processors = min(len(self.speeds), max_tasks)
+        speeds = self.speeds[:num_of_processors]
+
+        while batch_index.size:
+            now = current_timepoint[:, None]
+
+            # 检查是否存在任务已超出期限，以及是否已模拟到截断时刻。填充位置的期限和到达时刻为 inf，不会被选中
+            missed = (now >= abs_deadline).any(axis=1)
+            finished = ~missed & (current_timepoint > limit)
+            feasible[batch_index[finished]] = True
+            for b in batch_index[missed]:
+                self.terminations[b] = "deadline_miss"
+            for b, complete in zip(batch_index[finished], (limit == lcm_period)[finished]):
+                self.terminations[b] = "hyperperiod" if complete else "truncated"
+            running = ~(missed | finished)
+
+            # 已得出结果的任务集不再参与模拟，压缩数组
+            if not running.all():
+                batch_index = batch_index[running]
+                valid, execution_time, deadline, period = valid[running], execution_time[running], deadline[running], period[running]
+                remaining_time, abs_deadline = remaining_time[running], abs_deadline[running]
+                arrival_timepoint, current_timepoint = arrival_timepoint[running], current_timepoint[running]
+                limit = limit[running]
+                lcm_period = lcm_period[running]
+                now = current_timepoint[:, None]
+
+            if batch_index.size < self.scalar_threshold:
+                for row, b in enumerate(batch_index):
+                    feasible[b] = self.run_scalar(execution_time[row], deadline[row], period[row], remaining_time[row],
+                                                  abs_deadline[row], arrival_timepoint[row], valid[row],
+                                                  current_timepoint[row], limit[row], b)
+                break
+
+            # 活跃任务按照 (绝对期限, 任务顺序) 排序，排序稳定保证期限相同时顺序靠前的任务优先
+            rows = np.arange(batch_index.size)[:, None]
+            ready = (arrival_timepoint <= now) & (remaining_time > 0)
+            priority = np.where(ready, abs_deadline, np.inf)
+            order = np.argsort(priority, axis=1, kind="stable")[:, :num_of_processors]
+
+            # 将最高优先级的任务依次分配到最快的处理器上，计算每个处理器上任务的结束时刻
+            assigned = ready[rows, order]                                       # (任务集数量, 处理器数量)
+            running_remaining_time = remaining_time[rows, order]
+            end_timepoint = np.where(assigned, np.ceil(running_remaining_time / speeds) + now, np.inf)
+
+            # 下一调度事件为正在运行的作业完成或新作业到达
+            new_arrival = np.where(arrival_timepoint > now, arrival_timepoint, np.inf).min(axis=1)
+            next_schedule_event_timepoint = np.minimum(end_timepoint.min(axis=1), new_arrival)
+            running_time = next_schedule_event_timepoint - current_timepoint
+
+            # 绝对期限早于下一调度事件的作业必然错过期限（见 Scheduler.run()）。这些任务集本步不执行任务，
+            # 使未完成的作业在下一调度事件开始时被检查出错过期限
+            late = next_schedule_event_timepoint > abs_deadline.min(axis=1)
+            assigned &= ~late[:, None]
+
+            # 执行所有处理器上的任务，执行完毕的任务按周期更新为下一个作业
+            running_remaining_time -= np.where(assigned, speeds * running_time[:, None], 0.0)
+            remaining_time[rows, order] = running_remaining_time
+            completed_rows, completed_processors = np.nonzero(assigned & (running_remaining_time <= 0))
+            completed_tasks = order[completed_rows, completed_processors]
+            arrival_timepoint[completed_rows, completed_tasks] += period[completed_rows, completed_tasks]
+            remaining_time[completed_rows, completed_tasks] = execution_time[completed_rows, completed_tasks]
+            abs_deadline[completed_rows, completed_tasks] += period[completed_rows, completed_tasks]
+
+            current_timepoint += running_time
+
+        return feasible
+
+    def exact_in_float(self, rows, truncated_lcm) -> bool:
+        '''精确时间模式下，一组任务集模拟中出现的工作量和时刻是否都小于 EXACT_FLOAT_LIMIT'''
+        periods = [int(T) for T in rows[:, 2]]
+        limit = math.lcm(*periods) if truncated_lcm < 0 else min(math.lcm(*periods), truncated_lcm)
+        # 每次执行的时长不超过最大的相对期限和周期（见 run() 中错过期限的检查），时刻不超过 limit 加上这一时长
+        timepoint_bound = limit + max(periods + [int(d) for d in rows[:, 1]])
+        return (max(int(e) for e in rows[:, 0]) * self.speed_scale < self.EXACT_FLOAT_LIMIT
+                and self.processor_speeds[0] * timepoint_bound < self.EXACT_FLOAT_LIMIT)
+
+    def new_scheduler(self, current_timepoint=0) -> sc.Scheduler:
+        processors = [sc.Processor(f"P{j}", speed=speed) for j, speed in enumerate(self.processor_speeds)]
+        return sc.Scheduler(processors, current_timepoint=current_timepoint, engine="event_queue")
+
+    def run_single(self, rows, truncated_lcm, horizon, b) -> bool:
+        '''用 Scheduler 的 "event_queue" 引擎从头模拟一组任务集'''
+        scheduler = self.new_scheduler()
+        for i, (e, d, T) in enumerate(rows.tolist()):
+            scheduler.add_task(sc.Task(i, arrival_timepoint=0, execution_time=int(e) * self.speed_scale, deadline=d,
+                                       period=int(T)))
+
+        feasible = scheduler.run(truncated_lcm=truncated_lcm, enable_history=False, horizon=horizon)
+        self.terminations[b] = scheduler.termination
+        return feasible
+
+    def run_scalar(self, execution_time, deadline, period, remaining_time, abs_deadline, arrival_timepoint, valid,
+                   current_timepoint, limit, b) -> bool:
+        '''从一组任务集的当前模拟状态起，用 Scheduler 的 "event_queue" 引擎继续模拟'''
+        scheduler = self.new_scheduler(current_timepoint.item())
+        for i in np.flatnonzero(valid):
+            task = sc.Task(i, arrival_timepoint=arrival_timepoint[i].item(), execution_time=execution_time[i].item(),
+                           deadline=deadline[i].item(), period=int(period[i]))
+            task.remaining_time = remaining_time[i].item()
+            task.abs_deadline = abs_deadline[i].item()
+            scheduler.add_task(task)
+
+        feasible = scheduler.run(truncated_lcm=limit.item(), enable_history=False)
+        self.terminations[b] = scheduler.termination
+        return feasible
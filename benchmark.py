@@ -0,0 +1,206 @@
+import scheduler as sc
+import data_generater as data
+from search_options import SearchOptions
+import numpy as np
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from task_store import uunifast
+
+# 基准测试：用固定种子生成的工作负载测量调度模拟和超边搜索的性能
+#   python benchmark.py run -o benchmark.json
+#   python benchmark.py compare baseline.json benchmark.json
+# 每个基准用例由 setup 函数构造，setup 返回一个执行被测工作的函数，只有后者计入耗时和峰值内存。
+# 被测工作返回计数（调度事件数量 events、模拟次数 simulations），用于计算每秒吞吐量
+
+PLATFORM_SPEEDS = [4, 3, 2, 1]                                  # 调度模拟用例的处理器平台
+TASK_SET_SIZES = {"small": 4, "medium": 12, "large": 32}
+HYPERPERIODS = {
+    "short": [10, 20, 25, 50, 100],                             # 周期从中选取，超周期不超过100
+    "long": list(range(10, 200)),                               # 周期随机，超周期极长，模拟到 LONG_HORIZON 截断
+}
+LONG_HORIZON = 20000
+TASK_SETS_PER_CASE = 10                                         # 每个调度模拟用例模拟的任务集数量
+# (处理器数量, 任务数量, 超边最大尺寸, 随机搜索的超边数量)
+GENERATE_HYPEREDGE_CONFIGS = [(4, 20, 5, 20), (6, 20, 6, 20), (3, 14, 7, 20)]
+NOISE_SECONDS = 0.05                                            # 比较结果时，基准耗时低于这一值的用例计时误差太大，不判定耗时退化
+
+def make_task_set(seed: int, number_of_tasks: int, periods: list) -> list:
+    '''生成隐式期限任务集的 (e, d, T)，总利用率为平台总速度的40%'''
+    rng = random.Random(seed)
+    np.random.seed(seed) # task_store.uunifast 使用 numpy 的全局随机数
+    # 归一化利用率以最快的处理器为基准，每个任务的执行时间不超过最快处理器上的一个周期
+    utilizations = uunifast(1, number_of_tasks, 0.4 * sum(PLATFORM_SPEEDS) / PLATFORM_SPEEDS[0])[0] * PLATFORM_SPEEDS[0]
+    task_set = []
+    for utilization in utilizations:
+        period = rng.choice(periods)
+        execution_time = min(max(1, int(utilization * period)), period * PLATFORM_SPEEDS[0])
+        task_set.append((execution_time, period, period))
+    return task_set
+
+def setup_scheduler_run(seed: int, number_of_tasks: int, periods: list, engine: str):
+    task_sets = [make_task_set(seed + i, number_of_tasks, periods) for i in range(TASK_SETS_PER_CASE)]
+
+    def work():
+        events = 0
+        for task_set in task_sets:
+            processors = [sc.Processor(f"P{i}", speed=speed) for i, speed in enumerate(PLATFORM_SPEEDS)]
+            scheduler = sc.Scheduler(processors, engine=engine)
+            for task_id, (e, d, T) in enumerate(task_set):
+                scheduler.add_task(sc.Task(task_id, arrival_timepoint=0, execution_time=e, deadline=d, period=T))
+            scheduler.run(truncated_lcm=LONG_HORIZON, enable_history=False)
+            events += scheduler.events
+        return {"events": events, "simulations": len(task_sets)}
+    return work
+
+def make_data_generator(seed: int, data_path: Path, number_of_processors: int, number_of_tasks: int,
+                        **options) -> data.DataGenerator:
+    dg = data.DataGenerator(seed, data_path, SearchOptions(**options))
+    dg.generate_platform(number_of_processors)
+    dg.generate_tasks(number_of_tasks, implicit_deadline=False)
+    return dg
+
+def setup_judge_feasibility(seed: int, data_path: Path, engine: str, batch: bool):
+    dg = make_data_generator(seed, data_path, 4, 32, engine=engine)
+    rng = random.Random(seed)
+    task_id_sets = [frozenset(rng.sample(range(32), 6)) for _ in range(1000)]
+
+    def work():
+        dg.terminations.clear()
+        if batch:
+            dg.judge_feasibility_batch(task_id_sets)
+        else:
+            for task_id_set in task_id_sets:
+                dg.judge_feasibility(task_id_set)
+        return {"simulations": sum(dg.terminations.values())}
+    return work
+
+def setup_generate_hyperedge(seed: int, data_path: Path, config: tuple):
+    number_of_processors, number_of_tasks, max_hyperedge_size, num_of_hyperedge = config
+
+    def work():
+        # generate_hyperedge 会改变已搜索的超边，每次都重新构造 DataGenerator，使每次的工作量相同
+        dg = make_data_generator(seed, data_path, number_of_processors, number_of_tasks)
+        dg.generate_hyperedge(max_hyperedge_size, num_of_hyperedge)
+        dg.result_sink.close()
+        return {"simulations": sum(dg.terminations.values()), "hyperedges": len(dg.hyperedges)}
+    return work
+
+def benchmark_cases(seed: int, data_path: Path) -> dict:
+    '''所有基准用例，用例名 -> setup 函数'''
+    cases = {}
+    for size, number_of_tasks in TASK_SET_SIZES.items():
+        for hyperperiod, periods in HYPERPERIODS.items():
+            for engine in sc.Scheduler.ENGINES:
+                cases[f"scheduler_run/{size}/{hyperperiod}/{engine}"] = (
+                    lambda n=number_of_tasks, p=periods, e=engine: setup_scheduler_run(seed, n, p, e))
+    for engine in sc.Scheduler.ENGINES:
+        cases[f"judge_feasibility/{engine}"] = (
+            lambda e=engine: setup_judge_feasibility(seed, data_path / "judge_feasibility", e, batch=False))
+    cases["judge_feasibility_batch"] = (
+        lambda: setup_judge_feasibility(seed, data_path / "judge_feasibility_batch", "rescan", batch=True))
+    for config in GENERATE_HYPEREDGE_CONFIGS:
+        cases["generate_hyperedge/p{}_t{}_hs{}_e{}".format(*config)] = (
+            lambda c=config: setup_generate_hyperedge(seed, data_path / "generate_hyperedge", c))
+    return cases
+
+def measure(setup, repeat: int) -> dict:
+    '''执行 repeat 次计时（取最短耗时计算吞吐量），再单独执行一次测量峰值内存（tracemalloc 会拖慢执行，不与计时同时进行）'''
+    durations = []
+    for _ in range(repeat):
+        work = setup()
+        start = time.perf_counter()
+        counts = work()
+        durations.append(time.perf_counter() - start)
+
+    work = setup()
+    tracemalloc.start()
+    work()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = min(durations)
+    result = {"seconds": seconds, "median_seconds": statistics.median(durations), "peak_memory_bytes": peak_memory}
+    result.update(counts)
+    if "events" in counts:
+        result["events_per_second"] = counts["events"] / seconds
+    if "simulations" in counts:
+        result["simulations_per_second"] = counts["simulations"] / seconds
+    return result
+
+def run_benchmarks(seed: int, repeat: int, case_filter: str = None) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as data_path:
+        for name, setup in benchmark_cases(seed, Path(data_path)).items():
+            if case_filter and case_filter not in name:
+                continue
+            results[name] = measure(setup, repeat)
+            print(f"{name:<45} {results[name]['seconds']:>10.4f}s", file=sys.stderr)
+
+    return {
+        "metadata": {
+            "seed": seed,
+            "repeat": repeat,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+        },
+        "results": results,
+    }
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list:
+    '''与基准结果比较，耗时或峰值内存增加超过 threshold（比例）的用例记为性能退化，耗时低于 NOISE_SECONDS 的不判定耗时退化
+    返回 (用例名, 指标, 基准值, 当前值, 变化比例) 的列表
+    '''
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        for metric in ("seconds", "peak_memory_bytes"):
+            before, after = baseline["results"][name][metric], result[metric]
+            change = after / before - 1 if before else math.inf if after else 0.0
+            print(f"{name:<45} {metric:<18} {before:>14.4f} {after:>14.4f} {change:>+8.1%}")
+            if change > threshold and not (metric == "seconds" and before < NOISE_SECONDS):
+                regressions.append((name, metric, before, after, change))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help='执行基准测试，结果保存为 json')
+    run_parser.add_argument('-o', '--output', help='设置结果文件路径', type=str, default="benchmark.json")
+    run_parser.add_argument('-s', '--seed', help='设置随机种子', type=int, default=0)
+    run_parser.add_argument('-r', '--repeat', help='设置每个用例的计时次数', type=int, default=3)
+    run_parser.add_argument('-k', '--filter', help='只执行名称中含有这一字符串的用例', type=str)
+
+    compare_parser = subparsers.add_parser("compare", help='与基准结果比较，存在性能退化时以非0状态退出')
+    compare_parser.add_argument('baseline', help='基准结果文件路径', type=str)
+    compare_parser.add_argument('current', help='当前结果文件路径', type=str)
+    compare_parser.add_argument('-t', '--threshold', help='设置判定为性能退化的耗时或内存增加比例', type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run_benchmarks(args.seed, args.repeat, args.filter)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+        regressions = compare_results(baseline, current, args.threshold)
+        for name, metric, before, after, change in regressions:
+            print(f"REGRESSION {name} {metric}: {before:.4f} -> {after:.4f} ({change:+.1%})")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,39 @@
+import os
+import pickle
+from pathlib import Path
+
+# 长时间运行的超边搜索的检查点
+# 检查点先完整写入同目录下的临时文件并同步到磁盘，再用 os.replace 原子地替换旧的检查点，
+# 进程在任何时刻被终止，磁盘上都只有完整的旧检查点或完整的新检查点
+
+CHECKPOINT_VERSION = 1
+
+def save_checkpoint(file_name: Path, state: dict):
+    '''原子地保存检查点'''
+    temporary_file_name = Path(f"{file_name}.tmp")
+    with open(temporary_file_name, "wb") as file:
+        pickle.dump({"version": CHECKPOINT_VERSION, "state": state}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_file_name, file_name)
+
+def load_checkpoint(file_name: Path):
+    '''读取检查点，不存在或版本不同时返回None'''
+    if not os.path.exists(file_name):
+        return None
+    with open(file_name, "rb") as file:
+        checkpoint = pickle.load(file)
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        return None
+    return checkpoint["state"]
+
+def output_sizes(data_path: Path, file_names) -> dict:
+    '''结果文件当前的字节数，不存在的文件为0'''
+    return {file_name: os.path.getsize(data_path / file_name) if os.path.exists(data_path / file_name) else 0
+            for file_name in file_names}
+
+def truncate_outputs(data_path: Path, sizes: dict):
+    '''将结果文件截断到检查点时的字节数，丢弃检查点之后写入的行'''
+    for file_name, size in sizes.items():
+        if os.path.exists(data_path / file_name):
+            os.truncate(data_path / file_name, size)
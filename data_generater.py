@@ -1,38 +1,111 @@
 import scheduler as sc
+import batch_scheduler as bs
+import checkpoint as cp
+import schedulability_tests as st
+import tracer as tr
 import numpy as np
 import itertools
+from collections import Counter
 import csv
+import json
 import os
+import shutil
 from logger_config import logger
 from pathlib import Path
 from tqdm import tqdm
+from task_set_index import TaskSetIndex
+from feasibility_cache import FeasibilityCache
+from result_sink import ResultSink, save_hypergraph_npz
+from search_options import SearchOptions
+from shard_queue import ShardQueue
+from platform_sweep import PlatformSweep
+from simulation_context import SimulationContext
+from task_store import generate_task_chunk, create_task_store, load_task_store, task_chunks, task_classes
+from visited_set import VisitedSetStore
+import hashlib
 import math
 import random
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 class DataGenerator(object):
-    def __init__(self, seed, data_path:Path):
+    '''
+    options:        搜索的模拟和判定设置，见 SearchOptions，为None时使用默认设置
+    flush_interval: 搜索结果先缓冲在内存中（见 result_sink），设置后由后台线程每隔 flush_interval 秒写入文件
+    checkpoint_interval:
+                    设置后 generate_hyperedge 每隔 checkpoint_interval 秒将搜索状态原子地保存到 data_path / "checkpoint.pkl"（见 checkpoint）
+    resume:         从 data_path 中的检查点继续搜索：保留已写入的结果文件，generate_hyperedge 恢复检查点时的搜索状态和随机数状态，
+                    结果与不中断的搜索完全相同。没有检查点时从头开始
+    sharded:        多个进程协作搜索同一个 data 目录（见 generate_hyperedge_sharded），不清除已有的结果文件
+    platform_sweep: 多平台扫描（见 sweep_platforms）中各平台共享的任务集参数和搜索结果，platform_index 为本平台的序号
+    data_path为None时不读写任何文件，搜索结果只保存在内存中（用于并行搜索的工作进程）
+    '''
+    RESULT_FILES = ("hyperedges.csv", "negative_samples.csv", "minimal_unschedulable_combinations.csv") # data_path 下的搜索结果文件
+    SIMULATION_LIMIT = 1000000  # 模拟时长的上限，超周期更长的任务集模拟到这一时刻即按可调度处理（结束原因为 "truncated"）
+
+    def __init__(self, seed, data_path:Path, options: SearchOptions = None, flush_interval: float = None,
+                 checkpoint_interval: float = None, resume: bool = False, sharded: bool = False):
+        self.seed = seed
         self.processors = []        # 生成的处理器序列，按照 speed 降序排序
         self.tasks: np.ndarray      # tasks是一个 4 * number_of_tasks 的二维数组，row_index为task_id, 
-        self.hyperedges: set = set()
-        self.negative_samples: set = set()
-        self.minimal_unschedulable_combinations: set = set()
+        self.hyperedges: TaskSetIndex = TaskSetIndex()
+        self.negative_samples: set = set()   # 未设置 SearchOptions.visited_memory_limit 时为 set，否则为 VisitedSetStore
+        self.minimal_unschedulable_combinations: TaskSetIndex = TaskSetIndex()
         self.data_path = data_path
+        self.options = options if options is not None else SearchOptions()
+        self.engine_mismatches = 0  # 差分校验中两种引擎结果不一致的次数
+        self.schedulability_tests: st.SchedulabilityTestChain = None # 与当前处理器平台对应的检验序列，首次使用时创建
+        self.simulation_contexts = {}   # 引擎 -> 与当前处理器平台对应的模拟环境，首次使用时创建
+        self.flush_interval = flush_interval
+        self.terminations = Counter()   # 每种模拟结束原因的次数，见 Scheduler.TERMINATIONS
+        self.search_statistics = Counter() # 自底向上搜索与自顶向下搜索各需要的模拟次数，见 search_hyperedge_bottom_up
+        self.feasibility_oracle: dict = None # 自底向上搜索重放时代替模拟的判断结果，见 enumerate_feasible_subsets
+        self.oracle_complete = True     # feasibility_oracle 是否包含全部可调度子集，否则没有判断过的任务集仍需模拟
+        self.task_classes: np.ndarray = None    # 每个任务的等价类序号，(e, d, T) 相同的任务属于同一等价类，首次使用时计算
+        self.multiset_verdicts = {}             # 等价类多重集 -> 是否可调度
+        self.minimal_unschedulable_multisets = set()    # 最小不可调度组合的等价类多重集
+        self.platform_sweep: PlatformSweep = None
+        self.platform_index: int = None
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self.checkpoint_config: dict = None     # 当前搜索的参数，检查点只能由参数相同的搜索恢复，见 generate_hyperedge
+        self.last_checkpoint = time.monotonic()
+        self.miss_records = {}  # 搜索路径上模拟判定为不可调度的任务集 -> 增量模拟其子集所需的记录，见 simulate_incremental
+        self.search_parent: frozenset = None    # search_hyperedge 正在搜索其子集的任务集，即当前任务集在搜索路径上的父任务集
+        self.incremental_paused = False         # 为True时即使启用 incremental 也完整模拟、不保存模拟记录，见 lattice_verdicts
+        self.feasibility_cache: FeasibilityCache = None
+        if self.options.cache_path is not None:
+            # 可能改变结论的设置不同时，缓存的结果分开保存
+            settings = dict(self.options.verdict_settings(), truncated_lcm=self.SIMULATION_LIMIT)
+            variant = ",".join(f"{key}={value}" for key, value in sorted(settings.items()))
+            self.feasibility_cache = FeasibilityCache(self.options.cache_path, self.options.cache_size, variant=variant)
         np.random.seed(seed)
+        random.seed(seed)           # random.sample 用于抽取随机任务集，固定种子使搜索结果可复现
+        self.result_sink: ResultSink = None
+
+        if data_path is None:
+            return
 
         # 如果data目录不存在，则创建它
         if not os.path.exists(data_path):
             os.makedirs(data_path)
 
-        # 清除 data 目录下的 hyperedges.csv 和 negative_samples.csv
-        hyperedges_file = data_path / "hyperedges.csv"
-        negative_samples_file = data_path / "negative_samples.csv"
-        if os.path.exists(hyperedges_file):
-            os.remove(hyperedges_file)
-        if os.path.exists(negative_samples_file):
-            os.remove(negative_samples_file)
+        # 清除 data 目录下的 hyperedges.csv、negative_samples.csv、minimal_unschedulable_combinations.csv 和检查点，
+        # 从检查点继续搜索时保留，由 restore_search_checkpoint 截断到检查点时的位置
+        if not sharded and not (resume and os.path.exists(data_path / "checkpoint.pkl")):
+            for file_name in self.RESULT_FILES + ("checkpoint.pkl",):
+                if os.path.exists(data_path / file_name):
+                    os.remove(data_path / file_name)
+            self.negative_samples = self.create_negative_samples(data_path / "visited")
+            self.negative_samples.clear()   # 删除上一次运行溢出到磁盘的负采样
+
+        self.result_sink = ResultSink(data_path, flush_interval=flush_interval)
 
     def generate_platform(self, processors_number: int, speed_normalization: bool=False):
         """随机生成一组速度不同的异构处理器平台"""
+        self.schedulability_tests = None
+        self.simulation_contexts = {}
         for i in range(0, processors_number):
             processor = sc.Processor(id=f"P{i}", speed=np.random.randint(1, 10))
             self.processors.append(processor)
@@ -51,55 +124,81 @@ class DataGenerator(object):
         return self.processors
     
     def load_platform(self, file_path: Path):
+        self.schedulability_tests = None
+        self.simulation_contexts = {}
         with open(file_path / "platform.csv", "r") as file:
             reader = csv.reader(file)
             for processor_id, processor_speed in reader:
                 processor = sc.Processor(id=processor_id, speed=float(processor_speed))
                 self.processors.append(processor)
+        # 模拟使用独立的处理器副本（见 simulation_context），不会再对 self.processors 排序，这里与 generate_platform 一样排序
+        self.processors.sort(key=lambda processor : processor.speed, reverse=True)
 
         self.save_platform(self.data_path / "platform.csv")
         
         return self.processors
 
-    def generate_tasks(self, number_of_tasks:int, implicit_deadline:bool):
+    def generate_tasks(self, number_of_tasks:int, implicit_deadline:bool, utilization: str = "uniform",
+                       group_size: int = None, total_utilization: float = None):
+        """生成任务池，保存在 self.tasks 中
+        utilization, group_size, total_utilization:
+            归一化利用率的生成方式，见 task_store.generate_utilizations。
+            group_size 默认为处理器数量，total_utilization 默认为处理器归一化后的性能之和 S_m，即每组任务恰好占满处理器平台
+        """
         if not self.processors:
             logger.error(f"platform not generated")
 
-        # 随机生成一列归一化利用率
-        utilization_col = np.random.rand(number_of_tasks).reshape(-1, 1)
-        utilization_col = np.sort(utilization_col, axis=0) # 对生成的利用率排序
+        group_size, total_utilization = self.utilization_group(group_size, total_utilization)
+        fastest_processor_speed = self.processors[0].speed # self.processors按照 speed 降序排序
+        quadruples = generate_task_chunk(number_of_tasks, implicit_deadline, fastest_processor_speed,
+                                         utilization, group_size, total_utilization)
 
-        # 随机生成一列deadline
-        deadline_col = np.random.randint(1, 100, size=number_of_tasks).reshape(-1, 1)
+        self.tasks = quadruples
+        self.task_classes = None
 
-        if implicit_deadline:
-            # 随机生成一列period，需要 period == deadline
-            period_col = np.random.randint(0, 1, size=(number_of_tasks, 1)) + deadline_col
-        else:
-            # 随机生成一列period，需要 period >= deadline
-            period_col = np.random.randint(1, 100, size=(number_of_tasks, 1)) + deadline_col
+        # 保存tasks，只记录一行汇总日志
+        self.save_tasks(self.data_path / "task_quadruples.csv")
+        logger.info(f"generated {number_of_tasks} tasks: {self.data_path / 'task_quadruples.csv'}")
 
+        return quadruples
 
-        # 根据周期和归一化利用率计算出在最慢处理器上测量的执行时间。
-        fastest_processor_speed = self.processors[0].speed # self.processors按照 speed 降序排序
-        exec_time_col = period_col * utilization_col * fastest_processor_speed
-        exec_time_col = np.ceil(exec_time_col)
+    def generate_tasks_chunked(self, number_of_tasks: int, implicit_deadline: bool, chunk_size: int = 100000,
+                               utilization: str = "uniform", group_size: int = None, total_utilization: float = None):
+        """分块生成大规模任务池，每块生成后直接写入 data_path / "task_quadruples.npy" 的内存映射
+        生成完成后 self.tasks 为该文件的只读内存映射，按 task_id 读取任务时只读取对应的行。
+        利用率的参数与 generate_tasks 相同，使用分组的利用率生成方式时 chunk_size 向下取整为 group_size 的整数倍
+        """
+        if not self.processors:
+            logger.error(f"platform not generated")
 
-        quadruples = np.hstack((exec_time_col, deadline_col, period_col, utilization_col))
+        group_size, total_utilization = self.utilization_group(group_size, total_utilization)
+        if utilization != "uniform":
+            chunk_size = max(group_size, chunk_size // group_size * group_size)
+        fastest_processor_speed = self.processors[0].speed
 
-        self.tasks = quadruples
+        file_name = self.data_path / "task_quadruples.npy"
+        store = create_task_store(file_name, number_of_tasks)
+        for start in tqdm(range(0, number_of_tasks, chunk_size), desc="generate tasks"):
+            end = min(start + chunk_size, number_of_tasks)
+            store[start:end] = generate_task_chunk(end - start, implicit_deadline, fastest_processor_speed,
+                                                   utilization, group_size, total_utilization)
+        store.flush()
+        del store
 
-        # 打印生成的任务
-        logger.info("Generated tasks:")
-        for i, quadruple in enumerate(quadruples):
-            e, d, T, u = quadruple
-            logger.info(f"task{i}: \t({e},\t{d},\t{T},\t{u :.2f})")
+        self.tasks = load_task_store(file_name)
+        self.task_classes = None
+        logger.info(f"generated {number_of_tasks} tasks: {file_name}")
 
-        # 保存tasks
-        self.save_tasks(self.data_path / "task_quadruples.csv")
+        return self.tasks
+
+    def utilization_group(self, group_size: int = None, total_utilization: float = None) -> tuple:
+        """分组生成利用率时每组的任务数量和利用率之和，默认为处理器数量和处理器归一化后的性能之和 S_m"""
+        if group_size is None:
+            group_size = len(self.processors)
+        if total_utilization is None:
+            total_utilization = sum(self.platform_speeds()) / self.processors[0].speed
+        return group_size, total_utilization
 
-        return quadruples
-    
     # 保存数据
     def save_tasks(self, file_name:Path=Path("data/task_quadruples.csv")):
         np.savetxt(file_name, self.tasks, delimiter=",")
@@ -116,6 +215,10 @@ class DataGenerator(object):
             for hyperedge in self.hyperedges:
                 writer.writerow([str(node_id) for node_id in hyperedge])
 
+    def save_hypergraph(self, file_name:Path=Path("data/hypergraph.npz")):
+        """以二进制 .npz 保存 节点 × 超边 的 CSR 关联矩阵和任务特征，见 result_sink.save_hypergraph_npz"""
+        save_hypergraph_npz(file_name, self.hyperedges, self.negative_samples, self.tasks)
+
     def save_negative_samples(self, file_name:Path=Path("data/negative_samples.csv")):
         with open(file_name, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
@@ -123,9 +226,19 @@ class DataGenerator(object):
                 writer.writerow([str(node_id) for node_id in negative_sample])
 
     def calculate_system_utilization(self, task_id_set):
+        """计算系统利用率，启用分析器时计入 "utilization" 阶段"""
+        if not self.options.profiler.enabled:
+            return self.compute_system_utilization(task_id_set)
+        with self.options.profiler.stage("utilization"):
+            return self.compute_system_utilization(task_id_set)
+
+    def compute_system_utilization(self, task_id_set):
         """计算系统利用率"""
-        task_id_set = list(task_id_set)
-        sum_of_normalized_utilization = sum(self.tasks[task_id_set][:, 3])
+        if self.platform_sweep is not None:
+            sum_of_normalized_utilization = self.platform_sweep.normalized_utilization(task_id_set, self.processors[0].speed)
+        else:
+            task_id_set = list(task_id_set)
+            sum_of_normalized_utilization = sum(self.tasks[task_id_set][:, 3])
 
         # 求处理器归一化后，所有处理器性能之和 S_m
         fastest_processor_speed = self.processors[0].speed
@@ -135,13 +248,61 @@ class DataGenerator(object):
         return sum_of_normalized_utilization / sum_of_normalized_speed
     
     def has_unschedulable_combination(self, task_id_set):
+        """检查任务集是否含有不可调度组合，启用分析器时计入 "unschedulable_combination_scan" 阶段"""
+        if not self.options.profiler.enabled:
+            return self.scan_unschedulable_combinations(task_id_set)
+        with self.options.profiler.stage("unschedulable_combination_scan"):
+            return self.scan_unschedulable_combinations(task_id_set)
+
+    def scan_unschedulable_combinations(self, task_id_set):
         """检查任务集是否含有不可调度组合，如果存在返回True，否则False"""
-        for combin in self.minimal_unschedulable_combinations:
-            if combin.issubset(task_id_set):
-                return True # 包含不可调度组合
+        if self.minimal_unschedulable_combinations.has_subset(task_id_set):
+            self.options.profiler.hit("unschedulable_combination")
+            return True
+        if self.options.multiset_memo and self.has_unschedulable_multiset(task_id_set):
+            self.search_statistics["multiset_combination_pruned"] += 1
+            self.options.profiler.hit("unschedulable_multiset")
+            return True
         return False
 
+    def get_task_classes(self) -> np.ndarray:
+        """每个任务的等价类序号，(e, d, T) 相同的任务属于同一等价类，内存映射的任务池分块计算，见 task_store.task_classes"""
+        if self.task_classes is None:
+            self.task_classes = task_classes(self.tasks)
+        return self.task_classes
+
+    def multiset_key(self, task_id_set) -> tuple:
+        """任务集的规范键：任务等价类序号的多重集，按升序排列"""
+        return tuple(sorted(self.get_task_classes()[list(task_id_set)].tolist()))
+
+    def has_unschedulable_multiset(self, task_id_set) -> bool:
+        """任务集的等价类多重集是否包含某个最小不可调度组合的多重集
+        从逐个检查已记录的多重集和枚举任务集的子多重集中选择需要比较次数较少的一种
+        """
+        if not self.minimal_unschedulable_multisets:
+            return False
+        key = self.multiset_key(task_id_set)
+        sizes = {len(combination) for combination in self.minimal_unschedulable_multisets if len(combination) <= len(key)}
+        if sum(math.comb(len(key), size) for size in sizes) <= len(self.minimal_unschedulable_multisets):
+            return any(combination in self.minimal_unschedulable_multisets
+                       for size in sizes for combination in itertools.combinations(key, size))
+        classes = Counter(key)
+        return any(not Counter(combination) - classes for combination in self.minimal_unschedulable_multisets)
+
+    def reset_multiset_memo(self):
+        """清空按多重集记录的搜索结果，再由当前的超边和最小不可调度组合重建"""
+        self.multiset_verdicts = {self.multiset_key(task_id_set): True for task_id_set in self.hyperedges}
+        self.minimal_unschedulable_multisets = {self.multiset_key(task_id_set)
+                                                for task_id_set in self.minimal_unschedulable_combinations}
+
     def judge_feasibility(self, task_id_set) -> bool:
+        """判断任务集是否可调度，启用分析器时计入 "judge_feasibility" 阶段"""
+        if not self.options.profiler.enabled:
+            return self.decide_feasibility(task_id_set)
+        with self.options.profiler.stage("judge_feasibility"):
+            return self.decide_feasibility(task_id_set)
+
+    def decide_feasibility(self, task_id_set) -> bool:
         # 任务集为空，不需要调度
         if not task_id_set:
             logger.warning("task_id_set is empty and does not need to be scheduled")
@@ -152,25 +313,327 @@ class DataGenerator(object):
             logger.error("processors is empty, need to generate processor platform")
             return False
         
-        scheduler = sc.Scheduler(self.processors)
+        # 先查询其他处理器平台上的搜索结果能否推出结论
+        if self.platform_sweep is not None:
+            feasible = self.platform_sweep.known_verdict(self.platform_index, task_id_set)
+            if feasible is not None:
+                self.options.profiler.hit("platform_sweep")
+                return feasible
+
+        # 再查询参数多重集相同的任务集的结果
+        if self.options.multiset_memo:
+            key = self.multiset_key(task_id_set)
+            feasible = self.multiset_verdicts.get(key)
+            if feasible is not None:
+                self.search_statistics["multiset_memo_saved"] += 1
+                self.options.profiler.hit("multiset_memo")
+                return feasible
 
-        # 把 task_id_set 中的 task_id 对应的 task 添加到 scheduler 中
-        for task_id in task_id_set:
-            e, d, T, _ = self.tasks[task_id, :]
-            task = sc.Task(task_id, arrival_timepoint=0, 
-                           execution_time=int(e), deadline=int(d), period=int(T))
-            scheduler.add_task(task)
+        # 再查询持久化缓存
+        if self.feasibility_cache is not None:
+            feasible = self.feasibility_cache.get(self.platform_speeds(), self.task_rows(task_id_set))
+            if feasible is not None:
+                self.options.profiler.hit("feasibility_cache")
+                if self.options.multiset_memo:
+                    self.multiset_verdicts[key] = feasible
+                return feasible
+
+        # 再用可调度性检验判断，无法判断时再模拟
+        if self.options.prefilter != "off":
+            verdict, test_name = self.get_schedulability_tests().decide(self.task_rows(task_id_set))
+            if verdict is not None and self.options.prefilter == "on":
+                self.options.profiler.hit(f"prefilter_{test_name}")
+                if self.options.multiset_memo:
+                    self.multiset_verdicts[key] = verdict
+                if self.feasibility_cache is not None:
+                    self.feasibility_cache.put(self.platform_speeds(), self.task_rows(task_id_set), verdict)
+                return verdict
 
         # 模拟调度过程判断任务集是否可调度
-        feasible: bool = scheduler.run(truncated_lcm=1000000, enable_history=False)
+        if self.options.incremental and not self.incremental_paused:
+            feasible, termination = self.simulate_incremental(task_id_set)
+        else:
+            feasible, termination = self.simulate(task_id_set, self.options.engine)
+        if termination is not None:
+            self.terminations[termination] += 1
+        if self.options.multiset_memo:
+            self.multiset_verdicts[key] = feasible
+        if self.feasibility_cache is not None:
+            self.feasibility_cache.put(self.platform_speeds(), self.task_rows(task_id_set), feasible)
+
+        if self.options.prefilter == "verify":
+            self.schedulability_tests.verify(verdict, test_name, feasible, task_id_set)
+
+        if self.options.verify_engine:
+            reference_engine = "rescan" if self.options.engine != "rescan" else "event_queue"
+            if self.simulate(task_id_set, reference_engine)[0] != feasible:
+                self.engine_mismatches += 1
+                logger.critical(f"engine mismatch: {self.options.engine}={feasible}, {reference_engine}={not feasible}, task set: {task_id_set}")
 
         return feasible
 
-    def generate_hyperedge(self, max_hyperedge_size=None, num_of_hyperedge=None):
+    def judge_feasibility_batch(self, task_id_sets) -> list:
+        """用 BatchScheduler 同步模拟多组任务集，返回每组任务集是否可调度，启用分析器时计入 "judge_feasibility_batch" 阶段"""
+        if not self.options.profiler.enabled:
+            return self.decide_feasibility_batch(task_id_sets)
+        with self.options.profiler.stage("judge_feasibility_batch"):
+            return self.decide_feasibility_batch(task_id_sets)
+
+    def decide_feasibility_batch(self, task_id_sets) -> list:
+        """用 BatchScheduler 同步模拟多组任务集，返回每组任务集是否可调度"""
+        if not task_id_sets:
+            return []
+
+        # 判断处理器平台是否为空，为空则需要生成处理器平台
+        if not self.processors:
+            logger.error("processors is empty, need to generate processor platform")
+            return [False] * len(task_id_sets)
+
+        # 任务集为空，不需要调度
+        if not all(task_id_sets):
+            logger.warning("task_id_set is empty and does not need to be scheduled")
+        feasibilities = [False] * len(task_id_sets)
+        verdicts = [(None, "simulation")] * len(task_id_sets)
+        pending = []
+        duplicates = []     # 与排队中的任务集参数多重集相同的任务集，(序号, 排队中的任务集序号)
+        pending_keys = {}   # 排队中的任务集的参数多重集 -> 序号
+        for i, task_id_set in enumerate(task_id_sets):
+            if not task_id_set:
+                continue
+            # 先查询其他处理器平台上的搜索结果能否推出结论
+            if self.platform_sweep is not None:
+                known = self.platform_sweep.known_verdict(self.platform_index, task_id_set)
+                if known is not None:
+                    self.options.profiler.hit("platform_sweep")
+                    feasibilities[i] = known
+                    continue
+            # 再查询参数多重集相同的任务集的结果，同一批中多重集相同的任务集只模拟一次
+            if self.options.multiset_memo:
+                key = self.multiset_key(task_id_set)
+                known = self.multiset_verdicts.get(key)
+                if known is not None:
+                    self.search_statistics["multiset_memo_saved"] += 1
+                    self.options.profiler.hit("multiset_memo")
+                    feasibilities[i] = known
+                    continue
+                if key in pending_keys:
+                    self.search_statistics["multiset_memo_saved"] += 1
+                    self.options.profiler.hit("multiset_memo")
+                    duplicates.append((i, pending_keys[key]))
+                    continue
+                pending_keys[key] = i
+            # 再查询持久化缓存
+            if self.feasibility_cache is not None:
+                cached = self.feasibility_cache.get(self.platform_speeds(), self.task_rows(task_id_set))
+                if cached is not None:
+                    self.options.profiler.hit("feasibility_cache")
+                    feasibilities[i] = cached
+                    continue
+            # 再用可调度性检验判断，无法判断时再模拟
+            if self.options.prefilter != "off":
+                verdicts[i] = self.get_schedulability_tests().decide(self.task_rows(task_id_set))
+                if verdicts[i][0] is not None and self.options.prefilter == "on":
+                    self.options.profiler.hit(f"prefilter_{verdicts[i][1]}")
+                    feasibilities[i] = verdicts[i][0]
+                    if self.feasibility_cache is not None:
+                        self.feasibility_cache.put(self.platform_speeds(), self.task_rows(task_id_set), feasibilities[i])
+                    continue
+            pending.append(i)
+
+        task_sets = [self.task_rows(task_id_sets[i]) for i in pending]
+        batch_scheduler = bs.BatchScheduler(self.platform_speeds(), exact=self.options.exact_time)
+        batch_feasibilities = batch_scheduler.run(task_sets, truncated_lcm=self.SIMULATION_LIMIT, horizon=self.options.horizon)
+        self.terminations.update(batch_scheduler.terminations)
+        for i, task_rows, feasible in zip(pending, task_sets, batch_feasibilities):
+            feasibilities[i] = bool(feasible)
+            if self.feasibility_cache is not None:
+                self.feasibility_cache.put(self.platform_speeds(), task_rows, feasibilities[i])
+            if self.options.prefilter == "verify":
+                self.schedulability_tests.verify(*verdicts[i], feasibilities[i], task_id_sets[i])
+        for i, j in duplicates:
+            feasibilities[i] = feasibilities[j]
+        if self.options.multiset_memo:
+            self.multiset_verdicts.update((key, feasibilities[i]) for key, i in pending_keys.items())
+
+        return feasibilities
+
+    def ordered_task_ids(self, task_id_set) -> list:
+        """任务加入调度器的顺序：按 task_id 升序，启用 multiset_memo 时按等价类（即参数 (e, d, T)）升序"""
+        if self.options.multiset_memo:
+            task_classes = self.get_task_classes()
+            return sorted(task_id_set, key=lambda task_id: (task_classes[task_id], task_id))
+        return sorted(task_id_set)
+
+    def task_rows(self, task_id_set) -> np.ndarray:
+        """task_id_set 中任务的 (e, d, T)，按 ordered_task_ids 的顺序排列，与 simulate() 中添加到 scheduler 的顺序相同"""
+        if self.options.multiset_memo:
+            return self.tasks[self.ordered_task_ids(task_id_set)][:, 0:3].astype(int)
+        if self.platform_sweep is not None:
+            return self.platform_sweep.profile(task_id_set)[0]
+        return self.tasks[sorted(task_id_set)][:, 0:3].astype(int)
+
+    def platform_speeds(self) -> list:
+        return [processor.speed for processor in self.processors]
+
+    def get_schedulability_tests(self) -> st.SchedulabilityTestChain:
+        """与当前处理器平台对应的可调度性检验序列"""
+        if self.schedulability_tests is None:
+            self.schedulability_tests = st.SchedulabilityTestChain(self.platform_speeds())
+        return self.schedulability_tests
+
+    def get_simulation_context(self, engine: str) -> SimulationContext:
+        """与当前处理器平台对应的指定引擎的模拟环境"""
+        context = self.simulation_contexts.get(engine)
+        if context is None:
+            context = SimulationContext(self.platform_speeds(), engine=engine, tracer=self.options.tracer,
+                                        exact=self.options.exact_time)
+            self.simulation_contexts[engine] = context
+        return context
+
+    def simulate(self, task_id_set, engine: str, start: tuple = None):
+        """用指定引擎模拟调度 task_id_set，返回 (是否可调度, 模拟结束的原因)
+        start 为 Scheduler.restore() 的参数，设置后从这一状态继续模拟（见 simulate_incremental）
+        """
+        # 把 task_id_set 中的 task_id 对应的 task 按 ordered_task_ids 的顺序添加到 scheduler 中，使期限相同时的平局处理可复现
+        context = self.get_simulation_context(engine)
+        snapshot = self.options.incremental and not self.incremental_paused
+        if not self.options.profiler.enabled:
+            return context.run(self.task_rows(task_id_set), self.ordered_task_ids(task_id_set),
+                               truncated_lcm=self.SIMULATION_LIMIT, horizon=self.options.horizon,
+                               snapshot=snapshot, start=start)
+        with self.options.profiler.stage("simulate"):
+            begin = time.perf_counter()
+            result = context.run(self.task_rows(task_id_set), self.ordered_task_ids(task_id_set),
+                                 truncated_lcm=self.SIMULATION_LIMIT, horizon=self.options.horizon,
+                                 snapshot=snapshot, start=start)
+            self.options.profiler.on_simulation(len(task_id_set), context.scheduler, time.perf_counter() - begin)
+        return result
+
+    def simulate_incremental(self, task_id_set: frozenset):
+        """利用父任务集（search_parent，搜索路径上多一个任务、模拟判定为不可调度的任务集）的模拟记录判断 task_id_set 的可调度性
+        返回 (是否可调度, 模拟结束的原因)，没有模拟时结束原因为None
+        设被移除的任务为 t。t 第一次被分配到处理器之前，其他任务的调度过程与没有 t 时完全相同，因此：
+            1. t 从未被分配到处理器、也不是错过期限的任务，且错过期限的作业的绝对期限不超过 task_id_set 的模拟时长上限时，
+               同一作业在 task_id_set 中同样错过期限，不需要模拟
+            2. 否则从 t 第一次被分配到处理器时（及之前）最晚的快照去掉 t 继续模拟。
+               "adaptive" 模式按超周期记录的系统状态在快照中无法恢复，只使用第1条
+        模拟判定为不可调度时，保存 task_id_set 的模拟记录，供其子集使用
+        """
+        context = self.get_simulation_context(self.options.engine)
+        task_ids = self.ordered_task_ids(task_id_set)
+        parent = None
+        parent_set = self.search_parent
+        if (context.integral_speeds and parent_set is not None
+            and len(parent_set) == len(task_id_set) + 1 and task_id_set < parent_set):
+            parent = self.miss_records.get(parent_set)
+
+        start = None
+        snapshots = []
+        if parent is not None:
+            removed = next(task_id for task_id in parent["task_ids"] if task_id not in task_id_set)
+            position = parent["task_ids"].index(removed)
+            limit = context.reset(self.task_rows(task_id_set), task_ids).simulation_limit(self.SIMULATION_LIMIT, self.options.horizon)
+            miss = parent["miss"]
+            if removed != miss.task and removed not in miss.dispatched and miss.deadline <= limit:
+                self.search_statistics["witness_pruned"] += 1
+                self.options.profiler.hit("deadline_miss_witness")
+                self.miss_records[task_id_set] = dict(parent, task_ids=task_ids, snapshots=[
+                    (timepoint, states[:position] + states[position + 1:]) for timepoint, states in parent["snapshots"]])
+                return False, None
+
+            first = parent["first_dispatch"].get(removed, math.inf)
+            for timepoint, states in reversed(parent["snapshots"]):
+                if self.options.horizon == "fixed" and 0 < timepoint <= min(first, limit):
+                    # 快照之前已被分配过处理器的任务及其快照不变，之后的由继续模拟重新记录
+                    first_dispatch = {task_id: dispatched for task_id, dispatched in parent["first_dispatch"].items()
+                                      if dispatched < timepoint and task_id != removed}
+                    snapshots = [(earlier, earlier_states[:position] + earlier_states[position + 1:])
+                                 for earlier, earlier_states in parent["snapshots"] if earlier < timepoint]
+                    start = (timepoint, states[:position] + states[position + 1:], first_dispatch)
+                    self.search_statistics["replayed_simulations"] += 1
+                    self.search_statistics["replay_skipped_time"] += timepoint
+                    break
+
+        feasible, termination = self.simulate(task_id_set, self.options.engine, start)
+        scheduler = context.scheduler
+        if termination == "deadline_miss" and context.integral_speeds:
+            self.miss_records[task_id_set] = dict(task_ids=task_ids, miss=scheduler.deadline_miss,
+                                                  snapshots=snapshots + scheduler.snapshots,
+                                                  first_dispatch=scheduler.first_dispatch)
+        return feasible, termination
+
+    def generate_hyperedge(self, max_hyperedge_size=None, num_of_hyperedge=None, batch_size=None, workers=None):
         """为节点集合充分的生成超边
         保存在self.hyperedges中
+        batch_size:
+            设置后每 batch_size 个随机任务集为一批，用 search_hyperedge_batch 逐层排队、批量模拟
+        workers:
+            大于1时用 workers 个进程并行搜索，见 generate_hyperedge_parallel
+        搜索方式见 SearchOptions.strategy，"bottom_up" 时 batch_size 为每层候选批量模拟的数量上限
         """
+        if self.options.strategy not in SearchOptions.STRATEGIES:
+            raise ValueError(f"unknown search strategy: {self.options.strategy}")
+
+        number_of_tasks = self.tasks.shape[0]
+        max_hyperedge_size, num_of_hyperedge = self.search_size(max_hyperedge_size, num_of_hyperedge)
+
+        # 从检查点继续时，start 为已搜索的随机任务集数量
+        start, parallel_state = 0, None
+        if self.data_path is not None and (self.checkpoint_interval is not None or self.resume):
+            self.checkpoint_config = dict(self.options.verdict_settings(), max_hyperedge_size=max_hyperedge_size,
+                                          num_of_hyperedge=num_of_hyperedge, batch_size=batch_size, workers=workers,
+                                          strategy=self.options.strategy, bottom_up_budget=self.options.bottom_up_budget,
+                                          platform=self.platform_speeds(), tasks=self.tasks_digest())
+            if self.resume:
+                start, parallel_state = self.restore_search_checkpoint()
+            self.last_checkpoint = time.monotonic()
 
+        if workers and workers > 1:
+            if parallel_state is None:
+                task_id_sets = [frozenset(random.sample(range(number_of_tasks), max_hyperedge_size))
+                                for _ in range(num_of_hyperedge)]
+            else:
+                task_id_sets = parallel_state["task_id_sets"]
+            self.generate_hyperedge_parallel(task_id_sets, workers, batch_size, parallel_state)
+        elif self.options.strategy == "bottom_up":
+            for i in tqdm(range(start, num_of_hyperedge), desc="search hyperedge bottom-up", initial=start,
+                          total=num_of_hyperedge):
+                task_id_set = random.sample(range(number_of_tasks), max_hyperedge_size)
+                self.search_hyperedge_bottom_up(frozenset(task_id_set), batch_size)
+                if self.checkpoint_due():
+                    self.save_search_checkpoint(i + 1)
+        elif batch_size:
+            for i in tqdm(range(start, num_of_hyperedge, batch_size), desc="search hyperedge batch"):
+                task_id_sets = [frozenset(random.sample(range(number_of_tasks), max_hyperedge_size))
+                                for _ in range(min(batch_size, num_of_hyperedge - i))]
+                self.search_hyperedge_batch(task_id_sets)
+                if self.checkpoint_due():
+                    self.save_search_checkpoint(i + batch_size)
+        else:
+            for i in tqdm(range(start, num_of_hyperedge), desc="search hyperedge", initial=start, total=num_of_hyperedge):
+                task_id_set = random.sample(range(number_of_tasks), max_hyperedge_size)
+                self.search_hyperedge(frozenset(task_id_set))
+                if self.checkpoint_due():
+                    self.save_search_checkpoint(i + 1)
+
+        # 将缓冲的搜索结果写入文件
+        if self.result_sink is not None:
+            self.result_sink.flush()
+
+        # 搜索已完成，检查点不再需要
+        if self.data_path is not None and os.path.exists(self.data_path / "checkpoint.pkl"):
+            os.remove(self.data_path / "checkpoint.pkl")
+
+        return self.hyperedges
+
+    def create_negative_samples(self, path: Path):
+        """创建保存负采样的空集合，设置了 SearchOptions.visited_memory_limit 时为溢出到 path 的 VisitedSetStore"""
+        if self.options.visited_memory_limit is None:
+            return set()
+        return VisitedSetStore(path, self.options.visited_memory_limit, keep_obsolete_runs=self.checkpoint_interval is not None)
+
+    def search_size(self, max_hyperedge_size=None, num_of_hyperedge=None) -> tuple:
+        """超边最大尺寸和随机搜索的超边数量的默认值"""
         # 若超边最大尺寸没有设置或大于节点数量，则设为节点数量（任务数量）
         number_of_tasks = self.tasks.shape[0]
         if not max_hyperedge_size or max_hyperedge_size > number_of_tasks:
@@ -178,32 +641,376 @@ class DataGenerator(object):
 
         if not num_of_hyperedge:
             num_of_hyperedge = number_of_tasks * max_hyperedge_size
+        return max_hyperedge_size, num_of_hyperedge
+
+    def generate_hyperedge_sharded(self, max_hyperedge_size=None, num_of_hyperedge=None, shard_size: int = 100,
+                                   batch_size=None, claim_timeout: float = None) -> bool:
+        """多个进程（可以在共享同一文件系统的不同节点上）协作搜索超边
+        所有进程用相同的种子抽取相同的 num_of_hyperedge 个随机任务集，按顺序每 shard_size 个分为一个分片，
+        各进程通过 data_path / "shards" 中的分片队列（见 shard_queue）认领互不相同的分片。
+        每个分片从空的搜索结果开始搜索，结果写入各自的目录，因此分片的结果与由哪个进程搜索无关。
+        所有分片完成后，最后完成的进程用 merge_shards 合并结果；其他进程返回False，不合并
+        claim_timeout:
+            认领后超过这一时间（秒）没有进展的分片可被其他进程重新认领，用于处理中途退出的进程，应大于搜索一个任务集的最长时间
+        """
+        if self.options.strategy not in SearchOptions.STRATEGIES:
+            raise ValueError(f"unknown search strategy: {self.options.strategy}")
+
+        number_of_tasks = self.tasks.shape[0]
+        max_hyperedge_size, num_of_hyperedge = self.search_size(max_hyperedge_size, num_of_hyperedge)
+        task_id_sets = [frozenset(random.sample(range(number_of_tasks), max_hyperedge_size))
+                        for _ in range(num_of_hyperedge)]
+
+        queue = ShardQueue(self.data_path / "shards", math.ceil(num_of_hyperedge / shard_size), claim_timeout)
+        queue.publish_manifest(dict(self.options.verdict_settings(), seed=self.seed, max_hyperedge_size=max_hyperedge_size,
+                                    num_of_hyperedge=num_of_hyperedge, shard_size=shard_size, batch_size=batch_size,
+                                    strategy=self.options.strategy, bottom_up_budget=self.options.bottom_up_budget,
+                                    platform=self.platform_speeds(), tasks=self.tasks_digest()))
+
+        result_sink = self.result_sink
+        chunk_size = batch_size or 1
+        for shard in queue.claims():
+            path = queue.temporary_path(shard)
+            self.hyperedges = TaskSetIndex()
+            self.negative_samples = self.create_negative_samples(path / "visited")
+            self.minimal_unschedulable_combinations = TaskSetIndex()
+            if self.options.multiset_memo:
+                self.reset_multiset_memo()
+            terminations = self.terminations.copy()
+            self.result_sink = ResultSink(path)
+
+            shard_task_id_sets = task_id_sets[shard * shard_size:(shard + 1) * shard_size]
+            for i in tqdm(range(0, len(shard_task_id_sets), chunk_size), desc=f"search shard {shard}"):
+                chunk = shard_task_id_sets[i:i + chunk_size]
+                if self.options.strategy == "bottom_up":
+                    for task_id_set in chunk:
+                        self.search_hyperedge_bottom_up(task_id_set, batch_size)
+                elif batch_size:
+                    self.search_hyperedge_batch(chunk)
+                else:
+                    self.search_hyperedge(chunk[0])
+                queue.heartbeat(shard)
 
-        for i in tqdm(range(num_of_hyperedge), desc="search hyperedge", total=num_of_hyperedge):
-            task_id_set = random.sample(range(number_of_tasks), max_hyperedge_size)
-            self.search_hyperedge(frozenset(task_id_set))
+            self.result_sink.close()
+            self.negative_samples.clear()   # 负采样已写入分片的 csv 文件，删除溢出到磁盘的部分
+            with open(path / "statistics.json", "w") as file:
+                json.dump({"terminations": self.terminations - terminations}, file)
+            queue.complete(shard, path)
+            logger.info(f"shard {shard} completed")
+        self.result_sink = result_sink
+
+        if len(queue.done_shards()) < queue.number_of_shards:
+            logger.info("shards claimed by other processes are not completed yet, results are not merged")
+            return False
+        self.merge_shards()
+        return True
+
+    def merge_shards(self):
+        """合并 data_path / "shards" 中所有分片的搜索结果，写入 data_path 中与单进程搜索相同的 csv 文件
+        每个分片从空的搜索结果开始，会重新记录此前的分片中已经判定过的任务集。与串行搜索一样按分片顺序合并：
+        超边丢弃已合并的超边的子集，负采样去重；最小不可调度组合在合并后的结果上全局重新计算：
+        不可调度且所有 len-1 子集都可调度（为超边或超边的子集）的任务集。
+        最小不可调度组合的真子集都可调度，串行搜索在它之后才会遇到下一个负采样，因此按负采样的顺序排列即与串行搜索相同
+        """
+        shard_path = self.data_path / "shards"
+        with open(shard_path / "manifest.json") as file:
+            manifest = json.load(file)
+        queue = ShardQueue(shard_path, math.ceil(manifest["num_of_hyperedge"] / manifest["shard_size"]))
+        missing = [shard for shard in range(queue.number_of_shards) if not queue.is_done(shard)]
+        if missing:
+            raise ValueError(f"shards not completed: {missing}")
+
+        self.hyperedges = TaskSetIndex()
+        hyperedges = []         # 按合并顺序排列的超边
+        negative_samples = {}   # 有序去重
+        self.terminations = Counter()
+        for shard in range(queue.number_of_shards):
+            for task_id_set in self.read_task_id_sets(queue.result_path(shard) / "hyperedges.csv"):
+                if not self.hyperedges.has_superset(task_id_set):
+                    self.hyperedges.add(task_id_set)
+                    hyperedges.append(task_id_set)
+            negative_samples.update((task_id_set, None)
+                                    for task_id_set in self.read_task_id_sets(queue.result_path(shard) / "negative_samples.csv"))
+            with open(queue.result_path(shard) / "statistics.json") as file:
+                self.terminations.update(json.load(file)["terminations"])
+
+        self.negative_samples = set(negative_samples)
+        self.minimal_unschedulable_combinations = TaskSetIndex()
+        combinations = []
+        for task_id_set in negative_samples:
+            if all(len(subset) <= 1 or self.hyperedges.has_superset(subset)
+                   for subset in itertools.combinations(task_id_set, len(task_id_set) - 1)):
+                self.minimal_unschedulable_combinations.add(task_id_set)
+                combinations.append(task_id_set)
+
+        # 先写入临时文件再替换，多个进程同时合并时文件始终完整
+        for file_name, task_id_sets in (("hyperedges.csv", hyperedges), ("negative_samples.csv", negative_samples),
+                                        ("minimal_unschedulable_combinations.csv", combinations)):
+            temporary_file_name = self.data_path / f"{file_name}.tmp.{queue.owner}"
+            with open(temporary_file_name, 'w', newline='') as csvfile:
+                csv.writer(csvfile).writerows(sorted(task_id_set) for task_id_set in task_id_sets)
+            os.replace(temporary_file_name, self.data_path / file_name)
+        logger.info(f"merged {queue.number_of_shards} shards: {len(self.hyperedges)} hyperedges, "
+                    f"{len(self.negative_samples)} negative samples, {len(combinations)} minimal unschedulable combinations")
 
         return self.hyperedges
 
+    def read_task_id_sets(self, file_name: Path) -> list:
+        """读取一个搜索结果文件，返回每行的任务集，文件不存在时返回空列表"""
+        if not os.path.exists(file_name):
+            return []
+        with open(file_name, "r") as file:
+            return [frozenset(int(task_id) for task_id in row) for row in csv.reader(file)]
 
-    def search_hyperedge(self, task_id_set: frozenset) -> bool:
-        """从一组任务节点中递归地找出所有的超边"""
+    def tasks_digest(self) -> str:
+        """任务池的摘要，用于确认恢复检查点时的任务池与保存时相同。逐块计算，内存映射的任务池不会一次读入内存"""
+        digest = hashlib.blake2b(digest_size=16)
+        for _, chunk in task_chunks(self.tasks):
+            digest.update(np.ascontiguousarray(chunk).tobytes())
+        return digest.hexdigest()
+
+    def checkpoint_due(self) -> bool:
+        """距离上一次保存检查点是否已超过 checkpoint_interval 秒"""
+        return (self.checkpoint_interval is not None and self.checkpoint_config is not None
+                and time.monotonic() - self.last_checkpoint >= self.checkpoint_interval)
+
+    def save_search_checkpoint(self, position: int, parallel_state: dict = None):
+        """保存搜索状态：已搜索的随机任务集数量 position、随机数状态、搜索结果和统计，以及结果文件已写入的字节数
+        parallel_state 为并行搜索的状态，见 generate_hyperedge_parallel
+        """
+        if self.result_sink is not None:
+            self.result_sink.flush()
+        state = dict(config=self.checkpoint_config, position=position, parallel=parallel_state,
+                     random_state=random.getstate(), numpy_random_state=np.random.get_state(),
+                     hyperedges=list(self.hyperedges), negative_samples=self.negative_samples,
+                     minimal_unschedulable_combinations=list(self.minimal_unschedulable_combinations),
+                     multiset_verdicts=self.multiset_verdicts,
+                     minimal_unschedulable_multisets=self.minimal_unschedulable_multisets,
+                     terminations=self.terminations, search_statistics=self.search_statistics,
+                     engine_mismatches=self.engine_mismatches,
+                     schedulability_tests=None if self.schedulability_tests is None else
+                     (self.schedulability_tests.statistics, self.schedulability_tests.mismatches),
+                     output_sizes=cp.output_sizes(self.data_path, self.RESULT_FILES))
+        cp.save_checkpoint(self.data_path / "checkpoint.pkl", state)
+        if isinstance(self.negative_samples, VisitedSetStore):
+            self.negative_samples.remove_obsolete_runs() # 新的检查点已不再引用合并前的溢出文件
+        self.last_checkpoint = time.monotonic()
+        logger.info(f"checkpoint saved: {position} task sets searched")
+
+    def restore_search_checkpoint(self) -> tuple:
+        """恢复检查点中的搜索状态，将结果文件截断到检查点时的位置
+        返回 (已搜索的随机任务集数量, 并行搜索的状态)，没有检查点时返回 (0, None)
+        """
+        state = cp.load_checkpoint(self.data_path / "checkpoint.pkl")
+        if state is None:
+            logger.warning(f"no checkpoint in {self.data_path}, search starts from scratch")
+            return 0, None
+        if state["config"] != self.checkpoint_config:
+            raise ValueError(f"checkpoint in {self.data_path} was saved by a search with different parameters, "
+                             f"platform or tasks: {state['config']}")
+
+        self.hyperedges = TaskSetIndex(state["hyperedges"])
+        self.negative_samples = state["negative_samples"]
+        self.minimal_unschedulable_combinations = TaskSetIndex(state["minimal_unschedulable_combinations"])
+        self.multiset_verdicts = state["multiset_verdicts"]
+        self.minimal_unschedulable_multisets = state["minimal_unschedulable_multisets"]
+        self.terminations = state["terminations"]
+        self.search_statistics = state["search_statistics"]
+        self.engine_mismatches = state["engine_mismatches"]
+        if state["schedulability_tests"] is not None:
+            schedulability_tests = self.get_schedulability_tests()
+            schedulability_tests.statistics, schedulability_tests.mismatches = state["schedulability_tests"]
+        cp.truncate_outputs(self.data_path, state["output_sizes"])
+        random.setstate(state["random_state"])
+        np.random.set_state(state["numpy_random_state"])
+
+        logger.info(f"resumed from checkpoint: {state['position']} task sets searched")
+        return state["position"], state["parallel"]
+
+    def sweep_platforms(self, platforms, max_hyperedge_size=None, num_of_hyperedge=None, batch_size=None,
+                        workers=None) -> list:
+        """用同一个任务池（self.tasks）在多个处理器平台上分别生成超边
+        platforms 的每个元素为一个平台的处理器速度序列。第 i 个平台的结果保存在 data_path / f"platform_{i}" 中，
+        文件与单个平台时的 data 目录相同。每个平台都从同一个随机种子开始搜索，因此搜索的随机任务集相同；
+        任务集的 (e, d, T) 和归一化利用率之和在所有平台之间只计算一次，
+        并且一个平台上的搜索结果按处理器速度的支配关系推广到其他平台（见 platform_sweep），减少模拟次数。
+        各平台使用与本平台相同的 SearchOptions，并行搜索（workers > 1）时工作进程中不使用其他平台的搜索结果
+        返回每个平台的 DataGenerator
+        """
+        sweep = PlatformSweep(self.tasks, platforms, fastest_speed=self.processors[0].speed)
+        generators = []
+        for i, speeds in enumerate(sweep.platforms):
+            generator = DataGenerator(self.seed, self.data_path / f"platform_{i}", self.options, flush_interval=self.flush_interval)
+            generator.processors = [sc.Processor(id=f"P{j}", speed=speed) for j, speed in enumerate(speeds)]
+            generator.tasks = self.tasks
+            generator.platform_sweep = sweep
+            generator.platform_index = i
+            generator.save_platform(generator.data_path / "platform.csv")
+            if not isinstance(self.tasks, np.memmap): # 分块生成的任务池只保存在 data_path 中的 task_quadruples.npy
+                generator.save_tasks(generator.data_path / "task_quadruples.csv")
+            logger.info(f"sweep platform {i}: {speeds}")
+
+            generator.generate_hyperedge(max_hyperedge_size, num_of_hyperedge, batch_size, workers)
+            generator.result_sink.close()
+            if generator.feasibility_cache is not None:
+                generator.feasibility_cache.close()
+            sweep.finish(i)
+            generators.append(generator)
+
+        return generators
+
+    def generate_hyperedge_parallel(self, task_id_sets, workers: int, batch_size=None, resume_state: dict = None):
+        """用进程池并行地从随机任务集中搜索超边
+        随机任务集按顺序每 batch_size（默认为1）个分为一个搜索任务。工作进程之间通过共享列表交换新发现的超边和最小不可调度组合，
+        用于剪枝彼此的搜索。为了使固定种子下的结果可复现，第 i 个搜索任务只使用前 i - workers + 1 个搜索任务合并后的共享结果；
+        主进程按顺序合并每个搜索任务的结果并去重，写入与串行搜索相同的 csv 文件。
+        工作进程使用的共享结果可能落后于主进程，合并时丢弃已合并的超边的子集和已合并的最小不可调度组合的超集，
+        与串行搜索一样，这些任务集在主进程中不经模拟即可判定，不会被记录
+        resume_state:
+            检查点中的并行搜索状态：全部随机任务集、已合并的搜索任务数量、共享列表的内容和每次合并后的长度。
+            从已合并的搜索任务之后继续，检查点时尚未合并的搜索任务需要重新搜索
+        """
+        chunk_size = batch_size or 1
+        chunks = [task_id_sets[i:i + chunk_size] for i in range(0, len(task_id_sets), chunk_size)]
+        # 分块生成的任务池只传递文件路径，工作进程自行以内存映射打开
+        tasks = Path(self.tasks.filename) if isinstance(self.tasks, np.memmap) else self.tasks
+        # 设置了 SearchOptions.visited_memory_limit 时，每个工作进程的负采样溢出到其中以进程号区分的子目录
+        visited_path = self.data_path / "visited_workers"
+
+        with multiprocessing.Manager() as manager:
+            if resume_state is None:
+                start = 0
+                shared_hyperedges = manager.list(sorted(self.hyperedges, key=sorted))
+                shared_combinations = manager.list(sorted(self.minimal_unschedulable_combinations, key=sorted))
+                snapshots = [(len(shared_hyperedges), len(shared_combinations))] # 合并前 i 个搜索任务后共享列表的长度
+            else:
+                start = resume_state["merged"]
+                shared_hyperedges = manager.list(resume_state["shared_hyperedges"])
+                shared_combinations = manager.list(resume_state["shared_combinations"])
+                snapshots = resume_state["snapshots"]
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_search_worker,
+                                     initargs=(self.processors, tasks, self.options, batch_size,
+                                               shared_hyperedges, shared_combinations, visited_path)) as executor:
+                futures = {}
+                submitted = start
+                with tqdm(total=len(chunks), initial=start, desc="search hyperedge") as pbar:
+                    for merged in range(start, len(chunks)):
+                        # 提交所有依赖的共享结果已合并的搜索任务
+                        while submitted < len(chunks) and submitted - workers + 1 <= merged:
+                            snapshot = snapshots[max(0, submitted - workers + 1)]
+                            futures[submitted] = executor.submit(search_worker, chunks[submitted], snapshot)
+                            submitted += 1
+
+                        hyperedges, negative_samples, combinations, statistics = futures.pop(merged).result()
+                        if "schedulability_tests" in statistics:
+                            self.get_schedulability_tests().statistics.update(statistics["schedulability_tests"])
+                        self.terminations.update(statistics["terminations"])
+                        self.search_statistics.update(statistics["search"])
+                        if "tracer" in statistics:
+                            self.options.tracer.counts.update(statistics["tracer"])
+                        if "profiler" in statistics:
+                            self.options.profiler.merge(statistics["profiler"])
+                        if "feasibility_cache" in statistics and self.feasibility_cache is not None:
+                            self.feasibility_cache.hits += statistics["feasibility_cache"][0]
+                            self.feasibility_cache.misses += statistics["feasibility_cache"][1]
+                        for task_id_set in hyperedges:
+                            if not self.hyperedges.has_superset(task_id_set):
+                                self.record_hyperedge(task_id_set, self.calculate_system_utilization(task_id_set))
+                                shared_hyperedges.append(task_id_set)
+                        for task_id_set in negative_samples:
+                            if task_id_set not in self.negative_samples:
+                                self.record_negative_sample(task_id_set, self.calculate_system_utilization(task_id_set))
+                        for task_id_set in combinations:
+                            if not self.minimal_unschedulable_combinations.has_subset(task_id_set):
+                                self.record_minimal_unschedulable_combination(task_id_set)
+                                shared_combinations.append(task_id_set)
+                        snapshots.append((len(shared_hyperedges), len(shared_combinations)))
+                        pbar.update(1)
+
+                        if self.checkpoint_due():
+                            self.save_search_checkpoint(len(task_id_sets), dict(
+                                task_id_sets=task_id_sets, merged=merged + 1, snapshots=snapshots,
+                                shared_hyperedges=list(shared_hyperedges), shared_combinations=list(shared_combinations)))
+        shutil.rmtree(visited_path, ignore_errors=True)
+
+    def known_feasibility(self, task_id_set: frozenset):
+        """不经模拟即可得出的搜索结果，True/False 为已知结果，None 表示需要继续判断"""
 
         # 判断 task_id_set 是否为空
         if len(task_id_set) <= 1:
+            self.options.profiler.hit("single_task")
             return True
         
         # 判断任务集是否已经判定过可调度性，如果已经搜索过则不再往下搜索
         if task_id_set in self.hyperedges:
+            self.options.profiler.hit("visited_hyperedge")
             return True
         if task_id_set in self.negative_samples:
+            self.options.profiler.hit("visited_negative_sample")
             return False
         
         # 检查 task_id_set 是否为已判定为可调度的任务集的子集
-        for hyperedge in self.hyperedges:
-            if hyperedge.issuperset(task_id_set):
-                # 这里的可调度超边为之前经历模拟验证的可调度超边的子集，因此被剪枝。在其他分支中又出现需要判断可调度性，所以不用记录为超边
-                return True
+        if self.has_feasible_superset(task_id_set):
+            # 这里的可调度超边为之前经历模拟验证的可调度超边的子集，因此被剪枝。在其他分支中又出现需要判断可调度性，所以不用记录为超边
+            self.options.profiler.hit("hyperedge_superset")
+            return True
+
+        return None
+
+    def has_feasible_superset(self, task_id_set: frozenset) -> bool:
+        """task_id_set 是否为已判定为可调度的任务集的子集，启用分析器时计入 "superset_scan" 阶段"""
+        if not self.options.profiler.enabled:
+            return self.hyperedges.has_superset(task_id_set)
+        with self.options.profiler.stage("superset_scan"):
+            return self.hyperedges.has_superset(task_id_set)
+
+    def write_result(self, file_name: str, task_id_set: frozenset):
+        """将一条搜索结果写入 result_sink，启用分析器时计入 "output" 阶段"""
+        if self.result_sink is None:
+            return
+        if not self.options.profiler.enabled:
+            self.result_sink.write_row(file_name, sorted(task_id_set))
+            return
+        with self.options.profiler.stage("output"):
+            self.result_sink.write_row(file_name, sorted(task_id_set))
+
+    def record_hyperedge(self, task_id_set: frozenset, system_utilization):
+        # 记录已搜索过的超边
+        self.hyperedges.add(task_id_set)
+        if self.platform_sweep is not None:
+            self.platform_sweep.record(self.platform_index, task_id_set, True)
+        if self.options.multiset_memo:
+            self.multiset_verdicts[self.multiset_key(task_id_set)] = True
+
+        # 保存超边
+        self.write_result("hyperedges.csv", task_id_set)
+        logger.debug(f"feasible: True \tsystem utilization: {system_utilization * 100 :.2f}%\ttask set: {task_id_set}") # 打印调度可行性结果
+
+    def record_negative_sample(self, task_id_set: frozenset, system_utilization):
+        # 记录已搜索过的负采样
+        self.negative_samples.add(task_id_set)
+        if self.platform_sweep is not None:
+            self.platform_sweep.record(self.platform_index, task_id_set, False)
+        if self.options.multiset_memo:
+            self.multiset_verdicts[self.multiset_key(task_id_set)] = False
+
+        # 保存负采样
+        self.write_result("negative_samples.csv", task_id_set)
+        logger.debug(f"feasible: False \tsystem utilization: {system_utilization * 100 :.2f}%\ttask set: {task_id_set}") # 打印调度可行性结果
+
+    def record_minimal_unschedulable_combination(self, task_id_set: frozenset):
+        self.minimal_unschedulable_combinations.add(task_id_set)
+        if self.options.multiset_memo:
+            self.minimal_unschedulable_multisets.add(self.multiset_key(task_id_set))
+        self.write_result("minimal_unschedulable_combinations.csv", task_id_set)
+
+    def search_hyperedge(self, task_id_set: frozenset) -> bool:
+        """从一组任务节点中递归地找出所有的超边"""
+
+        known = self.known_feasibility(task_id_set)
+        if known is not None:
+            return known
         
         # 先判断是否满足系统利用率小于等于1的可调度性必要条件，
         # 然后判断任务集中是否包含不可调度组合
@@ -211,41 +1018,273 @@ class DataGenerator(object):
         system_utilization = self.calculate_system_utilization(task_id_set)
         if (system_utilization <= 1                                     # 不满足必要条件，也要继续往下搜索子集可调度性
             and (not self.has_unschedulable_combination(task_id_set))   # 发现含有不可调度组合直接判定任务集不可调度，也要继续往下搜索子集
-            and self.judge_feasibility(task_id_set)):
-            # 记录已搜索过的超边
-            self.hyperedges.add(task_id_set)
-
-            # 保存超边
-            file_name = self.data_path / "hyperedges.csv"
-            with open(file_name, 'a', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow([str(node_id) for node_id in sorted(task_id_set)])
-            logger.info(f"feasible: True \tsystem utilization: {system_utilization * 100 :.2f}%\ttask set: {task_id_set}") # 打印调度可行性结果
-
+            and (self.judge_feasibility(task_id_set) if self.feasibility_oracle is None
+                 else self.replay_feasibility(task_id_set))):
+            self.record_hyperedge(task_id_set, system_utilization)
             return True
         else: # task_id_set 不可调度，搜索子集
-            # 记录已搜索过的负采样
-            self.negative_samples.add(task_id_set)
-
-            # 保存负采样
-            file_name = self.data_path / "negative_samples.csv"
-            with open(file_name, 'a', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow([str(node_id) for node_id in sorted(task_id_set)])
-            logger.info(f"feasible: False \tsystem utilization: {system_utilization * 100 :.2f}%\ttask set: {task_id_set}") # 打印调度可行性结果
+            if system_utilization > 1:
+                self.options.profiler.hit("utilization")
+            self.record_negative_sample(task_id_set, system_utilization)
 
             # 走到这一步，说明 task_id_set 在 processors 上不可调度，判断 task_id_set 的子集是否可调度
             combin = itertools.combinations(task_id_set, len(task_id_set)-1)
             flag: bool = True # 记录所有真子集是否都是可调度的
             for subset in combin:
+                self.search_parent = task_id_set # 搜索子集时会被覆盖，每个子集搜索前重新设置
                 flag = self.search_hyperedge(frozenset(subset)) and flag # 真子集全部可调度，flag为True；存在真子集不可调度，flag为False
 
+            self.miss_records.pop(task_id_set, None) # 子集已搜索完毕，不再需要增量模拟的记录
+
             # 当 task_id_set 的真子集都可调度且 task_id_set 不可调度时，说明 task_id_set 是一个会导致任务集不可调度的最小任务组合，任务集中存在这个组合即不可调度
             if flag: 
-                self.minimal_unschedulable_combinations.add(task_id_set)
-                file_name = self.data_path / "minimal_unschedulable_combinations.csv"
-                with open(file_name, 'a', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow([str(node_id) for node_id in sorted(task_id_set)])
+                self.record_minimal_unschedulable_combination(task_id_set)
+
+            return False
+
+    def search_hyperedge_bottom_up(self, task_id_set: frozenset, batch_size=None) -> bool:
+        """从一组任务节点中自底向上（Apriori）地找出所有的超边
+        先用 enumerate_feasible_subsets 逐层向上枚举出 task_id_set 中所有可调度的子集，
+        再按 search_hyperedge 的顺序自顶向下重放搜索，用枚举结果代替模拟，
+        因此记录的超边、负采样和最小不可调度组合与 search_hyperedge 完全相同。
+        与 search_hyperedge 的剪枝规则一样，枚举依赖可调度性的单调性：可调度任务集的子集可调度，不可调度任务集的超集不可调度
+        search_statistics 中 "bottom_up_simulations" 为枚举实际的模拟次数，"top_down_simulations" 为 search_hyperedge 需要的模拟次数。
+        可调度性的边界接近 task_id_set 时，自顶向下只需模拟少数几次，逐层枚举却要模拟大量子集。设置了 SearchOptions.bottom_up_budget 时，
+        下一层超出模拟次数上限则停止枚举，改为自顶向下搜索：已枚举的结果照常重放，其余任务集模拟判断。
+        停止枚举的次数记录在 "bottom_up_fallbacks" 中
+        """
+        verdicts, complete = self.enumerate_feasible_subsets(task_id_set, batch_size, self.bottom_up_budget(task_id_set))
+        self.search_statistics["bottom_up_seeds"] += 1
+        if not complete:
+            self.search_statistics["bottom_up_fallbacks"] += 1
+        self.feasibility_oracle = verdicts
+        self.oracle_complete = complete
+        try:
+            return self.search_hyperedge(task_id_set)
+        finally:
+            self.feasibility_oracle = None
+            self.oracle_complete = True
+
+    def bottom_up_budget(self, task_id_set: frozenset) -> int:
+        """自底向上枚举一个随机任务集的模拟次数上限，为None时不限制
+        SearchOptions.bottom_up_budget 为 "auto" 时是此前的随机任务集自顶向下搜索平均需要的模拟次数，
+        至少为 len(task_id_set) + 1（任务集本身不可调度、所有 len-1 子集都可调度时自顶向下需要的模拟次数）
+        """
+        if self.options.bottom_up_budget != "auto":
+            return self.options.bottom_up_budget
+        seeds = self.search_statistics["bottom_up_seeds"]
+        average = self.search_statistics["top_down_simulations"] / seeds if seeds else 0
+        return max(len(task_id_set) + 1, math.ceil(average))
+
+    def replay_feasibility(self, task_id_set: frozenset) -> bool:
+        """重放自顶向下搜索时代替 judge_feasibility，这里 search_hyperedge 原本需要模拟一次"""
+        self.search_statistics["top_down_simulations"] += 1
+        feasible = self.feasibility_oracle.get(task_id_set)
+        if feasible is not None:
+            return feasible
+        if self.oracle_complete:
+            return False    # 不是枚举的候选，含有不可调度的子集
+        # 枚举提前停止，没有判断过的任务集模拟判断
+        self.search_statistics["bottom_up_simulations"] += 1
+        return self.judge_feasibility(task_id_set)
+
+    def enumerate_feasible_subsets(self, task_id_set: frozenset, batch_size=None, budget: int = None) -> tuple:
+        """逐层枚举 task_id_set 中可调度的子集（不含单个任务），不记录任何搜索结果
+        先判断 task_id_set 本身，可调度时其所有子集都可调度，不需要枚举。否则从2个任务的子集开始，
+        第 k 层的候选由第 k-1 层的可调度子集两两合并而来，且其所有 k-1 子集都可调度；
+        其他 k 个任务的子集含有不可调度的子集，必然不可调度，不需要模拟
+        返回 (已判断过的任务集 -> 是否可调度, 是否枚举完毕)。枚举完毕时其中可调度的任务集即 task_id_set 全部可调度的子集
+        batch_size:
+            设置后每层需要模拟的候选每 batch_size 个一批，用 judge_feasibility_batch 批量模拟
+        budget:
+            模拟次数上限，下一层需要模拟的候选超出剩余次数时停止枚举，为None时不限制
+        """
+        verdicts = {}   # 已判断过的任务集 -> 是否可调度
+        start = self.search_statistics["bottom_up_simulations"]
+        if self.lattice_verdicts([task_id_set], verdicts, batch_size)[0]:
+            return verdicts, True
+
+        level = [frozenset(pair) for pair in itertools.combinations(sorted(task_id_set), 2)]
+        while level:
+            limit = None if budget is None else budget - (self.search_statistics["bottom_up_simulations"] - start)
+            level_verdicts = self.lattice_verdicts(level, verdicts, batch_size, limit)
+            if level_verdicts is None:
+                return verdicts, False
+            level = self.apriori_candidates([candidate for candidate, verdict in zip(level, level_verdicts) if verdict])
+
+        return verdicts, True
+
+    def lattice_verdicts(self, candidates, verdicts: dict, batch_size=None, limit: int = None) -> list:
+        """按 search_hyperedge 的规则判断一层候选的可调度性，不记录搜索结果，判断结果保存在 verdicts 中
+        需要模拟的候选多于 limit 个时不模拟，返回None
+        """
+        pending = []
+        for candidate in candidates:
+            if candidate in verdicts:
+                continue
+            known = self.known_feasibility(candidate)
+            if known is not None:
+                verdicts[candidate] = known
+            elif self.calculate_system_utilization(candidate) > 1:
+                self.options.profiler.hit("utilization")
+                verdicts[candidate] = False
+            elif self.has_unschedulable_combination(candidate):
+                verdicts[candidate] = False
+            else:
+                pending.append(candidate)
+
+        if limit is not None and len(pending) > limit:
+            return None
+        self.search_statistics["bottom_up_simulations"] += len(pending)
+        if batch_size:
+            for i in range(0, len(pending), batch_size):
+                verdicts.update(zip(pending[i:i + batch_size], self.judge_feasibility_batch(pending[i:i + batch_size])))
+        else:
+            # 逐层枚举时子集先于父任务集模拟，增量模拟用不上，不保存模拟记录和快照
+            self.incremental_paused = True
+            try:
+                for candidate in pending:
+                    verdicts[candidate] = self.judge_feasibility(candidate)
+            finally:
+                self.incremental_paused = False
+
+        return [verdicts[candidate] for candidate in candidates]
+
+    @staticmethod
+    def apriori_candidates(level_feasible) -> list:
+        """由第 k-1 层的可调度子集生成第 k 层的候选：前 k-2 个任务id相同的两个子集合并，且合并后所有 k-1 子集都可调度"""
+        level_feasible = sorted(tuple(sorted(task_id_set)) for task_id_set in level_feasible)
+        feasible = set(level_feasible)
+        candidates = []
+        for i, first in enumerate(level_feasible):
+            for second in level_feasible[i + 1:]:
+                if first[:-1] != second[:-1]:
+                    break
+                candidate = first + second[-1:]
+                if all(candidate[:j] + candidate[j + 1:] in feasible for j in range(len(candidate) - 2)):
+                    candidates.append(frozenset(candidate))
+        return candidates
+
+    def search_hyperedge_batch(self, task_id_sets) -> list:
+        """从多组任务节点中逐层（广度优先）找出所有的超边
+        与 search_hyperedge 的剪枝规则相同，但同一层中需要模拟的任务集先排队，再用 judge_feasibility_batch 一次性模拟。
+        不可调度的任务集的 len-1 子集构成下一层，下一层搜索完后才能判断上一层的任务集是否为最小不可调度组合
+        返回每组任务节点的搜索结果
+        """
+        level = list(dict.fromkeys(frozenset(task_id_set) for task_id_set in task_id_sets)) # 去重并保持顺序
+        parents = {}    # 上一层新判定为不可调度的任务集 -> 其 len-1 子集
+        results = None
+        while level:
+            verdicts = {}   # 本层每个任务集的搜索结果，相当于 search_hyperedge 的返回值
+            pending = []    # 排队等待批量模拟的任务集
+            expanded = []   # 本层新判定为不可调度、需要搜索子集的任务集
+            for task_id_set in level:
+                known = self.known_feasibility(task_id_set)
+                if known is not None:
+                    verdicts[task_id_set] = known
+                    continue
+
+                system_utilization = self.calculate_system_utilization(task_id_set)
+                if system_utilization <= 1 and not self.has_unschedulable_combination(task_id_set):
+                    pending.append((task_id_set, system_utilization))
+                else:
+                    self.record_negative_sample(task_id_set, system_utilization)
+                    verdicts[task_id_set] = False
+                    expanded.append(task_id_set)
+
+            feasibilities = self.judge_feasibility_batch([task_id_set for task_id_set, _ in pending])
+            for (task_id_set, system_utilization), feasible in zip(pending, feasibilities):
+                if feasible:
+                    self.record_hyperedge(task_id_set, system_utilization)
+                else:
+                    self.record_negative_sample(task_id_set, system_utilization)
+                    expanded.append(task_id_set)
+                verdicts[task_id_set] = feasible
+
+            if results is None:
+                results = [verdicts[frozenset(task_id_set)] for task_id_set in task_id_sets]
+
+            # 上一层不可调度的任务集的真子集都可调度时，为最小不可调度组合
+            for parent, subsets in parents.items():
+                if all(verdicts[subset] for subset in subsets):
+                    self.record_minimal_unschedulable_combination(parent)
+
+            parents = {task_id_set: [frozenset(subset) for subset in itertools.combinations(task_id_set, len(task_id_set)-1)]
+                       for task_id_set in expanded}
+            level = list(dict.fromkeys(subset for subsets in parents.values() for subset in subsets))
+
+        return results if results is not None else []
+
+
+# 并行搜索的工作进程状态，由 init_search_worker 初始化
+search_worker_state = {}
+
+def init_search_worker(processors, tasks, options, batch_size, shared_hyperedges, shared_combinations, visited_path: Path):
+    """工作进程初始化：创建使用与主进程相同的 SearchOptions、不读写结果文件的 DataGenerator，记录共享列表
+    设置了 SearchOptions.visited_memory_limit 时，负采样溢出到 visited_path 中本进程独占的子目录
+    """
+    generator = DataGenerator(0, None, options)
+    generator.processors = processors
+    generator.tasks = load_task_store(tasks) if isinstance(tasks, Path) else tasks
+    search_worker_state.update(generator=generator, batch_size=batch_size,
+                               shared_hyperedges=shared_hyperedges, shared_combinations=shared_combinations,
+                               hyperedges=[], combinations=[], visited_path=visited_path / f"worker{os.getpid()}")
+
+def search_worker(task_id_sets, snapshot):
+    """在工作进程中搜索一组随机任务集
+    snapshot 为可使用的共享列表长度，工作进程只读取这一长度内的共享结果，使搜索结果与进程调度无关
+    返回新发现的超边、负采样和最小不可调度组合，按任务id排序以保证合并顺序确定，以及模拟结束原因、追踪器、可调度性检验和缓存的统计
+    """
+    state = search_worker_state
+    for key, shared_key, length in (("hyperedges", "shared_hyperedges", snapshot[0]),
+                                    ("combinations", "shared_combinations", snapshot[1])):
+        if len(state[key]) > length:
+            del state[key][length:]
+        state[key].extend(state[shared_key][len(state[key]):length])
+
+    generator: DataGenerator = state["generator"]
+    generator.hyperedges = TaskSetIndex(state["hyperedges"])
+    generator.negative_samples = generator.create_negative_samples(state["visited_path"])
+    generator.negative_samples.clear()  # 删除上一个搜索任务溢出到磁盘的负采样
+    generator.minimal_unschedulable_combinations = TaskSetIndex(state["combinations"])
+    known_hyperedges = set(state["hyperedges"])
+    known_combinations = set(state["combinations"])
+    if generator.schedulability_tests is not None:
+        generator.schedulability_tests.statistics.clear()
+    if generator.feasibility_cache is not None:
+        generator.feasibility_cache.hits = generator.feasibility_cache.misses = 0
+    generator.terminations.clear()
+    generator.search_statistics.clear()
+    if generator.options.multiset_memo:
+        generator.reset_multiset_memo() # 只使用快照中的结果，使搜索结果与工作进程处理过哪些搜索任务无关
+    if isinstance(generator.options.tracer, tr.CountingTracer):
+        generator.options.tracer.counts.clear()
+    if generator.options.profiler.enabled:
+        generator.options.profiler.clear()
+
+    if generator.options.strategy == "bottom_up":
+        for task_id_set in task_id_sets:
+            generator.search_hyperedge_bottom_up(task_id_set, state["batch_size"])
+    elif state["batch_size"]:
+        generator.search_hyperedge_batch(task_id_sets)
+    else:
+        for task_id_set in task_id_sets:
+            generator.search_hyperedge(task_id_set)
+    statistics = {"terminations": generator.terminations, "search": generator.search_statistics}
+    if isinstance(generator.options.tracer, tr.CountingTracer):
+        statistics["tracer"] = generator.options.tracer.counts
+    if generator.options.profiler.enabled:
+        statistics["profiler"] = generator.options.profiler
+    if generator.schedulability_tests is not None:
+        statistics["schedulability_tests"] = generator.schedulability_tests.statistics
+    if generator.feasibility_cache is not None:
+        generator.feasibility_cache.commit() # 搜索任务之间工作进程可能空闲，不能一直持有写锁
+        statistics["feasibility_cache"] = (generator.feasibility_cache.hits, generator.feasibility_cache.misses)
 
-            return False
\ No newline at end of file
+    negative_samples = sorted(generator.negative_samples, key=sorted)
+    generator.negative_samples.clear()
+    return (sorted((task_id_set for task_id_set in generator.hyperedges if task_id_set not in known_hyperedges), key=sorted),
+            negative_samples,
+            sorted((task_id_set for task_id_set in generator.minimal_unschedulable_combinations
+                    if task_id_set not in known_combinations), key=sorted),
+            statistics)
@@ -0,0 +1,103 @@
+import numpy as np
+
+class ExecutionHistory(object):
+    '''处理器的执行历史，按列保存在类型化的 NumPy 数组中
+    每条记录为 (task.id, task.instance_id, 开始时刻, 执行时长)，与原先的四元组相同。
+    数组在第一次记录时分配，容量不足时加倍扩展，不启用历史记录的模拟不分配内存
+    Attributes:
+        max_records:    记录数量上限，为None时不设上限
+        mode:           达到上限后的处理方式
+                        "cap":  不再记录新的执行片段，dropped 为丢弃的记录数量
+                        "ring": 环形缓冲，覆盖最早的记录，只保留最近的 max_records 条
+        dropped:        因达到上限而丢弃的记录数量
+    '''
+    MODES = ("cap", "ring")
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, max_records: int = None, mode: str = "cap"):
+        if mode not in self.MODES:
+            raise ValueError(f"unknown history mode: {mode}")
+
+        self.max_records = max_records
+        self.mode = mode
+        self.dropped = 0
+        self.size = 0       # 已保存的记录数量
+        self.head = 0       # 环形缓冲中最早的记录的位置
+        self.task_id = None
+        self.instance_id = None
+        self.start = None
+        self.duration = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        '''按时间顺序返回 (task.id, task.instance_id, 开始时刻, 执行时长) 四元组'''
+        columns = self.columns()
+        return zip(columns["task_id"].tolist(), columns["instance_id"].tolist(),
+                   columns["start"].tolist(), columns["duration"].tolist())
+
+    def allocate(self, capacity: int):
+        '''分配或扩展数组，保持记录的时间顺序'''
+        columns = self.columns() if self.task_id is not None else None
+        self.task_id = np.empty(capacity, dtype=np.int64)
+        self.instance_id = np.empty(capacity, dtype=np.int64)
+        self.start = np.empty(capacity, dtype=np.float64)
+        self.duration = np.empty(capacity, dtype=np.float64)
+        if columns is not None:
+            self.task_id[:self.size] = columns["task_id"]
+            self.instance_id[:self.size] = columns["instance_id"]
+            self.start[:self.size] = columns["start"]
+            self.duration[:self.size] = columns["duration"]
+        self.head = 0
+
+    def append(self, task_id, instance_id, start, duration):
+        if self.max_records is not None and self.size >= self.max_records:
+            if self.mode == "cap" or self.max_records == 0:
+                self.dropped += 1
+                return
+            # 环形缓冲已满，覆盖最早的记录
+            i = self.head
+            self.head = (self.head + 1) % self.max_records
+            self.dropped += 1
+        else:
+            if self.task_id is None or self.size == len(self.task_id):
+                capacity = self.INITIAL_CAPACITY if self.task_id is None else 2 * len(self.task_id)
+                if self.max_records is not None:
+                    capacity = min(capacity, self.max_records)
+                self.allocate(capacity)
+            i = self.size
+            self.size += 1
+
+        self.task_id[i] = task_id
+        self.instance_id[i] = instance_id
+        self.start[i] = start
+        self.duration[i] = duration
+
+    def columns(self) -> dict:
+        '''按时间顺序返回各列数组：task_id、instance_id、start、duration'''
+        if self.task_id is None:
+            empty = {"task_id": np.int64, "instance_id": np.int64, "start": np.float64, "duration": np.float64}
+            return {name: np.empty(0, dtype=dtype) for name, dtype in empty.items()}
+
+        order = np.arange(self.head, self.head + self.size) % len(self.task_id)
+        return {"task_id": self.task_id[order], "instance_id": self.instance_id[order],
+                "start": self.start[order], "duration": self.duration[order]}
+
+    def window(self, start=None, end=None) -> dict:
+        '''返回与时间窗口 [start, end) 有交集的执行片段的各列数组，片段被裁剪到窗口内'''
+        columns = self.columns()
+        slice_start = columns["start"]
+        slice_end = slice_start + columns["duration"]
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        selected = (slice_end > start) & (slice_start < end)
+        columns = {name: column[selected] for name, column in columns.items()}
+        columns["start"] = np.maximum(columns["start"], start)
+        columns["duration"] = np.minimum(slice_end[selected], end) - columns["start"]
+        return columns
+
+    def clear(self):
+        self.size = 0
+        self.head = 0
+        self.dropped = 0
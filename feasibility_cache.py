@@ -0,0 +1,130 @@
+import atexit
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+class FeasibilityCache(object):
+    '''持久化到本地 SQLite 数据库的任务集可调度性缓存，可在多次运行、多个进程之间共享
+    键为处理器平台速度与任务集中各任务 (e, d, T) 的哈希，与任务id无关。
+    截止时间相同的任务按添加到调度器的顺序决定优先级，可调度性与任务顺序有关，因此键保留 task_rows 的顺序，
+    调用者需要按模拟时的顺序传入 task_rows。
+    Attributes:
+        max_entries:    缓存条目数量上限，超出时淘汰最久未使用的条目
+        variant:        影响模拟结果的设置（例如模拟截断时刻），不同设置下的结果互不混用
+        hits:           命中次数
+        misses:         未命中次数
+        evictions:      淘汰的条目数量
+        recency:        命中后尚未写入数据库的 last_used，提交事务或淘汰前批量写入，避免每次命中都执行一次 UPDATE
+    '''
+    COMMIT_INTERVAL = 1000  # 每累计这么多次写入提交一次事务
+    COMMIT_SECONDS = 1.0    # 写事务最长保持的时间，避免其他进程等待写锁过久
+
+    def __init__(self, path: Path, max_entries: int = 1000000, variant: str = ""):
+        self.max_entries = max_entries
+        self.variant = variant
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.pending_writes = 0
+        self.first_pending_write = 0.0
+        self.recency = {}
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL") # 允许多个进程同时读写
+        self.connection.execute("PRAGMA synchronous=NORMAL") # WAL 模式下提交时不必每次同步到磁盘
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS feasibility (
+                                       key BLOB PRIMARY KEY,
+                                       feasible INTEGER NOT NULL,
+                                       last_used INTEGER NOT NULL)""")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS feasibility_last_used ON feasibility (last_used)")
+        self.connection.commit()
+
+        # last_used 为逻辑时钟，每次访问递增
+        self.clock = self.connection.execute("SELECT COALESCE(MAX(last_used), 0) FROM feasibility").fetchone()[0]
+        self.size = self.connection.execute("SELECT COUNT(*) FROM feasibility").fetchone()[0]
+        if self.size > self.max_entries:
+            self.evict()
+            self.commit()
+
+        atexit.register(self.close)
+
+    def make_key(self, speeds, task_rows) -> bytes:
+        '''由平台速度和任务集的 (e, d, T) 计算缓存键，task_rows 的顺序为模拟时任务添加到调度器的顺序'''
+        speeds = sorted((float(speed) for speed in speeds), reverse=True)
+        task_rows = [tuple(int(x) for x in row) for row in task_rows]
+        return hashlib.blake2b(repr((self.variant, speeds, task_rows)).encode(), digest_size=16).digest()
+
+    def get(self, speeds, task_rows):
+        '''返回缓存的可调度性，未命中时返回None'''
+        key = self.make_key(speeds, task_rows)
+        row = self.connection.execute("SELECT feasible FROM feasibility WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.clock += 1
+        self.recency[key] = self.clock
+        self.count_write()
+        return bool(row[0])
+
+    def put(self, speeds, task_rows, feasible: bool):
+        key = self.make_key(speeds, task_rows)
+        self.clock += 1
+        self.recency.pop(key, None)
+        cursor = self.connection.execute("INSERT OR IGNORE INTO feasibility (key, feasible, last_used) VALUES (?, ?, ?)",
+                                         (key, int(feasible), self.clock))
+        if cursor.rowcount:
+            self.size += 1  # 只有新插入的条目增加缓存大小
+        else:
+            self.connection.execute("UPDATE feasibility SET feasible = ?, last_used = ? WHERE key = ?",
+                                    (int(feasible), self.clock, key))
+        if self.size > self.max_entries:
+            self.evict()
+        self.count_write()
+
+    def evict(self):
+        '''淘汰最久未使用的条目，一次淘汰到上限的90%，避免每次写入都触发淘汰'''
+        self.write_recency()
+        self.size = self.connection.execute("SELECT COUNT(*) FROM feasibility").fetchone()[0]
+        excess = self.size - int(self.max_entries * 0.9)
+        if excess > 0:
+            self.connection.execute("""DELETE FROM feasibility WHERE key IN (
+                                           SELECT key FROM feasibility ORDER BY last_used LIMIT ?)""", (excess,))
+            self.evictions += excess
+            self.size -= excess
+
+    def count_write(self):
+        if self.pending_writes == 0:
+            self.first_pending_write = time.monotonic()
+        self.pending_writes += 1
+        if (self.pending_writes >= self.COMMIT_INTERVAL
+            or time.monotonic() - self.first_pending_write >= self.COMMIT_SECONDS):
+            self.commit()
+
+    def write_recency(self):
+        '''将命中后更新的 last_used 批量写入数据库'''
+        if self.recency:
+            self.connection.executemany("UPDATE feasibility SET last_used = ? WHERE key = ?",
+                                        [(clock, key) for key, clock in self.recency.items()])
+            self.recency.clear()
+
+    def commit(self):
+        '''提交尚未提交的写入，释放写锁'''
+        self.write_recency()
+        self.connection.commit()
+        self.pending_writes = 0
+
+    def statistics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": self.size,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def close(self):
+        if self.connection is not None:
+            self.commit()
+            self.connection.close()
+            self.connection = None
+            atexit.unregister(self.close)
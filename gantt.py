@@ -1,6 +1,13 @@
 import matplotlib.pyplot as plt
 
-def plot_gantt(scheduler):
+def plot_gantt(scheduler, file_name="gantt1.png", start=None, end=None, max_labels: int = 200):
+    '''绘制调度过程的gantt图
+    每个处理器的执行片段用一次 broken_barh 批量绘制
+    start, end:
+        只绘制时间窗口 [start, end) 内的执行片段，为None时不限制
+    max_labels:
+        窗口内的执行片段多于这一数量时不再在矩形中标注任务序号，避免缩小显示时标注重叠且绘制缓慢
+    '''
     # Declaring a figure
     fig, ax = plt.subplots()
 
@@ -13,14 +20,24 @@ def plot_gantt(scheduler):
     # Setting graph attribute
     ax.grid(True)
 
+    windows = [processor.history.window(start, end) for processor in scheduler.processors]
+    draw_labels = sum(len(window["task_id"]) for window in windows) <= max_labels
+
     # 绘制条形图，并将任务序号写在矩形中间
-    for i, processor in enumerate(scheduler.processors):
+    for i, window in enumerate(windows):
+        if not len(window["task_id"]):
+            continue
         # 绘制代表processor这一行的running history
-        for record in processor.history:
-            task_id, task_instance_id = record[0:2]
-            color = 'C' + str(task_id % 10) 
-            ax.broken_barh([record[2:4]], (i*10, 4), facecolors=color)
-            ax.annotate(f"t{task_id},{task_instance_id}", 
-                        xy=(record[2]+record[3]/2, i*10+2), ha='center', va='center')
+        colors = [f"C{task_id % 10}" for task_id in window["task_id"].tolist()]
+        ax.broken_barh(list(zip(window["start"].tolist(), window["duration"].tolist())), (i*10, 4), facecolors=colors)
+        if draw_labels:
+            for task_id, task_instance_id, slice_start, duration in zip(*(window[name].tolist() for name in
+                                                                         ("task_id", "instance_id", "start", "duration"))):
+                ax.annotate(f"t{task_id},{task_instance_id}",
+                            xy=(slice_start + duration/2, i*10+2), ha='center', va='center')
+
+    if start is not None or end is not None:
+        ax.set_xlim(left=start, right=end)
 
-    plt.savefig("gantt1.png")
+    plt.savefig(file_name)
+    plt.close(fig)
@@ -1,6 +1,17 @@
 import data_generater as data
+import tracer as tr
+import profiler as pf
+import logging
+from logger_config import logger
+from search_options import SearchOptions
+from collections import Counter
 from pathlib import Path
 import argparse
+import csv
+
+def bottom_up_budget(value: str):
+    '''--bottom_up_budget 的取值：auto 或正整数'''
+    return value if value == "auto" else int(value)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -10,7 +21,43 @@ if __name__ == "__main__":
     parser.add_argument('-hs', '--max_hyperedge_size', help='设置超边最多可链接的节点数量', type=int)
     parser.add_argument('-e', '--num_of_hyperedge', help='设置随机搜索的超边数量', type=int, required=True)
     parser.add_argument('-i', '--implicit_deadline', help='设置任务集为隐式deadline', action='store_true')
+    parser.add_argument('--utilization', help='设置归一化利用率的生成方式：uniform 独立均匀分布，uunifast/randfixedsum 每组任务的利用率之和固定',
+                        choices=['uniform', 'uunifast', 'randfixedsum'], default='uniform')
+    parser.add_argument('--group_size', help='设置 uunifast/randfixedsum 每组的任务数量，默认为处理器数量', type=int)
+    parser.add_argument('--total_utilization', help='设置 uunifast/randfixedsum 每组的归一化利用率之和，默认为处理器归一化后的性能之和', type=float)
+    parser.add_argument('--chunk_size', help='设置后分块生成任务池并以内存映射的 .npy 文件保存，用于大规模任务池', type=int)
     parser.add_argument('-lp', '--load_platform', help='加载处理器平台所在地址', type=str)
+    parser.add_argument('--engine', help='设置模拟调度引擎', choices=['rescan', 'event_queue'], default='rescan')
+    parser.add_argument('-b', '--batch_size', help='设置每批同步模拟的随机任务集数量，不设置则逐个搜索', type=int)
+    parser.add_argument('-w', '--workers', help='设置并行搜索超边的进程数量', type=int)
+    parser.add_argument('--strategy', help='设置超边搜索方式：top_down 自顶向下搜索不可调度任务集的子集，bottom_up 自底向上逐层枚举可调度子集',
+                        choices=['top_down', 'bottom_up'], default='top_down')
+    parser.add_argument('--bottom_up_budget', help='设置自底向上枚举每个随机任务集的模拟次数上限，超出时改为自顶向下搜索：'
+                        '不设置则不限制，auto 为此前随机任务集自顶向下搜索平均需要的模拟次数', type=bottom_up_budget)
+    parser.add_argument('--prefilter', help='设置模拟前的可调度性检验：off 不检验，on 检验得出结论则不再模拟，verify 检验后仍模拟并校验结论',
+                        choices=['off', 'on', 'verify'], default='off')
+    parser.add_argument('--cache', help='设置持久化可调度性缓存的数据库路径，多次运行之间共享模拟结果', type=str)
+    parser.add_argument('--cache_size', help='设置可调度性缓存的条目数量上限', type=int, default=1000000)
+    parser.add_argument('--flush_interval', help='设置后台线程将缓冲的搜索结果写入文件的时间间隔（秒）', type=float)
+    parser.add_argument('--npz', help='搜索结束后额外以二进制 .npz 保存超图关联矩阵和任务特征', action='store_true')
+    parser.add_argument('--horizon', help='设置模拟的结束方式：fixed 模拟一个超周期，adaptive 结论确定即停止模拟',
+                        choices=['fixed', 'adaptive'], default='fixed')
+    parser.add_argument('--trace', help='设置模拟调度的追踪器：none 不追踪，log 记录 debug 日志，progress 显示每次模拟的进度条，count 统计事件次数',
+                        choices=list(tr.TRACERS), default='none')
+    parser.add_argument('--multiset_memo', help='按任务参数 (e, d, T) 的多重集记录搜索结果，推广到参数相同的其他任务集。'
+                        '这是另一种标注方式：任务按参数而非任务id 的顺序加入调度器，期限相同时的平局处理不同，'
+                        '个别任务集的标注可能与不启用时不同', action='store_true')
+    parser.add_argument('--checkpoint_interval', help='设置保存搜索检查点的时间间隔（秒），进程中断后可用 --resume 继续', type=float)
+    parser.add_argument('--resume', help='从 data 目录中的检查点继续搜索，需要与中断的运行使用相同的参数', action='store_true')
+    parser.add_argument('--shard_size', help='多进程协作模式：与其他进程（可在共享文件系统的其他节点上）认领不同的分片，每个分片包含这一数量的随机任务集', type=int)
+    parser.add_argument('--claim_timeout', help='设置分片认领的超时时间（秒），超时未完成的分片可被其他进程重新认领', type=float)
+    parser.add_argument('--merge_shards', help='只合并已完成的分片结果，不搜索', action='store_true')
+    parser.add_argument('--visited_memory_limit', help='设置内存中最多保存的负采样数量，超出的部分以紧凑格式溢出到 data 目录中的文件', type=int)
+    parser.add_argument('--profile', help='记录搜索各阶段的耗时、剪枝规则的生效次数和模拟开销，运行结束后以 JSON 保存到这一路径', type=str)
+    parser.add_argument('--incremental', help='增量模拟不可调度任务集的子集：利用错过期限的见证跳过模拟，或从快照继续模拟', action='store_true')
+    parser.add_argument('--exact_time', help='精确时间模式：处理器速度按十进制表示的精确分数处理，速度和执行工作量放大为整数后模拟，避免浮点误差', action='store_true')
+    parser.add_argument('--sweep', help='多平台扫描：csv 文件每行为一个处理器平台的速度，用同一个任务池在每个平台上分别生成超边', type=str)
+    parser.add_argument('--verify_engine', help='同时使用两种引擎模拟并校验结果是否一致', action='store_true')
 
     args = parser.parse_args()
 
@@ -21,13 +68,82 @@ if __name__ == "__main__":
     num_of_hyperedge = args.num_of_hyperedge
     implicit_deadline = args.implicit_deadline
 
+    if args.trace == "log":
+        # LoggingTracer 以 debug 级别记录，需要降低 logger 和 handler 的日志级别
+        logger.setLevel(logging.DEBUG)
+        for handler in logger.handlers:
+            handler.setLevel(logging.DEBUG)
+
     data_folder_path = Path(f"./data/data_s{seed}_p{number_of_processors}_t{number_of_tasks}_hs{max_hyperedge_size}_e{num_of_hyperedge}")
-    dg = data.DataGenerator(seed, data_folder_path)
+    options = SearchOptions(engine=args.engine, verify_engine=args.verify_engine, prefilter=args.prefilter,
+                            cache_path=Path(args.cache) if args.cache else None, cache_size=args.cache_size,
+                            horizon=args.horizon, tracer=tr.TRACERS[args.trace](),
+                            strategy=args.strategy, bottom_up_budget=args.bottom_up_budget,
+                            multiset_memo=args.multiset_memo, visited_memory_limit=args.visited_memory_limit,
+                            profiler=pf.SearchProfiler() if args.profile else None,
+                            incremental=args.incremental, exact_time=args.exact_time)
+    dg = data.DataGenerator(seed, data_folder_path, options, flush_interval=args.flush_interval,
+                            checkpoint_interval=args.checkpoint_interval, resume=args.resume,
+                            sharded=bool(args.shard_size or args.merge_shards))
 
     if args.load_platform:
         platform = dg.load_platform(Path(args.load_platform))
     else:
         platform = dg.generate_platform(number_of_processors)
-    task_set = dg.generate_tasks(number_of_tasks, implicit_deadline)
+    if args.chunk_size:
+        task_set = dg.generate_tasks_chunked(number_of_tasks, implicit_deadline, args.chunk_size, args.utilization,
+                                             args.group_size, args.total_utilization)
+    else:
+        task_set = dg.generate_tasks(number_of_tasks, implicit_deadline, args.utilization, args.group_size,
+                                     args.total_utilization)
+
+    if args.sweep:
+        with open(args.sweep, "r") as file:
+            platforms = [[float(speed) for speed in row] for row in csv.reader(file) if row]
+        generators = dg.sweep_platforms(platforms, max_hyperedge_size, num_of_hyperedge, batch_size=args.batch_size,
+                                        workers=args.workers)
+        for i, generator in enumerate(generators):
+            logger.info(f"platform {i} {generator.platform_speeds()}: hyperedges: {len(generator.hyperedges)}, "
+                        f"simulation terminations: {dict(generator.terminations)}")
+        logger.info(f"verdicts inferred across platforms: {dict(generators[0].platform_sweep.statistics)}")
+        dg.terminations = sum((generator.terminations for generator in generators), Counter())
+        dg.search_statistics = sum((generator.search_statistics for generator in generators), Counter())
+        if args.npz:
+            for generator in generators:
+                generator.save_hypergraph(generator.data_path / "hypergraph.npz")
+    elif args.merge_shards:
+        dg.merge_shards()
+    elif args.shard_size:
+        if not dg.generate_hyperedge_sharded(max_hyperedge_size, num_of_hyperedge, args.shard_size,
+                                             batch_size=args.batch_size, claim_timeout=args.claim_timeout):
+            logger.warning("shards claimed by other processes are not completed yet, run with --merge_shards after they finish")
+    else:
+        dg.generate_hyperedge(max_hyperedge_size, num_of_hyperedge, batch_size=args.batch_size, workers=args.workers)
+        if args.npz:
+            dg.save_hypergraph(data_folder_path / "hypergraph.npz")
+    dg.result_sink.close()
 
-    dg.generate_hyperedge(max_hyperedge_size, num_of_hyperedge)
+    logger.info(f"simulation terminations: {dict(dg.terminations)}")
+    if args.strategy == "bottom_up":
+        saved = dg.search_statistics["top_down_simulations"] - dg.search_statistics["bottom_up_simulations"]
+        seeds = dg.search_statistics["bottom_up_seeds"]
+        fallback_rate = dg.search_statistics["bottom_up_fallbacks"] / seeds if seeds else 0.0
+        logger.info(f"search simulations: {dict(dg.search_statistics)}, saved by bottom-up: {saved}, "
+                    f"fallback rate: {fallback_rate:.1%}")
+    if args.multiset_memo:
+        logger.info(f"simulations saved by multiset memo: {dg.search_statistics['multiset_memo_saved']}, "
+                    f"pruned by multiset combinations: {dg.search_statistics['multiset_combination_pruned']}")
+    if args.incremental:
+        logger.info(f"simulations pruned by deadline miss witnesses: {dg.search_statistics['witness_pruned']}, "
+                    f"replayed from snapshots: {dg.search_statistics['replayed_simulations']}, "
+                    f"simulated time skipped: {dg.search_statistics['replay_skipped_time']}")
+    if isinstance(dg.options.tracer, tr.CountingTracer):
+        logger.info(f"simulation events: {dict(dg.options.tracer.counts)}")
+    if dg.schedulability_tests is not None:
+        logger.info(f"schedulability tests: {dict(dg.schedulability_tests.statistics)}, mismatches: {dict(dg.schedulability_tests.mismatches)}")
+    if dg.feasibility_cache is not None:
+        logger.info(f"feasibility cache: {dg.feasibility_cache.statistics()}")
+        dg.feasibility_cache.close()
+    if args.profile:
+        dg.options.profiler.save(Path(args.profile))
+        logger.info(f"profile saved to {args.profile}")
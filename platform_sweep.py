@@ -0,0 +1,86 @@
+from collections import Counter
+import itertools
+import numpy as np
+
+class PlatformSweep(object):
+    '''多个处理器平台共用一个任务池时，在平台之间共享与平台无关的任务集参数和已得出的可调度性结论
+    平台 a 支配平台 b：a 的处理器数量不少于 b，且按速度降序排列后 a 的每个处理器都不慢于 b 对应的处理器。
+    任务集在平台 b 上可调度时，在支配 b 的平台上也可调度；在平台 a 上不可调度时，在被 a 支配的平台上也不可调度
+    Attributes:
+        tasks:          任务池，与 DataGenerator.tasks 相同
+        platforms:      每个平台的处理器速度，按降序排序
+        fastest_speed:  生成任务池的平台上最快处理器的速度，任务池中的归一化利用率以它为基准，见 normalized_utilization
+        profiles:       任务集 -> (任务的 (e, d, T)，归一化利用率之和)，与平台无关，所有平台只计算一次。
+                        超过 max_profiles 个时淘汰最早计算的条目
+        verdicts:       verdicts[i] 为平台 i 上已记录的搜索结果，任务集 -> 是否可调度。
+                        只记录之后的平台会查询的结果，这些平台都搜索完毕后释放，见 finish
+        dominated:      dominated[i] 为被平台 i 支配的其他平台序号
+        dominating:     dominating[i] 为支配平台 i 的其他平台序号
+        last_query:     last_query[i] 为会查询平台 i 的搜索结果的最后一个平台序号，没有时为 -1。平台按序号依次搜索
+        statistics:     由支配关系推出结论的次数，"feasible" 和 "infeasible" 分别计数
+    '''
+    def __init__(self, tasks: np.ndarray, platforms, fastest_speed: float, max_profiles: int = 1000000):
+        self.tasks = tasks
+        self.platforms = [sorted((float(speed) for speed in speeds), reverse=True) for speeds in platforms]
+        self.fastest_speed = fastest_speed
+        self.max_profiles = max_profiles
+        self.profiles = {}
+        self.verdicts = [{} for _ in self.platforms]
+        self.dominated = [[j for j, other in enumerate(self.platforms) if j != i and self.dominates(speeds, other)]
+                          for i, speeds in enumerate(self.platforms)]
+        self.dominating = [[j for j, other in enumerate(self.platforms) if j != i and self.dominates(other, speeds)]
+                           for i, speeds in enumerate(self.platforms)]
+        self.last_query = [max((k for k in range(j + 1, len(self.platforms))
+                                if j in self.dominated[k] or j in self.dominating[k]), default=-1)
+                           for j in range(len(self.platforms))]
+        self.statistics = Counter()
+
+    @staticmethod
+    def dominates(speeds, other_speeds) -> bool:
+        '''速度降序排列的平台 speeds 是否支配平台 other_speeds'''
+        return (len(speeds) >= len(other_speeds)
+                and all(speed >= other_speed for speed, other_speed in zip(speeds, other_speeds)))
+
+    def profile(self, task_id_set: frozenset) -> tuple:
+        '''任务集中任务的 (e, d, T)（按 task_id 升序）和归一化利用率之和'''
+        profile = self.profiles.get(task_id_set)
+        if profile is None:
+            # 利用率之和的求和顺序与 DataGenerator.calculate_system_utilization 相同，结果逐位一致
+            profile = (self.tasks[sorted(task_id_set)][:, 0:3].astype(int), sum(self.tasks[list(task_id_set)][:, 3]))
+            if len(self.profiles) >= self.max_profiles:
+                # 一次淘汰到上限的90%，dict 按插入顺序迭代，先淘汰最早计算的条目
+                for key in list(itertools.islice(self.profiles, len(self.profiles) - int(self.max_profiles * 0.9) + 1)):
+                    del self.profiles[key]
+            self.profiles[task_id_set] = profile
+        return profile
+
+    def normalized_utilization(self, task_id_set: frozenset, fastest_speed: float):
+        '''任务集以速度为 fastest_speed 的处理器为基准的归一化利用率之和
+        任务池中的归一化利用率以生成任务池的平台上最快的处理器为基准，在最快处理器速度不同的平台上需要换算。
+        两者速度相同时换算系数恰好为1，结果与 DataGenerator.calculate_system_utilization 逐位一致
+        '''
+        return self.profile(task_id_set)[1] * (self.fastest_speed / fastest_speed)
+
+    def known_verdict(self, platform_index: int, task_id_set: frozenset):
+        '''由其他平台上的搜索结果推出任务集在平台 platform_index 上的可调度性，无法推出时返回None'''
+        for j in self.dominated[platform_index]:
+            if self.verdicts[j].get(task_id_set) is True:
+                self.statistics["feasible"] += 1
+                return True
+        for j in self.dominating[platform_index]:
+            if self.verdicts[j].get(task_id_set) is False:
+                self.statistics["infeasible"] += 1
+                return False
+        return None
+
+    def record(self, platform_index: int, task_id_set: frozenset, feasible: bool):
+        if self.last_query[platform_index] > platform_index:
+            self.verdicts[platform_index][task_id_set] = feasible
+
+    def finish(self, platform_index: int):
+        '''平台 platform_index 搜索完毕，释放之后的平台不会再查询的搜索结果；所有平台都搜索完毕时释放 profiles'''
+        for j in range(platform_index + 1):
+            if self.last_query[j] <= platform_index:
+                self.verdicts[j] = {}
+        if platform_index == len(self.platforms) - 1:
+            self.profiles = {}
@@ -0,0 +1,140 @@
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+class NullStage(object):
+    '''空分析器的计时区间，不做任何事'''
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_STAGE = NullStage()
+
+class NullProfiler(object):
+    '''超边搜索的性能分析器接口，默认的空分析器
+    DataGenerator 在搜索的各个阶段调用 stage()、hit() 和 on_simulation()，空分析器不做任何记录。
+    自定义分析器继承此类，将 enabled 设为 True 并重写需要的方法
+    '''
+    enabled = False
+
+    def stage(self, name: str):
+        '''返回计时区间，用法为 with profiler.stage(name): ...'''
+        return NULL_STAGE
+
+    def hit(self, rule: str):
+        '''剪枝规则 rule 生效一次，不需要模拟即得出结论'''
+
+    def on_simulation(self, size: int, scheduler, seconds: float):
+        '''完成一次模拟，size 为任务集的任务数量，scheduler 为模拟后的调度器'''
+
+    def merge(self, other):
+        '''合并另一个分析器（例如并行搜索的工作进程中）的统计'''
+
+NULL_PROFILER = NullProfiler()
+
+class Stage(object):
+    '''SearchProfiler 的计时区间，累计进入次数和耗时（包含其中嵌套的其他阶段）'''
+    __slots__ = ("calls", "seconds", "starts")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.starts = []    # 允许递归进入同一阶段，只计最外层的耗时
+
+    def __enter__(self):
+        self.calls += 1
+        self.starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc_info):
+        start = self.starts.pop()
+        if not self.starts:
+            self.seconds += time.perf_counter() - start
+        return False
+
+    def __getstate__(self):
+        return (self.calls, self.seconds)
+
+    def __setstate__(self, state):
+        self.calls, self.seconds = state
+        self.starts = []
+
+class SearchProfiler(NullProfiler):
+    '''统计超边搜索各阶段的累计耗时、剪枝规则的生效次数和模拟开销
+    Attributes:
+        stages:         阶段名 -> Stage（调用次数、累计耗时），阶段之间可以嵌套，耗时包含嵌套的阶段
+        pruning:        剪枝规则 -> 生效次数
+        simulations:    任务数量 -> Counter("runs", "events", "simulated_time", "seconds")，即任务集大小与模拟开销的直方图
+        event_histogram:
+                        每次模拟的调度事件数量按 2 的幂分组的直方图，键为分组的上界
+        start:          创建分析器的时刻，报告中的 "elapsed_seconds" 为此后经过的时间
+    '''
+    enabled = True
+
+    def __init__(self):
+        self.stages = {}
+        self.pruning = Counter()
+        self.simulations = {}
+        self.event_histogram = Counter()
+        self.start = time.perf_counter()
+
+    def stage(self, name: str):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = Stage()
+        return stage
+
+    def hit(self, rule: str):
+        self.pruning[rule] += 1
+
+    def on_simulation(self, size: int, scheduler, seconds: float):
+        simulation = self.simulations.get(size)
+        if simulation is None:
+            simulation = self.simulations[size] = Counter()
+        simulation["runs"] += 1
+        simulation["events"] += scheduler.events
+        simulation["simulated_time"] += scheduler.current_timepoint
+        simulation["seconds"] += seconds
+        self.event_histogram[1 << max(scheduler.events - 1, 0).bit_length()] += 1
+
+    def merge(self, other):
+        for name, other_stage in other.stages.items():
+            stage = self.stage(name)
+            stage.calls += other_stage.calls
+            stage.seconds += other_stage.seconds
+        self.pruning.update(other.pruning)
+        for size, other_simulation in other.simulations.items():
+            self.simulations.setdefault(size, Counter()).update(other_simulation)
+        self.event_histogram.update(other.event_histogram)
+
+    def clear(self):
+        self.__init__()
+
+    def report(self) -> dict:
+        '''可以保存为 JSON 的分析报告'''
+        runs = sum(simulation["runs"] for simulation in self.simulations.values())
+        events = sum(simulation["events"] for simulation in self.simulations.values())
+        return {
+            "elapsed_seconds": time.perf_counter() - self.start,
+            "stages": {name: {"calls": stage.calls, "seconds": stage.seconds,
+                              "microseconds_per_call": stage.seconds / stage.calls * 1e6 if stage.calls else 0.0}
+                       for name, stage in sorted(self.stages.items(), key=lambda item: -item[1].seconds)},
+            "pruning": dict(self.pruning.most_common()),
+            "simulations": {
+                "runs": runs,
+                "events": events,
+                "events_per_run": events / runs if runs else 0.0,
+                "by_task_set_size": {size: {**simulation,
+                                            "events_per_run": simulation["events"] / simulation["runs"],
+                                            "milliseconds_per_run": simulation["seconds"] / simulation["runs"] * 1e3}
+                                     for size, simulation in sorted(self.simulations.items())},
+                "events_histogram": {f"<={bound}": count for bound, count in sorted(self.event_histogram.items())},
+            },
+        }
+
+    def save(self, file_name: Path):
+        with open(file_name, "w") as file:
+            json.dump(self.report(), file, indent=2)
@@ -0,0 +1,83 @@
+import atexit
+import csv
+import threading
+import numpy as np
+from pathlib import Path
+
+class ResultSink(object):
+    '''缓冲写入搜索结果的 csv 文件
+    每行结果先保存在内存中，累计 buffer_rows 行、后台线程定时（flush_interval 秒）或程序退出时，
+    每个文件只打开一次，批量追加写入，避免每条结果都打开、写入、关闭一次文件
+    Attributes:
+        data_path:      结果文件所在目录
+        buffer_rows:    缓冲的行数达到这一数量时写入文件
+        flush_interval: 后台线程写入文件的时间间隔（秒），为None时不启动后台线程
+    '''
+    def __init__(self, data_path: Path, buffer_rows: int = 1000, flush_interval: float = None):
+        self.data_path = data_path
+        self.buffer_rows = buffer_rows
+        self.buffers = {}           # 文件名 -> 尚未写入的行
+        self.buffered_rows = 0
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.flush_thread = None
+        if flush_interval:
+            self.flush_thread = threading.Thread(target=self.flush_periodically, args=(flush_interval,), daemon=True)
+            self.flush_thread.start()
+        atexit.register(self.close)
+
+    def write_row(self, file_name: str, row):
+        with self.lock:
+            self.buffers.setdefault(file_name, []).append(row)
+            self.buffered_rows += 1
+            if self.buffered_rows < self.buffer_rows:
+                return
+        self.flush()
+
+    def flush(self):
+        '''将缓冲的行追加写入对应的文件'''
+        with self.lock:
+            for file_name, rows in self.buffers.items():
+                with open(self.data_path / file_name, 'a', newline='') as csvfile:
+                    csv.writer(csvfile).writerows(rows)
+            self.buffers.clear()
+            self.buffered_rows = 0
+
+    def flush_periodically(self, flush_interval: float):
+        while not self.stop_event.wait(flush_interval):
+            self.flush()
+
+    def close(self):
+        self.stop_event.set()
+        if self.flush_thread is not None:
+            self.flush_thread.join()
+            self.flush_thread = None
+        self.flush()
+        atexit.unregister(self.close)
+
+def task_sets_to_csr(task_id_sets, number_of_tasks: int):
+    '''将任务集序列转换为 节点 × 任务集 的 CSR 稀疏关联矩阵，返回 (indptr, indices, shape)'''
+    nodes = np.fromiter((task_id for task_id_set in task_id_sets for task_id in task_id_set), dtype=np.int64)
+    columns = np.repeat(np.arange(len(task_id_sets), dtype=np.int64), [len(task_id_set) for task_id_set in task_id_sets])
+    order = np.lexsort((columns, nodes))    # 按节点、再按任务集排序
+    indptr = np.zeros(number_of_tasks + 1, dtype=np.int64)
+    np.cumsum(np.bincount(nodes, minlength=number_of_tasks), out=indptr[1:])
+    return indptr, columns[order], np.array([number_of_tasks, len(task_id_sets)], dtype=np.int64)
+
+def save_hypergraph_npz(file_name: Path, hyperedges, negative_samples, tasks: np.ndarray):
+    '''以二进制 .npz 保存超图，下游的图神经网络可以直接读取而不需要解析 csv
+    indptr/indices/data/shape/format:   节点 × 超边 的 CSR 关联矩阵，与 scipy.sparse.save_npz 的格式相同，
+                                        可以用 scipy.sparse.load_npz 读取
+    negative_indptr/negative_indices/negative_shape:    节点 × 负采样 的 CSR 关联矩阵
+    features:                           任务特征，即 (e, d, T, u) 四元组，行号为任务id
+    超边和负采样按其中的任务id排序，列号即为排序后的序号
+    '''
+    number_of_tasks = tasks.shape[0]
+    hyperedges = sorted((sorted(hyperedge) for hyperedge in hyperedges))
+    negative_samples = sorted((sorted(negative_sample) for negative_sample in negative_samples))
+    indptr, indices, shape = task_sets_to_csr(hyperedges, number_of_tasks)
+    negative_indptr, negative_indices, negative_shape = task_sets_to_csr(negative_samples, number_of_tasks)
+    np.savez(file_name, format=np.array(b"csr"), shape=shape, indptr=indptr, indices=indices,
+             data=np.ones(len(indices), dtype=np.int8),
+             negative_indptr=negative_indptr, negative_indices=negative_indices, negative_shape=negative_shape,
+             features=np.asarray(tasks))
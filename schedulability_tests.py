@@ -0,0 +1,84 @@
+from collections import Counter
+from logger_config import logger
+import numpy as np
+
+class Platform(object):
+    '''一致异构多处理器平台（uniform multiprocessor），预先计算各可调度性检验所需的平台参数
+    Attributes:
+        speeds:         处理器速度，按降序排序
+        total_speed:    所有处理器速度之和 S_m
+        prefix_speed:   prefix_speed[k-1] 为最快的 k 个处理器速度之和 S_k
+        lambda_:        λ = max_{i<m} (s_{i+1} + ... + s_m) / s_i，衡量平台的异构程度，同构平台为 m-1
+    '''
+    def __init__(self, speeds):
+        self.speeds = np.sort(np.asarray(speeds, dtype=np.float64))[::-1]
+        self.prefix_speed = np.cumsum(self.speeds)
+        self.total_speed = self.prefix_speed[-1]
+        suffix_speed = self.total_speed - self.prefix_speed        # 第 i 个处理器之后的处理器速度之和
+        self.lambda_ = float(np.max(suffix_speed / self.speeds))
+
+# 以下可调度性检验的参数 tasks 为 (e, d, T) 三列的二维数组，e 为在速度为1的处理器上的执行时间
+# 返回 True 表示任务集一定可调度（充分条件），False 表示一定不可调度（必要条件），None 表示无法判断
+
+def task_speed_test(tasks, platform: Platform):
+    '''必要条件：每个任务在最快的处理器上单独执行也要能在相对期限内完成'''
+    if np.any(tasks[:, 0] > tasks[:, 1] * platform.speeds[0]):
+        return False
+    return None
+
+def total_utilization_test(tasks, platform: Platform):
+    '''必要条件：任务集的总利用率不超过平台的总速度 S_m'''
+    if np.sum(tasks[:, 0] / tasks[:, 2]) > platform.total_speed:
+        return False
+    return None
+
+def density_bound_test(tasks, platform: Platform):
+    '''充分条件：一致多处理器上的全局EDF密度界（Funk–Goossens–Baruah）
+    δ_sum <= S_m - λ·δ_max 时任务集在全局EDF下可调度，δ = e / min(d, T)。隐式期限任务集的密度即利用率
+    '''
+    densities = tasks[:, 0] / np.minimum(tasks[:, 1], tasks[:, 2])
+    if np.sum(densities) <= platform.total_speed - platform.lambda_ * np.max(densities):
+        return True
+    return None
+
+def largest_utilization_test(tasks, platform: Platform):
+    '''必要条件：对 k = 1, ..., m，利用率最大的 k 个任务的利用率之和不超过最快的 k 个处理器的速度之和 S_k'''
+    k = min(len(tasks), len(platform.speeds))
+    utilizations = np.sort(tasks[:, 0] / tasks[:, 2])[::-1][:k]
+    if np.any(np.cumsum(utilizations) > platform.prefix_speed[:k]):
+        return False
+    return None
+
+# 默认的检验序列，按计算开销从小到大排列
+DEFAULT_TESTS = (task_speed_test, total_utilization_test, density_bound_test, largest_utilization_test)
+
+class SchedulabilityTestChain(object):
+    '''在模拟之前依次执行的可调度性检验序列，第一个得出结论的检验决定任务集的可调度性
+    Attributes:
+        platform:       处理器平台
+        tests:          检验函数序列，按计算开销从小到大排列
+        statistics:     每个检验得出结论的次数，"simulation" 为所有检验都无法判断、需要模拟的次数
+        mismatches:     校验模式下每个检验的结论与模拟结果不一致的次数
+    '''
+    def __init__(self, speeds, tests=DEFAULT_TESTS):
+        self.platform = Platform(speeds)
+        self.tests = tests
+        self.statistics = Counter()
+        self.mismatches = Counter()
+
+    def decide(self, tasks):
+        '''依次执行检验，返回 (结论, 得出结论的检验名称)；所有检验都无法判断时返回 (None, "simulation")'''
+        tasks = np.asarray(tasks, dtype=np.float64).reshape(-1, 3)
+        for test in self.tests:
+            verdict = test(tasks, self.platform)
+            if verdict is not None:
+                self.statistics[test.__name__] += 1
+                return verdict, test.__name__
+        self.statistics["simulation"] += 1
+        return None, "simulation"
+
+    def verify(self, verdict, test_name, feasible: bool, task_id_set=None):
+        '''校验检验的结论与模拟结果是否一致'''
+        if verdict is not None and verdict != feasible:
+            self.mismatches[test_name] += 1
+            logger.critical(f"{test_name} decided {verdict} but simulation returned {feasible}, task set: {task_id_set}")
@@ -1,23 +1,40 @@
 import heapq
 import math
+from fractions import Fraction
 from logger_config import logger
-from tqdm import tqdm
+from tracer import NULL_TRACER
+from execution_history import ExecutionHistory
+
+def integer_speeds(speeds) -> tuple:
+    '''精确时间模式的处理器速度：将速度按十进制表示（例如从 platform.csv 读入的 "1.5"）视为精确的分数，
+    乘以所有分母的最小公倍数 scale 后都为整数。返回 (整数速度, scale)
+    任务的执行工作量同样乘以 scale 后，作业的完成时刻 ceil(剩余工作量 / 速度) 与按分数精确计算的结果相同，
+    模拟中只有整数运算，不会因浮点误差多出剩余工作量极小的调度事件或推迟作业的完成时刻
+    '''
+    fractions = [Fraction(str(speed)) for speed in speeds]
+    scale = math.lcm(*(fraction.denominator for fraction in fractions))
+    return [int(fraction * scale) for fraction in fractions], scale
 
 class Task(object):
     '''周期任务
     可由(e, d, T)所刻画，其他属性例如arrival_timepoint、remaining_time使得周期任务在模拟时循环按周期到达
     Attributes:
         id:                 # 任务id
+        index:              # 任务在调度器任务集中的序号，绝对期限相同时序号小的任务优先
         arrival_timepoint:  # 到达时刻
         instance_id         # 任务实例id，也表示该任务到达次数
         remaining_time:     # 剩余执行工作量时间，也是在最慢处理器上测量得到
         abs_deadline        # 绝对期限
-        execution_time:     # e 在最慢的速度为1的处理器上测量的执行时间
+        execution_time:     # e 在最慢的速度为1的处理器上测量的执行时间，精确时间模式下为乘以 scale 后的工作量（见 integer_speeds）
         deadline:           # d 相对期限
         period:             # T 周期
     '''
+    __slots__ = ("id", "index", "arrival_timepoint", "instance_id", "remaining_time", "abs_deadline",
+                 "execution_time", "deadline", "period")
+
     def __init__(self, id, arrival_timepoint, execution_time, deadline, period):
         self.id = id                                # 任务id
+        self.index = 0                              # 任务在调度器任务集中的序号，由Scheduler.add_task()设置
         self.arrival_timepoint = arrival_timepoint  # 到达时刻
         self.instance_id = 0                        # 任务实例id，也表示该任务到达次数
         self.remaining_time = execution_time        # 剩余执行工作量时间，也是在最慢处理器上测量得到
@@ -26,8 +43,14 @@ class Task(object):
         self.deadline = deadline                    # 相对期限
         self.period = period                        # 周期
 
+    def reset(self, id, arrival_timepoint, execution_time, deadline, period):
+        '''原地重新设置为另一个任务的初始状态，用于复用 Task 对象（见 simulation_context）'''
+        self.__init__(id, arrival_timepoint, execution_time, deadline, period)
+
     def __lt__(self, other):
-        '''任务优先级'''
+        '''任务优先级，绝对期限相同时按加入调度器的先后顺序打破平局，使不同调度引擎的结果一致'''
+        if self.abs_deadline == other.abs_deadline:
+            return self.index < other.index
         return self.abs_deadline < other.abs_deadline
 
     def renew(self):
@@ -43,22 +66,35 @@ class Processor(object):
     Attributes:
         id:             处理器id
         speed:          性能
+        integral_speed: 速度是否为 int。此时用整数的向上取整除法计算结束时刻，不经过浮点除法
         end_timepoint:  处理器所分配任务的执行结束时刻
                         可以作为对Processors排序的依据，选出最早完成任务的处理器，将当前时间跳到next schedule event timepoint
         current_task:   处理器上当前所分配任务
-        history:        在此处理器上的运行历史
-                        元素为(task.id, task.instance_id, current_timepoint, running_time)的四元组
+        history:        在此处理器上的运行历史，按列保存的 ExecutionHistory（见 execution_history）
+                        每条记录为(task.id, task.instance_id, current_timepoint, running_time)的四元组
+        history_limit:  运行历史的记录数量上限，为None时不设上限
+        history_mode:   达到上限后的处理方式，"cap" 不再记录，"ring" 只保留最近的记录
     '''
-    def __init__(self, id, speed:float, enable_history:bool=True):
+    __slots__ = ("id", "speed", "integral_speed", "end_timepoint", "current_task", "history", "tracer")
+
+    def __init__(self, id, speed:float, enable_history:bool=True, history_limit: int = None, history_mode: str = "cap"):
         self.id = id                            # 处理器id
         self.speed:float = speed                      # 性能
+        self.integral_speed = isinstance(speed, int)
         self.end_timepoint = None               # 处理器所分配任务的执行结束时刻
         self.current_task = None                # 处理器上当前所分配任务
-        self.history = []                       # 在此处理器上的运行历史
+        self.history = ExecutionHistory(history_limit, history_mode) # 在此处理器上的运行历史
+        self.tracer = NULL_TRACER               # 追踪器，由Scheduler设置
 
     def __lt__(self, other):
         return self.end_timepoint < other.end_timepoint
 
+    def reset(self):
+        '''清除上一次模拟留下的任务分配和运行历史'''
+        self.current_task = None
+        self.end_timepoint = None
+        self.history.clear()
+
     def assign_task(self, task, current_timepoint):
         self.current_task = task
         # 分配任务时，计算新分配的任务在此处理器上什么时候能够完成
@@ -67,7 +103,10 @@ class Processor(object):
         # ==>   end_timepoint == current_timepoint
         # ==>   next_schedule_event_timepoint = current_timepoint
         # ==>   running_time == 0，出现死循环
-        self.end_timepoint = math.ceil(self.current_task.remaining_time / self.speed) + current_timepoint
+        if self.integral_speed:
+            self.end_timepoint = current_timepoint - (-self.current_task.remaining_time // self.speed)
+        else:
+            self.end_timepoint = math.ceil(self.current_task.remaining_time / self.speed) + current_timepoint
 
     def detach_task(self):
         '''去除处理器上所执行的任务'''
@@ -89,22 +128,69 @@ class Processor(object):
 
             if enable_history:
                 # 记录执行历史
-                self.history.append((self.current_task.id, self.current_task.instance_id, current_timepoint, running_time))
+                self.history.append(self.current_task.id, self.current_task.instance_id, current_timepoint, running_time)
 
             # 任务执行结束
             if self.current_task.remaining_time <= 0:
-                # 打印任务结束时刻
-                logger.debug(f"task {self.current_task.id} is completed at timepoint {current_timepoint + running_time}")
+                if self.tracer.enabled:
+                    self.tracer.on_completion(self, self.current_task, current_timepoint + running_time)
 
                 self.current_task.renew()
                 self.current_task = None
                 self.end_timepoint = None
 
+class DeadlineMiss(object):
+    '''错过期限的见证，由 Scheduler 在检查出错过期限时记录
+    Attributes:
+        timepoint:  检查出错过期限的调度事件时刻
+        task:       错过期限的任务id
+        deadline:   错过期限的作业的绝对期限
+        active:     检查出时已到达且未执行完毕的任务id
+        dispatched: 检查出之前被分配到过处理器上的任务id。
+                    不在其中、也不是错过期限的任务，从未影响过其他任务的调度，从任务集中移除后同一作业仍会错过期限
+    '''
+    __slots__ = ("timepoint", "task", "deadline", "active", "dispatched")
+
+    def __init__(self, timepoint, task, deadline, active, dispatched):
+        self.timepoint = timepoint
+        self.task = task
+        self.deadline = deadline
+        self.active = active
+        self.dispatched = dispatched
+
 class Scheduler(object):
-    def __init__(self, processors, current_timepoint = 0):
+    '''EDF调度模拟器
+    engine:
+        "rescan":       每个调度事件重新扫描全部任务，重建优先队列
+        "event_queue":  维护持久的到达堆、就绪堆和最早期限堆，在任务到达、完成和更新时增量维护，
+                        每个调度事件的开销与任务数量无关（除堆操作的对数开销）。两种引擎的可调度性结果完全一致
+    tracer:
+        追踪器（见 tracer），在作业到达、分配、完成和错过期限时回调，默认为没有开销的空追踪器
+    快照（见 run() 的 snapshot）：
+        每个任务第一次被分配到处理器的调度事件开始时，记录所有任务的状态（见 task_states）。
+        移除这个任务后，此前其他任务的调度过程不变，可以从这一快照（去掉被移除的任务）用 restore() 继续模拟，不必从头模拟
+    '''
+    ENGINES = ("rescan", "event_queue")
+    HORIZONS = ("fixed", "adaptive")
+    # 模拟结束的原因
+    #   deadline_miss:  有作业错过期限，不可调度
+    #   overload:       总利用率超过平台总速度，不需要模拟即可判定不可调度（仅 "adaptive"）
+    #   hyperperiod:    模拟完一个超周期，"adaptive" 下为一个超周期后系统状态与开始时相同，可调度
+    #   repeated_state: 经过多个超周期后系统状态重复，可调度（仅 "adaptive"）
+    #   truncated:      模拟到截断时刻仍未得出结论，按可调度处理
+    TERMINATIONS = ("deadline_miss", "overload", "hyperperiod", "repeated_state", "truncated")
+
+    def __init__(self, processors, current_timepoint = 0, engine: str = "rescan", tracer=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"unknown scheduler engine: {engine}")
+
         # 将处理器按照speed进行降序排序
         processors.sort(key=lambda processor : processor.speed, reverse=True)
 
+        self.engine = engine
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        for processor in processors:
+            processor.tracer = self.tracer
         self.tasks = []
         self.processors = processors                # 处理器list
         self.current_timepoint = current_timepoint
@@ -112,12 +198,79 @@ class Scheduler(object):
                                                     # 因为在分配任务时会从优先队列中取出优先级最高的任务，所以不能代表活跃任务
                                                     # task_deadline_heap中的任务 + 处理器上运行的任务 = 活跃任务
         self.lcm_period = 1                         # 任务集tasks的周期的最小公倍数
+        self.termination = None                     # 上一次模拟结束的原因，见 TERMINATIONS
+        self.events = 0                             # 已模拟的调度事件数量
+        self.deadline_miss: DeadlineMiss = None     # 上一次模拟错过期限的见证
+        self.snapshots = []                         # 启用快照时记录的 (时刻, task_states())，按时刻升序
+        self.first_dispatch = {}                    # 任务id -> 第一次被分配到处理器的时刻
+
+    def reset(self, current_timepoint=0):
+        '''清空任务集和模拟状态，并重置所有处理器，使调度器可以模拟另一个任务集（见 simulation_context）'''
+        self.tasks.clear()
+        self.task_deadline_heap.clear()
+        self.current_timepoint = current_timepoint
+        self.lcm_period = 1
+        self.termination = None
+        self.events = 0
+        self.deadline_miss = None
+        self.snapshots = []
+        self.first_dispatch = {}
+        for processor in self.processors:
+            processor.reset()
 
     def add_task(self, task):
         '''添加任务，同时计算任务集中任务的期限的最小公倍数'''
+        task.index = len(self.tasks)
         self.tasks.append(task)
         self.lcm_period = math.lcm(self.lcm_period, task.period)
 
+    def task_states(self) -> tuple:
+        '''所有任务的状态 (到达时刻, 任务实例id, 剩余执行工作量, 绝对期限)，按任务序号排列'''
+        return tuple((task.arrival_timepoint, task.instance_id, task.remaining_time, task.abs_deadline) for task in self.tasks)
+
+    def restore(self, timepoint, task_states, first_dispatch: dict = None):
+        '''从快照继续模拟：设置当前时刻和所有任务的状态，first_dispatch 为此前已被分配到过处理器的任务的 first_dispatch
+        处理器的分配在每个调度事件开始时重新计算，不需要恢复
+        '''
+        self.current_timepoint = timepoint
+        for task, (arrival_timepoint, instance_id, remaining_time, abs_deadline) in zip(self.tasks, task_states):
+            task.arrival_timepoint = arrival_timepoint
+            task.instance_id = instance_id
+            task.remaining_time = remaining_time
+            task.abs_deadline = abs_deadline
+        self.snapshots = []
+        self.first_dispatch = dict(first_dispatch or {})
+
+    def record_first_dispatch(self):
+        '''完成任务分配后，若有任务第一次被分配到处理器，记录调度事件开始时的快照
+        分配处理器不改变任务的状态，此时的 task_states() 即为调度事件开始时的状态
+        '''
+        state = None
+        for processor in self.processors:
+            task = processor.current_task
+            if task is not None and task.id not in self.first_dispatch:
+                self.first_dispatch[task.id] = self.current_timepoint
+                if state is None:
+                    state = self.task_states()
+                    self.snapshots.append((self.current_timepoint, state))
+
+    def miss_deadline(self, task) -> bool:
+        '''记录错过期限的见证和结束原因，返回False（任务集不可调度）'''
+        if self.tracer.enabled:
+            self.tracer.on_deadline_miss(task, self.current_timepoint)
+        self.termination = "deadline_miss"
+        self.deadline_miss = DeadlineMiss(self.current_timepoint, task.id, task.abs_deadline,
+                                          tuple(active.id for active in self.tasks
+                                                if active.arrival_timepoint <= self.current_timepoint and active.remaining_time > 0),
+                                          frozenset(self.first_dispatch))
+        return False
+
+    def simulation_limit(self, truncated_lcm=-1, horizon: str = "fixed"):
+        '''模拟时长的上限，见 run()'''
+        if horizon == "adaptive":
+            return truncated_lcm if truncated_lcm >= 0 else math.inf
+        return self.lcm_period if truncated_lcm < 0 or truncated_lcm > self.lcm_period else truncated_lcm
+
     def priority_tick(self):
         '''更新任务优先级'''
         self.task_deadline_heap.clear()
@@ -125,14 +278,9 @@ class Scheduler(object):
             if task.arrival_timepoint <= self.current_timepoint and task.remaining_time > 0:
                 heapq.heappush(self.task_deadline_heap, task)
 
-                # 打印任务到达时刻
-                if task.arrival_timepoint == self.current_timepoint:
-                    logger.debug(f"task {task.id} arrives at time {task.arrival_timepoint}")
-        
-        # 打印self.task_deadline_heap中的任务id
-        # 使用[task.abs_deadline for task in self.task_deadline_heap]可打印出绝对deadline
-        tasks_priority = [task.id for task in self.task_deadline_heap]
-        logger.debug(f"tasks priority:{tasks_priority}")
+                # 任务到达
+                if self.tracer.enabled and task.arrival_timepoint == self.current_timepoint:
+                    self.tracer.on_arrival(task, task.arrival_timepoint)
 
     def allocation_tick(self):
         '''更新任务分配到处理器上的情况'''
@@ -146,78 +294,218 @@ class Scheduler(object):
             if not processor.current_task and self.task_deadline_heap:
                 task = heapq.heappop(self.task_deadline_heap)
                 processor.assign_task(task, self.current_timepoint)
-        
-        # 打印处理器分配情况
-        processor_allocation = [(processor.id, processor.current_task.id) 
-                                for processor in self.processors if processor.current_task != None]
-        logger.debug(f"Processor Allocation:{processor_allocation}")
+                if self.tracer.enabled:
+                    self.tracer.on_dispatch(processor, task, self.current_timepoint)
+
+    def is_overloaded(self) -> bool:
+        '''任务集的总利用率是否超过平台的总速度
+        此时长期来看到达的工作量超过平台的处理能力，积压的工作量无限增长，必然有作业错过期限
+        '''
+        utilization = sum(Fraction(task.execution_time) / Fraction(task.period) for task in self.tasks)
+        return utilization > sum(Fraction(processor.speed) for processor in self.processors)
+
+    def system_state(self):
+        '''当前时刻的系统状态：每个任务的剩余执行工作量，以及到达时刻、绝对期限相对当前时刻的偏移
+        EDF调度是确定的，两个时刻的系统状态相同时，此后的调度过程也完全相同
+        '''
+        return tuple((task.remaining_time, task.arrival_timepoint - self.current_timepoint,
+                      task.abs_deadline - self.current_timepoint) for task in self.tasks)
+
+    def reached_horizon(self, limit, horizon: str) -> bool:
+        '''在调度事件开始时（已检查期限之后）判断能否结束模拟，能结束时记录结束原因 self.termination
+        "adaptive" 模式下在开始时刻之后每隔一个超周期的第一个调度事件记录系统状态，
+        出现与之前记录相同的状态时，此后的调度过程是周期重复的，不会再有作业错过期限
+        '''
+        if horizon == "adaptive" and self.current_timepoint >= self.next_checkpoint:
+            state = self.system_state()
+            checkpoint = self.checkpoints.get(state)
+            if checkpoint is not None:
+                self.termination = "hyperperiod" if self.current_timepoint - checkpoint == self.lcm_period else "repeated_state"
+                return True
+            self.checkpoints[state] = self.current_timepoint
+            self.next_checkpoint += ((self.current_timepoint - self.next_checkpoint) // self.lcm_period + 1) * self.lcm_period
+
+        if self.current_timepoint > limit:
+            self.termination = "hyperperiod" if horizon == "fixed" and limit == self.lcm_period else "truncated"
+            return True
+        return False
 
-    def run(self, truncated_lcm=-1, enable_history:bool=True):
+    def run(self, truncated_lcm=-1, enable_history:bool=True, horizon: str = "fixed", snapshot: bool = False):
         '''模拟对任务集进行调度
         返回一个布尔值，可实时调度为True，不可实时调度为False
+        使用 self.engine 所选择的引擎进行模拟
         enable_history:
             启用处理器执行历史记录。如果需要gantt图可视化调度过程，需要为True
+        horizon:
+            "fixed":    模拟到周期的最小公倍数（超周期）为止，truncated_lcm 小于超周期时截断
+            "adaptive": 一旦结论确定即停止模拟：总利用率超过平台总速度时直接判定不可调度；
+                        每隔一个超周期比较系统状态，状态重复时判定可调度。对同时到达的约束期限任务集，
+                        第一个超周期后的状态必然与开始时相同。truncated_lcm 仅作为模拟时长的上限（小于0时不设上限）
+        snapshot:
+            记录每个任务第一次被分配到处理器时的快照，见 snapshots
+        模拟结束的原因记录在 self.termination 中，见 TERMINATIONS；错过期限时的见证记录在 self.deadline_miss 中
+        '''
+        if horizon not in self.HORIZONS:
+            raise ValueError(f"unknown simulation horizon: {horizon}")
+
+        self.termination = None
+        self.deadline_miss = None
+        limit = self.simulation_limit(truncated_lcm, horizon)
+        self.checkpoints = {}       # 已记录的系统状态 -> 记录时刻
+        self.next_checkpoint = self.current_timepoint
+
+        if self.tracer.enabled:
+            self.tracer.on_run_start(self, limit)
+
+        if horizon == "adaptive" and self.is_overloaded():
+            self.termination = "overload"
+            feasible = False # 任务集不可调度
+        elif self.engine == "event_queue":
+            feasible = self.run_event_queue(limit, enable_history, horizon, snapshot)
+        else:
+            feasible = self.run_rescan(limit, enable_history, horizon, snapshot)
+
+        if self.tracer.enabled:
+            self.tracer.on_run_end(self, feasible)
+        return feasible
+
+    def run_rescan(self, limit, enable_history:bool=True, horizon: str = "fixed", snapshot: bool = False):
+        '''每个调度事件重新扫描全部任务的 "rescan" 引擎'''
+        tracer = self.tracer
+        while True:
+            # 检查是否存在任务已超出期限
+            # 需要先于是否已模拟到截断时刻进行判断。当 deadline 到 lcm_period 之间没有调度事件存在时，
+            # 即 next_sche_event 在 lcm_period 之后，如果先判断已模拟到截断时刻，会直接认为任务集可调度。如下图所示：
+            #            ┌────────────────────────────────────────────────────┬────────────────┐
+            #            │                                                    │                │
+            #            ├──────────────────┬─────────────────────────────────┤                │
+            #            │                  │                                 │                ▼
+            # first_sche_event(start)   deadline                         lcm_period      next_sche_event
+            #            │                                                                     │
+            #            │◄──────────────────────running_time(step)───────────────────────────►│
+            #            │                                                                     │
+            for task in self.tasks:
+                if self.current_timepoint >= task.abs_deadline:
+                    return self.miss_deadline(task) # 任务集不可调度
+
+            if self.reached_horizon(limit, horizon):
+                return True # 任务集可调度
+            self.events += 1
+
+            # 更新所有活跃任务（已到达并且未执行完毕的任务）的优先级
+            self.priority_tick()
+
+            # 分配任务到处理器，processors的排序即为任务分配的顺序
+            self.allocation_tick()
+            if snapshot:
+                self.record_first_dispatch()
+            if tracer.enabled:
+                tracer.on_event(self)
+
+            # 找出触发下一调度事件的时间点，并计算出距离现在还有多少时间
+            # Schedule events 包括两种情况，当 (a) 正在运行的作业完成时和 (b) 新作业到达时
+            running_task_end = [processor.end_timepoint 
+                                for processor in self.processors if processor.end_timepoint]
+            new_arrival = [task.arrival_timepoint for task in self.tasks 
+                        if task.arrival_timepoint > self.current_timepoint]
+            next_schedule_event_timepoint = min(running_task_end + new_arrival)
+            running_time = next_schedule_event_timepoint - self.current_timepoint # simulation step
+
+            # 当 running_time <= 0 时，给出警告
+            if running_time <= 0:
+                logger.critical(f"running time(simulation step) <= 0 will cause an infinite loop: running_time={running_time}")
+
+            # 绝对期限早于下一调度事件的作业必然错过期限：若在下一调度事件时完成，完成后会更新为下一个作业，
+            # 在下一调度事件开始时已无法检查出它错过了期限
+            earliest_deadline_task = min(self.tasks, key=lambda task: task.abs_deadline)
+            if next_schedule_event_timepoint > earliest_deadline_task.abs_deadline:
+                return self.miss_deadline(earliest_deadline_task) # 任务集不可调度
+
+            # 执行所有处理器上的任务
+            for processor in self.processors:
+                processor.execute_task(self.current_timepoint, running_time, enable_history)
+
+            # Update time
+            self.current_timepoint += running_time
+
+    def run_event_queue(self, limit, enable_history:bool=True, horizon: str = "fixed", snapshot: bool = False):
+        '''以增量维护的事件队列模拟对任务集进行调度，调度语义与run()的"rescan"引擎完全相同
+        arrival_heap:   尚未到达（包括恰好在开始时刻到达）的任务，按 (到达时刻, 序号) 排序
+        ready_heap:     已到达且未执行完毕的任务，按 (绝对期限, 序号) 排序，即EDF优先级
+        deadline_heap:  所有任务当前作业的绝对期限，惰性删除：任务更新后旧的条目作废
         '''
-        if truncated_lcm < 0 or truncated_lcm > self.lcm_period:
-            truncated_lcm = self.lcm_period
-
-        with tqdm(total=truncated_lcm, desc="Simulation Processing:", leave=False) as pbar:
-            while self.current_timepoint <= truncated_lcm:
-                # print(f"Simulation progress: [{self.current_timepoint} / {truncated_lcm} = {self.current_timepoint / self.truncated_lcm * 100 :.2f}%]:", end='', flush=True)
-                # print("\r", end='', flush=True)
-
-                # 检查是否存在任务已超出期限
-                for task in self.tasks:
-                    if self.current_timepoint >= task.abs_deadline:
-                        logger.debug(f"task {task.id} exceeded the deadline")
-                        return False # 任务集不可调度
-
-                # 更新所有活跃任务（已到达并且未执行完毕的任务）的优先级
-                self.priority_tick()
-
-                # 分配任务到处理器，processors的排序即为任务分配的顺序
-                self.allocation_tick()
-
-                # 找出触发下一调度事件的时间点，并计算出距离现在还有多少时间
-                # Schedule events 包括两种情况，当 (a) 正在运行的作业完成时和 (b) 新作业到达时
-                running_task_end = [processor.end_timepoint 
-                                    for processor in self.processors if processor.end_timepoint]
-                new_arrival = [task.arrival_timepoint for task in self.tasks 
-                            if task.arrival_timepoint > self.current_timepoint]
-                next_schedule_event_timepoint = min(running_task_end + new_arrival)
-                running_time = next_schedule_event_timepoint - self.current_timepoint # simulation step
-
-                # 当 running_time <= 0 时，给出警告
-                if running_time <= 0:
-                    logger.critical(f"running time(simulation step) <= 0 will cause an infinite loop: running_time={running_time}")
-
-                # 执行所有处理器上的任务
-                for processor in self.processors:
-                    processor.execute_task(self.current_timepoint, running_time, enable_history)
-
-                # Update time
-                self.current_timepoint += running_time
-                pbar.update(running_time)
-            else:
-                # 当存在归一化利用率大于1的任务时，显然不可调度，判断任务已超出期限的时刻在 next_sche_event。
-                # 但是当 deadline 到 lcm_period 之间没有调度事件存在时，即 next_sche_event 在 lcm_period 之后，
-                # 因为 self.current_timepoint <= self.lcm_period 为 False，循环不再执行。没有判断 next_sche_event
-                # 是否有超出期限的任务，导致循环结束直接认为任务集可调度。如下图所示：
-                #            ┌────────────────────────────────────────────────────┬────────────────┐
-                #            │                                                    │                │
-                #            ├──────────────────┬─────────────────────────────────┤                │
-                #            │                  │                                 │                ▼
-                # first_sche_event(start)   deadline                         lcm_period      next_sche_event
-                #            │                                                                     │
-                #            │◄──────────────────────running_time(step)───────────────────────────►│
-                #            │                                                                     │
-                #
-                # 因此需要在循环结束时再判断一次是否存在任务已超出期限
-
-                # 检查是否存在任务已超出期限
-                for task in self.tasks:
-                    if self.current_timepoint >= task.abs_deadline:
-                        logger.debug(f"task {task.id} exceeded the deadline")
-                        return False # 任务集不可调度
-
-                return True # 任务集可调度
\ No newline at end of file
+        arrival_heap = []
+        ready_heap = []
+        deadline_heap = []
+        for task in self.tasks:
+            deadline_heap.append((task.abs_deadline, task.index, task))
+            if task.arrival_timepoint >= self.current_timepoint: # 开始时刻到达的任务在第一个调度事件中移入就绪堆，与 rescan 相同地回调 on_arrival
+                arrival_heap.append((task.arrival_timepoint, task.index, task))
+            elif task.remaining_time > 0:
+                ready_heap.append((task.abs_deadline, task.index, task))
+        heapq.heapify(arrival_heap)
+        heapq.heapify(ready_heap)
+        heapq.heapify(deadline_heap)
+
+        tracer = self.tracer
+        while True:
+            # 检查是否存在任务已超出期限，先丢弃已作废的期限条目
+            while deadline_heap[0][0] != deadline_heap[0][2].abs_deadline:
+                heapq.heappop(deadline_heap)
+            if self.current_timepoint >= deadline_heap[0][0]:
+                return self.miss_deadline(deadline_heap[0][2]) # 任务集不可调度
+
+            if self.reached_horizon(limit, horizon):
+                return True # 任务集可调度
+            self.events += 1
+
+            # 将已到达的任务移入就绪堆
+            while arrival_heap and arrival_heap[0][0] <= self.current_timepoint:
+                _, _, task = heapq.heappop(arrival_heap)
+                if task.remaining_time > 0:
+                    heapq.heappush(ready_heap, (task.abs_deadline, task.index, task))
+                    if tracer.enabled:
+                        tracer.on_arrival(task, task.arrival_timepoint)
+
+            # 将最高优先级的任务分配到最快的处理器上，未分配到处理器的任务留在就绪堆中
+            running_tasks = []
+            next_schedule_event_timepoint = arrival_heap[0][0] if arrival_heap else None
+            for processor in self.processors:
+                processor.detach_task()
+                if ready_heap:
+                    task = heapq.heappop(ready_heap)[2]
+                    processor.assign_task(task, self.current_timepoint)
+                    running_tasks.append((task, task.instance_id))
+                    if next_schedule_event_timepoint is None or processor.end_timepoint < next_schedule_event_timepoint:
+                        next_schedule_event_timepoint = processor.end_timepoint
+                    if tracer.enabled:
+                        tracer.on_dispatch(processor, task, self.current_timepoint)
+            if snapshot:
+                self.record_first_dispatch()
+            if tracer.enabled:
+                tracer.on_event(self)
+
+            running_time = next_schedule_event_timepoint - self.current_timepoint # simulation step
+
+            # 当 running_time <= 0 时，给出警告
+            if running_time <= 0:
+                logger.critical(f"running time(simulation step) <= 0 will cause an infinite loop: running_time={running_time}")
+
+            # 绝对期限早于下一调度事件的作业必然错过期限，见 run()
+            if next_schedule_event_timepoint > deadline_heap[0][0]:
+                return self.miss_deadline(deadline_heap[0][2]) # 任务集不可调度
+
+            # 执行所有处理器上的任务
+            for processor in self.processors:
+                processor.execute_task(self.current_timepoint, running_time, enable_history)
+
+            # 执行完毕的任务已更新为下一个作业，放回到达堆并记录新的绝对期限；未执行完毕的任务放回就绪堆
+            for task, instance_id in running_tasks:
+                if task.instance_id != instance_id:
+                    heapq.heappush(arrival_heap, (task.arrival_timepoint, task.index, task))
+                    heapq.heappush(deadline_heap, (task.abs_deadline, task.index, task))
+                else:
+                    heapq.heappush(ready_heap, (task.abs_deadline, task.index, task))
+
+            # Update time
+            self.current_timepoint += running_time
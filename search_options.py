@@ -0,0 +1,71 @@
+from tracer import NULL_TRACER
+from profiler import NULL_PROFILER
+
+class SearchOptions(object):
+    '''超边搜索中模拟和判定可调度性的设置，DataGenerator 和并行搜索的工作进程使用同一份设置
+    Attributes:
+        engine:         模拟调度所使用的 Scheduler 引擎，见 Scheduler.ENGINES
+        verify_engine:  差分校验模式，每次模拟都同时用另一引擎再模拟一次，两者结果不一致时记录 critical 日志
+        prefilter:      模拟前的可调度性检验序列（见 schedulability_tests）
+                        "off" 不检验；"on" 由第一个得出结论的检验决定，不再模拟；"verify" 检验后仍然模拟，并校验两者结论是否一致
+        cache_path:     持久化可调度性缓存（见 feasibility_cache）的数据库路径，为None时不使用缓存。
+                        缓存不在 data_path 中，不会随 data 目录一起被清除，可在多次运行之间共享
+        cache_size:     缓存条目数量上限
+        horizon:        模拟的结束方式，见 Scheduler.run()。"fixed" 模拟一个超周期；"adaptive" 结论确定即停止模拟。
+                        两者都最多模拟到 DataGenerator.SIMULATION_LIMIT
+        tracer:         模拟调度使用的追踪器（见 tracer），为None时使用没有开销的空追踪器。
+                        并行搜索时每个工作进程使用追踪器的副本，CountingTracer 的计数在合并结果时累加到主进程的追踪器中
+        profiler:       搜索的性能分析器（见 profiler），记录各阶段的耗时、剪枝规则的生效次数和模拟开销，为None时使用空分析器。
+                        BatchScheduler 的批量模拟只记录 judge_feasibility_batch 阶段的耗时。
+                        并行搜索时与追踪器一样，工作进程的统计在合并结果时合并到主进程的分析器中
+        strategy:       超边搜索方式，见 STRATEGIES
+                        "top_down" 从随机任务集开始向下搜索不可调度任务集的子集，见 DataGenerator.search_hyperedge；
+                        "bottom_up" 从小的子集开始逐层向上枚举可调度的子集，见 DataGenerator.search_hyperedge_bottom_up
+        bottom_up_budget:
+                        自底向上枚举一个随机任务集的模拟次数上限，超出时改为自顶向下搜索，两种搜索方式的结果相同。
+                        为None时不限制；"auto" 为此前的随机任务集自顶向下搜索平均需要的模拟次数，见 DataGenerator.bottom_up_budget
+        multiset_memo:  参数相同的任务归为同一等价类，搜索结果（可调度、不可调度、最小不可调度组合）按等价类的多重集记录，
+                        推广到所有参数多重集相同的任务集，见 DataGenerator.multiset_key。
+                        这是另一种标注方式：绝对期限相同时的平局按加入调度器的顺序处理，会影响模拟结果，
+                        启用后任务按参数 (e, d, T) 而非任务id 的顺序加入调度器（见 DataGenerator.ordered_task_ids），
+                        使可调度性只由参数多重集决定，因此个别任务集的标注可能与不启用时不同
+        visited_memory_limit:
+                        设置后负采样保存在紧凑的 VisitedSetStore（见 visited_set）中，内存中最多保存这一数量的负采样，
+                        超出的部分溢出到 data_path / "visited" 中的有序文件，用于负采样多到内存放不下的大规模搜索。
+                        并行搜索的每个工作进程溢出到各自的目录
+        incremental:    增量模拟 DataGenerator.search_hyperedge 中不可调度任务集的 len-1 子集（见 DataGenerator.simulate_incremental）：
+                        被移除的任务从未影响过调度、且错过期限的作业仍在模拟时长内时，不模拟即判定不可调度；
+                        否则（"fixed" 模式下）从被移除的任务第一次被分配到处理器之前的快照继续模拟，不必从头模拟。
+                        结论与完整模拟完全相同，要求处理器速度为整数（否则分段执行的浮点误差可能改变结果），不满足时完整模拟
+        exact_time:     精确时间模式（见 SimulationContext、scheduler.integer_speeds），处理器速度按十进制表示的精确分数处理，
+                        速度和任务执行工作量放大为整数后模拟，没有浮点误差。速度为整数时结果与默认模式相同
+    '''
+    STRATEGIES = ("top_down", "bottom_up")
+
+    def __init__(self, engine: str = "rescan", verify_engine: bool = False, prefilter: str = "off",
+                 cache_path=None, cache_size: int = 1000000, horizon: str = "fixed",
+                 tracer=None, strategy: str = "top_down", bottom_up_budget=None,
+                 multiset_memo: bool = False, visited_memory_limit: int = None, profiler=None,
+                 incremental: bool = False, exact_time: bool = False):
+        self.engine = engine
+        self.verify_engine = verify_engine
+        self.prefilter = prefilter
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.horizon = horizon
+        self.tracer = tracer if tracer is not None else NULL_TRACER
+        self.strategy = strategy
+        self.bottom_up_budget = bottom_up_budget
+        self.multiset_memo = multiset_memo
+        self.visited_memory_limit = visited_memory_limit
+        self.profiler = profiler if profiler is not None else NULL_PROFILER
+        self.incremental = incremental
+        self.exact_time = exact_time
+
+    def verdict_settings(self) -> dict:
+        '''可能改变可调度性结论的设置，结论不同的设置下缓存的结果互不混用
+        prefilter 只有为 "on" 时才以检验的结论代替模拟结果，"off" 和 "verify" 的结论相同；
+        multiset_memo 改变任务加入调度器的顺序，是另一种标注方式；exact_time 消除浮点误差，速度不是整数时结论可能不同
+        '''
+        return dict(horizon=self.horizon, prefilter=self.prefilter == "on", multiset_memo=self.multiset_memo,
+                    exact_time=self.exact_time)
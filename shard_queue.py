@@ -0,0 +1,140 @@
+import json
+import os
+import shutil
+import socket
+import time
+from pathlib import Path
+
+class ShardQueue(object):
+    '''共享文件系统上的分片工作队列，多个进程（可以在不同节点上）协作搜索同一个 data 目录
+    只依赖在 NFS 等共享文件系统上也是原子操作的文件系统调用，不需要常驻的协调进程：
+        认领分片:   以 O_CREAT | O_EXCL 创建 claims/<分片>.claim，只有一个进程能够创建成功
+        完成分片:   分片结果先写入本进程的临时目录，完成后整体重命名为 <分片>/，目录存在即表示分片已完成
+        写入清单:   manifest.json 先写入临时文件再以硬链接发布，已存在时校验与本进程的搜索参数相同
+    Attributes:
+        shard_path:         分片目录
+        number_of_shards:   分片数量
+        claim_timeout:      认领后超过这一时间（秒）没有更新（见 heartbeat）且未完成的分片视为认领的进程已退出，
+                            可被其他进程重新认领。为None时不重新认领
+    '''
+    def __init__(self, shard_path: Path, number_of_shards: int, claim_timeout: float = None):
+        self.shard_path = Path(shard_path)
+        self.number_of_shards = number_of_shards
+        self.claim_timeout = claim_timeout
+        self.owner = f"{socket.gethostname()}.{os.getpid()}"
+        self.last_heartbeat = 0.0
+        os.makedirs(self.shard_path / "claims", exist_ok=True)
+
+    def publish_manifest(self, manifest: dict):
+        '''发布分片清单，已有清单与 manifest 不同时（参数不同的搜索使用同一目录）抛出 ValueError'''
+        file_name = self.shard_path / "manifest.json"
+        temporary_file_name = self.shard_path / f"manifest.json.{self.owner}"
+        with open(temporary_file_name, "w") as file:
+            json.dump(manifest, file, sort_keys=True)
+        try:
+            os.link(temporary_file_name, file_name)
+        except FileExistsError:
+            with open(file_name) as file:
+                published = json.load(file)
+            if published != json.loads(json.dumps(manifest, sort_keys=True)):
+                raise ValueError(f"{file_name} was published by a search with different parameters: {published}")
+        finally:
+            os.remove(temporary_file_name)
+
+    def result_path(self, shard: int) -> Path:
+        return self.shard_path / f"{shard:05d}"
+
+    def claim_file(self, shard: int) -> Path:
+        return self.shard_path / "claims" / f"{shard:05d}.claim"
+
+    def is_done(self, shard: int) -> bool:
+        return os.path.isdir(self.result_path(shard))
+
+    def done_shards(self) -> list:
+        return [shard for shard in range(self.number_of_shards) if self.is_done(shard)]
+
+    def claim(self, shard: int) -> bool:
+        '''尝试认领分片，成功时返回True'''
+        claim_file = self.claim_file(shard)
+        try:
+            descriptor = os.open(claim_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self.is_stale(shard) or not self.take_over(shard):
+                return False
+            return self.claim(shard)
+        with os.fdopen(descriptor, "w") as file:
+            file.write(f"{self.owner} {time.time()}\n")
+        self.last_heartbeat = time.monotonic()
+        return True
+
+    def take_over(self, shard: int) -> bool:
+        '''移走过期的认领，成功时返回True，之后仍需以 O_EXCL 重新认领
+        先把认领文件重命名为本进程独有的文件名，只有一个进程能重命名成功；
+        判断过期与重命名之间其他进程可能已经接管并写入了新的认领，因此重命名后再确认移走的认领确实过期，
+        否则用硬链接原样放回（放回时已有新的认领则放弃，由两个认领者各自完成，见 complete）
+        '''
+        claim_file = self.claim_file(shard)
+        stale_file = Path(f"{claim_file}.stale.{self.owner}")
+        try:
+            os.rename(claim_file, stale_file)
+        except FileNotFoundError:
+            return False
+        try:
+            if time.time() - os.path.getmtime(stale_file) > self.claim_timeout:
+                return True
+            try:
+                os.link(stale_file, claim_file)
+            except FileExistsError:
+                pass
+            return False
+        finally:
+            os.remove(stale_file)
+
+    def is_stale(self, shard: int) -> bool:
+        if self.claim_timeout is None or self.is_done(shard):
+            return False
+        try:
+            return time.time() - os.path.getmtime(self.claim_file(shard)) > self.claim_timeout
+        except FileNotFoundError:
+            return False
+
+    def heartbeat(self, shard: int):
+        '''更新认领文件的修改时间，表示分片仍在处理中。每 claim_timeout / 4 秒最多更新一次'''
+        if self.claim_timeout is None or time.monotonic() - self.last_heartbeat < self.claim_timeout / 4:
+            return
+        try:
+            os.utime(self.claim_file(shard))
+        except FileNotFoundError:
+            return  # 其他进程正在确认认领是否过期（见 take_over），下次再更新
+        self.last_heartbeat = time.monotonic()
+
+    def claims(self):
+        '''依次认领尚未完成、未被认领的分片，返回认领到的分片序号
+        搜索一个分片期间其他进程的认领可能过期，因此重复扫描，直到一次扫描没有认领到任何分片，
+        即每个分片都已完成或者被仍在更新的认领占用
+        '''
+        claimed = True
+        while claimed:
+            claimed = False
+            for shard in range(self.number_of_shards):
+                if not self.is_done(shard) and self.claim(shard):
+                    claimed = True
+                    yield shard
+
+    def temporary_path(self, shard: int) -> Path:
+        '''本进程写入分片结果的临时目录'''
+        path = self.shard_path / f"{shard:05d}.tmp.{self.owner}"
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        return path
+
+    def complete(self, shard: int, temporary_path: Path) -> bool:
+        '''将临时目录发布为分片结果。分片被重新认领后两个进程都完成时，后完成的结果被丢弃（两者内容相同）'''
+        try:
+            os.rename(temporary_path, self.result_path(shard))
+            return True
+        except OSError:
+            if not self.is_done(shard):
+                raise
+            shutil.rmtree(temporary_path, ignore_errors=True)
+            return False
@@ -0,0 +1,54 @@
+import scheduler as sc
+
+class SimulationContext(object):
+    '''绑定一个处理器平台、可重复使用的模拟环境
+    处理器、调度器和 Task 对象只在创建时（Task 在任务集变大时）分配一次，之后每次模拟前用 reset() 原地载入新的任务集，
+    避免搜索中每次判断可调度性都重新创建 Scheduler、对处理器排序和创建 Task 对象。
+    处理器是环境私有的副本，不与 DataGenerator.processors 共享，上一次模拟留下的状态不会影响其他模拟
+    Attributes:
+        processors:     按 speed 降序排序的处理器
+        scheduler:      复用的调度器
+        task_pool:      复用的 Task 对象，前 len(scheduler.tasks) 个为当前任务集
+        integral_speeds:
+                        处理器速度是否都为整数。此时作业的执行在调度事件处分段与否结果完全相同，可以从快照继续模拟
+        speed_scale:    精确时间模式下处理器速度和任务执行工作量放大的倍数（见 sc.integer_speeds），否则为1
+    exact:
+        精确时间模式，处理器速度和任务执行工作量都放大为整数，模拟中只有整数运算。
+        速度为整数时结果与默认模式相同；速度有小数时避免浮点误差改变作业的完成时刻。
+        任务的剩余执行工作量（例如快照和追踪器中的）为放大后的值
+    '''
+    def __init__(self, speeds, engine: str = "rescan", tracer=None, exact: bool = False):
+        self.speed_scale = 1
+        if exact:
+            speeds, self.speed_scale = sc.integer_speeds(speeds)
+        self.processors = [sc.Processor(f"P{i}", speed=speed) for i, speed in enumerate(speeds)]
+        self.integral_speeds = all(float(speed).is_integer() for speed in speeds)
+        self.scheduler = sc.Scheduler(self.processors, engine=engine, tracer=tracer)
+        self.task_pool = []
+
+    def reset(self, task_rows, task_ids=None):
+        '''载入新的任务集：task_rows 为每个任务的 (e, d, T)，task_ids 为对应的任务id，默认为行号
+        任务按 task_rows 的顺序加入调度器，决定绝对期限相同时的优先顺序
+        '''
+        self.scheduler.reset()
+        task_rows = task_rows.tolist() if hasattr(task_rows, "tolist") else task_rows
+        for i, (e, d, T) in enumerate(task_rows):
+            if i == len(self.task_pool):
+                self.task_pool.append(sc.Task(0, 0, 0, 0, 1))
+            task = self.task_pool[i]
+            task.reset(i if task_ids is None else task_ids[i], arrival_timepoint=0,
+                       execution_time=int(e) * self.speed_scale, deadline=int(d), period=int(T))
+            self.scheduler.add_task(task)
+        return self.scheduler
+
+    def run(self, task_rows, task_ids=None, truncated_lcm=-1, enable_history: bool = False, horizon: str = "fixed",
+            snapshot: bool = False, start: tuple = None):
+        '''载入任务集并模拟，返回 (是否可调度, 模拟结束的原因)
+        start 为 Scheduler.restore() 的参数 (时刻, 各任务的状态, 已分配过处理器的任务第一次被分配的时刻)，设置后从这一状态继续模拟
+        '''
+        scheduler = self.reset(task_rows, task_ids)
+        if start is not None:
+            scheduler.restore(*start)
+        feasible = scheduler.run(truncated_lcm=truncated_lcm, enable_history=enable_history, horizon=horizon,
+                                 snapshot=snapshot)
+        return feasible, scheduler.termination
@@ -0,0 +1,103 @@
+class TrieNode(object):
+    '''集合字典树的节点
+    Attributes:
+        children:   子节点，键为比当前节点更大的任务id
+        terminal:   从根节点到此节点的路径是否为一个已存储的任务集
+        mask:       以此节点为根的子树中出现过的所有任务id的位掩码，用于查询超集时剪枝
+    '''
+    __slots__ = ("children", "terminal", "mask")
+
+    def __init__(self):
+        self.children = {}
+        self.terminal = False
+        self.mask = 0
+
+class TaskSetIndex(object):
+    '''任务集的子集/超集索引
+    每个任务集按任务id升序插入集合字典树（set-trie），同时以整数位掩码（第 i 位表示任务 i）保存用于精确查找。
+    查询“是否存在已存储任务集为 X 的超集/子集”时只沿可能匹配的分支搜索，不需要逐个扫描所有任务集。
+    用法与 set 相同：add()、in、len()、迭代（返回 frozenset）
+    '''
+    def __init__(self, task_id_sets=()):
+        self.root = TrieNode()
+        self.masks = set()  # 所有已存储任务集的位掩码
+        for task_id_set in task_id_sets:
+            self.add(task_id_set)
+
+    @staticmethod
+    def to_mask(task_id_set) -> int:
+        '''任务集转换为位掩码'''
+        mask = 0
+        for task_id in task_id_set:
+            mask |= 1 << task_id
+        return mask
+
+    @staticmethod
+    def from_mask(mask: int) -> frozenset:
+        '''位掩码转换为任务集'''
+        task_ids = []
+        while mask:
+            lowest = mask & -mask
+            task_ids.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return frozenset(task_ids)
+
+    def __contains__(self, task_id_set) -> bool:
+        return self.to_mask(task_id_set) in self.masks
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def __iter__(self):
+        for mask in self.masks:
+            yield self.from_mask(mask)
+
+    def add(self, task_id_set):
+        mask = self.to_mask(task_id_set)
+        if mask in self.masks:
+            return
+        self.masks.add(mask)
+
+        node = self.root
+        node.mask |= mask
+        for task_id in sorted(task_id_set):
+            mask ^= 1 << task_id # 路径上此节点之后的任务id
+            node = node.children.setdefault(task_id, TrieNode())
+            node.mask |= mask
+        node.terminal = True
+
+    def has_subset(self, task_id_set) -> bool:
+        '''是否存在已存储的任务集是 task_id_set 的子集（包括相等）'''
+        mask = self.to_mask(task_id_set)
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.terminal:
+                return True
+            # 只沿 task_id_set 中的任务id向下搜索，从子节点数量与任务集大小中较少的一侧遍历
+            if len(node.children) <= len(task_id_set):
+                stack.extend(child for task_id, child in node.children.items() if mask >> task_id & 1)
+            else:
+                stack.extend(node.children[task_id] for task_id in task_id_set if task_id in node.children)
+        return False
+
+    def has_superset(self, task_id_set) -> bool:
+        '''是否存在已存储的任务集是 task_id_set 的超集（包括相等）'''
+        if not self.masks:
+            return False
+        task_ids = sorted(task_id_set)
+        # 栈中元素为 (节点, 尚需匹配的第一个任务id在 task_ids 中的下标, 尚需匹配的任务id的位掩码)
+        stack = [(self.root, 0, self.to_mask(task_ids))]
+        while stack:
+            node, i, needed = stack.pop()
+            if i == len(task_ids):
+                return True # 子树非空，其中必然存在已存储的任务集
+            if needed & ~node.mask:
+                continue # 子树中不包含所有尚需匹配的任务id
+            next_task_id = task_ids[i]
+            for task_id, child in node.children.items():
+                if task_id < next_task_id:
+                    stack.append((child, i, needed))
+                elif task_id == next_task_id:
+                    stack.append((child, i + 1, needed ^ (1 << task_id)))
+        return False
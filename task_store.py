@@ -0,0 +1,153 @@
+import numpy as np
+from pathlib import Path
+
+# 任务池的生成和磁盘存储
+# 任务池为 number_of_tasks × 4 的 (e, d, T, u) 数组，u 为相对最快处理器的归一化利用率。
+# 大规模任务池分块生成，每块直接写入 .npy 文件的内存映射（np.memmap），任何时候内存中只有一块；
+# 读取时同样以内存映射打开，按 task_id 索引只读取对应的行
+
+UTILIZATION_GENERATORS = ("uniform", "uunifast", "randfixedsum")
+
+def uunifast(number_of_groups: int, group_size: int, total_utilization: float) -> np.ndarray:
+    '''UUniFast-Discard：生成 number_of_groups 组、每组 group_size 个总和为 total_utilization 的利用率
+    含有大于1的利用率的组被丢弃并重新生成，返回 number_of_groups × group_size 的数组
+    '''
+    if not 0 < total_utilization <= group_size:
+        raise ValueError(f"total utilization {total_utilization} is not in (0, {group_size}]")
+    if total_utilization == group_size:
+        return np.ones((number_of_groups, group_size))  # 唯一的解，丢弃重采样永远无法得到
+
+    exponents = 1 / np.arange(group_size - 1, 0, -1)
+    utilizations = np.empty((number_of_groups, group_size))
+    pending = np.arange(number_of_groups)
+    while len(pending):
+        remaining = np.empty((len(pending), group_size + 1))
+        remaining[:, 0] = total_utilization
+        remaining[:, 1:group_size] = total_utilization * np.cumprod(np.random.rand(len(pending), group_size - 1) ** exponents,
+                                                                    axis=1)
+        remaining[:, group_size] = 0
+        utilizations[pending] = remaining[:, :-1] - remaining[:, 1:]
+        pending = pending[np.any(utilizations[pending] > 1, axis=1)]
+    return utilizations
+
+def randfixedsum(number_of_groups: int, group_size: int, total_utilization: float) -> np.ndarray:
+    '''RandFixedSum（Stafford）：在 [0, 1]^group_size 中总和为 total_utilization 的单纯形上均匀采样，不需要丢弃重采样
+    返回 number_of_groups × group_size 的数组
+    '''
+    if not 0 < total_utilization <= group_size:
+        raise ValueError(f"total utilization {total_utilization} is not in (0, {group_size}]")
+    n = group_size
+    if n == 1:
+        return np.full((number_of_groups, 1), float(total_utilization))
+
+    # 构造各子单纯形的体积比例 w 和转移概率 t
+    k = min(int(np.floor(total_utilization)), n - 1)
+    s1 = total_utilization - np.arange(k, k - n, -1)
+    s2 = np.arange(k + n, k, -1) - total_utilization
+    tiny = np.finfo(float).tiny
+    w = np.zeros((n, n + 1))
+    w[0, 1] = np.finfo(float).max
+    t = np.zeros((n - 1, n))
+    for i in range(2, n + 1):
+        tmp1 = w[i - 2, 1:i + 1] * s1[:i] / i
+        tmp2 = w[i - 2, :i] * s2[n - i:n] / i
+        w[i - 1, 1:i + 1] = tmp1 + tmp2
+        tmp3 = w[i - 1, 1:i + 1] + tiny
+        tmp4 = s2[n - i:n] > s1[:i]
+        t[i - 2, :i] = (tmp2 / tmp3) * tmp4 + (1 - tmp1 / tmp3) * np.logical_not(tmp4)
+
+    # 逐维确定每组的坐标
+    x = np.zeros((n, number_of_groups))
+    rt = np.random.rand(n - 1, number_of_groups)   # 选择子单纯形
+    rs = np.random.rand(n - 1, number_of_groups)   # 子单纯形中的位置
+    s = np.full(number_of_groups, float(total_utilization))
+    j = np.full(number_of_groups, k + 1)
+    sm = np.zeros(number_of_groups)
+    pr = np.ones(number_of_groups)
+    for i in range(n - 1, 0, -1):
+        e = rt[n - i - 1] <= t[i - 1, j - 1]
+        sx = rs[n - i - 1] ** (1 / i)
+        sm = sm + (1 - sx) * pr * s / (i + 1)
+        pr = sx * pr
+        x[n - i - 1] = sm + pr * e
+        s = s - e
+        j = j - e
+    x[n - 1] = sm + pr * s
+
+    # 坐标按固定顺序生成，在每组内随机打乱
+    order = np.argsort(np.random.rand(number_of_groups, n), axis=1)
+    return np.clip(np.take_along_axis(x.T, order, axis=1), 0, 1)
+
+def generate_utilizations(number_of_tasks: int, utilization: str = "uniform", group_size: int = None,
+                          total_utilization: float = None) -> np.ndarray:
+    '''生成 number_of_tasks 个归一化利用率，升序排列
+    utilization:
+        "uniform":      每个利用率独立地在 [0, 1) 中均匀分布
+        "uunifast", "randfixedsum":
+                        每 group_size 个任务为一组，组内利用率之和为 total_utilization；
+                        最后不足 group_size 个的任务为一组，总和按任务数量等比例缩小
+    '''
+    if utilization == "uniform":
+        return np.sort(np.random.rand(number_of_tasks))
+    if utilization not in UTILIZATION_GENERATORS:
+        raise ValueError(f"unknown utilization generator: {utilization}")
+
+    generator = uunifast if utilization == "uunifast" else randfixedsum
+    number_of_groups, rest = divmod(number_of_tasks, group_size)
+    utilizations = [generator(number_of_groups, group_size, total_utilization).ravel()]
+    if rest:
+        utilizations.append(generator(1, rest, total_utilization * rest / group_size).ravel())
+    return np.sort(np.concatenate(utilizations))
+
+def generate_task_chunk(number_of_tasks: int, implicit_deadline: bool, fastest_processor_speed,
+                        utilization: str = "uniform", group_size: int = None,
+                        total_utilization: float = None) -> np.ndarray:
+    '''生成一块任务的 (e, d, T, u)，返回 number_of_tasks × 4 的数组'''
+    # 随机生成一列归一化利用率
+    utilization_col = generate_utilizations(number_of_tasks, utilization, group_size, total_utilization).reshape(-1, 1)
+
+    # 随机生成一列deadline
+    deadline_col = np.random.randint(1, 100, size=number_of_tasks).reshape(-1, 1)
+
+    if implicit_deadline:
+        # 随机生成一列period，需要 period == deadline
+        period_col = np.random.randint(0, 1, size=(number_of_tasks, 1)) + deadline_col
+    else:
+        # 随机生成一列period，需要 period >= deadline
+        period_col = np.random.randint(1, 100, size=(number_of_tasks, 1)) + deadline_col
+
+    # 根据周期和归一化利用率计算出在最慢处理器上测量的执行时间。
+    exec_time_col = np.ceil(period_col * utilization_col * fastest_processor_speed)
+
+    return np.hstack((exec_time_col, deadline_col, period_col, utilization_col))
+
+def create_task_store(file_name: Path, number_of_tasks: int) -> np.memmap:
+    '''创建 number_of_tasks × 4 的 .npy 任务池文件，返回可写的内存映射'''
+    return np.lib.format.open_memmap(file_name, mode="w+", dtype=np.float64, shape=(number_of_tasks, 4))
+
+def load_task_store(file_name: Path) -> np.memmap:
+    '''以只读内存映射打开 .npy 任务池文件，不把任务读入内存'''
+    return np.load(file_name, mmap_mode="r")
+
+def task_chunks(tasks: np.ndarray, chunk_size: int = 100000):
+    '''按 task_id 顺序逐块读取任务池，每次只把 chunk_size 行读入内存，依次返回 (起始 task_id, 该块的数组)'''
+    for start in range(0, tasks.shape[0], chunk_size):
+        yield start, np.asarray(tasks[start:start + chunk_size])
+
+def parameter_records(chunk: np.ndarray) -> np.ndarray:
+    '''一块任务的 (e, d, T) 组成的结构化数组，按字段依次比较大小，与按行的字典序相同'''
+    records = np.empty(chunk.shape[0], dtype=[("e", np.float64), ("d", np.float64), ("T", np.float64)])
+    records["e"], records["d"], records["T"] = chunk[:, 0], chunk[:, 1], chunk[:, 2]
+    return records
+
+def task_classes(tasks: np.ndarray, chunk_size: int = 100000) -> np.ndarray:
+    '''每个任务的等价类序号，(e, d, T) 相同的任务属于同一等价类，等价类按 (e, d, T) 的字典序编号
+    分块计算：先合并各块中不同的参数得到全部等价类，再逐块查找每个任务的等价类，
+    结果与对整个任务池调用 np.unique(tasks[:, 0:3], axis=0, return_inverse=True) 相同
+    '''
+    classes = np.unique(np.concatenate([np.unique(parameter_records(chunk))
+                                        for _, chunk in task_chunks(tasks, chunk_size)]))
+    result = np.empty(tasks.shape[0], dtype=np.intp)
+    for start, chunk in task_chunks(tasks, chunk_size):
+        result[start:start + chunk.shape[0]] = np.searchsorted(classes, parameter_records(chunk))
+    return result
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+
+# 仓库的模块都在顶层，直接从仓库根目录导入
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# logger_config 导入时在当前目录创建 log/，测试在临时目录中运行，避免在仓库中留下日志和数据
+os.chdir(tempfile.mkdtemp(prefix="edf-tests-"))
+
+import pytest
+
+import scheduler as sc
+
+
+@pytest.fixture
+def make_scheduler():
+    """创建加入了 task_rows 中的任务的 Scheduler，task_ids 默认为任务的序号"""
+    def make(speeds, task_rows, engine="rescan", task_ids=None):
+        processors = [sc.Processor(id=f"P{i}", speed=speed) for i, speed in enumerate(speeds)]
+        scheduler = sc.Scheduler(processors, engine=engine)
+        for task_id, (e, d, T) in zip(task_ids or range(len(task_rows)), task_rows):
+            scheduler.add_task(sc.Task(task_id, arrival_timepoint=0, execution_time=e, deadline=d, period=T))
+        return scheduler
+    return make
+
+
+@pytest.fixture
+def make_generator(tmp_path):
+    """创建数据目录为 tmp_path / name、已生成处理器平台和任务池的 DataGenerator，options 为 SearchOptions 的参数
+    checkpoint_interval 和 resume 与 DataGenerator 的参数相同
+    """
+    import data_generater as data
+    from search_options import SearchOptions
+
+    def make(name, seed=1, number_of_processors=3, number_of_tasks=20, checkpoint_interval=None, resume=False, **options):
+        dg = data.DataGenerator(seed, tmp_path / name, SearchOptions(**options),
+                                checkpoint_interval=checkpoint_interval, resume=resume)
+        dg.generate_platform(number_of_processors)
+        dg.generate_tasks(number_of_tasks, implicit_deadline=False)
+        return dg
+    return make
+
+
+@pytest.fixture
+def read_results():
+    """读取 data_path 下的搜索结果文件，返回 文件名 -> 每行任务集（frozenset）的列表，保留文件中的顺序"""
+    import csv
+    import data_generater as data
+
+    def read(data_path):
+        results = {}
+        for file_name in data.DataGenerator.RESULT_FILES:
+            with open(data_path / file_name, newline='') as csvfile:
+                results[file_name] = [frozenset(int(task_id) for task_id in row) for row in csv.reader(csvfile)]
+        return results
+    return read
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import batch_scheduler as bs
+
+PLATFORMS = [[1], [2, 1], [3, 2, 1], [1.5, 1, 0.5]]
+
+
+def random_task_sets(rng, number_of_sets):
+    """任务数量不同的随机任务集，批量模拟时需要填充对齐"""
+    task_sets = []
+    for _ in range(number_of_sets):
+        number_of_tasks = rng.integers(1, 7)
+        period = rng.choice([2, 3, 4, 5, 6, 8, 10, 12], size=number_of_tasks)
+        deadline = rng.integers(1, period + 3)
+        task_sets.append(np.column_stack((rng.integers(1, 4, size=number_of_tasks), deadline, period)))
+    return task_sets
+
+
+@pytest.mark.parametrize("scalar_threshold", [0, 8])
+@pytest.mark.parametrize("speeds", PLATFORMS)
+def test_batch_matches_scalar_scheduler(make_scheduler, speeds, scalar_threshold):
+    """批量模拟与 Scheduler 逐个模拟的结果相同，scalar_threshold=0 时全程向量化模拟"""
+    task_sets = random_task_sets(np.random.default_rng(len(speeds)), 200)
+    expected = [make_scheduler(speeds, task_set.tolist()).run(truncated_lcm=1000, enable_history=False)
+                for task_set in task_sets]
+    batch_scheduler = bs.BatchScheduler(speeds, scalar_threshold=scalar_threshold)
+    assert batch_scheduler.run(task_sets, truncated_lcm=1000).tolist() == expected
+    assert not all(expected) and any(expected)
+
+
+def test_empty_batch():
+    assert bs.BatchScheduler([1]).run([]).tolist() == []
+
+
+def test_late_completion_is_a_deadline_miss():
+    """与 Scheduler 一样，期限之后才在两个调度事件之间完成的作业判定为错过期限"""
+    task_sets = [np.array([(3, 2, 4)]), np.array([(3, 2, 4), (3, 2, 4)]), np.array([(2, 2, 4)])]
+    assert bs.BatchScheduler([2, 1], scalar_threshold=0).run(task_sets, truncated_lcm=4).tolist() == [True, False, True]
+    assert bs.BatchScheduler([1], scalar_threshold=0).run(task_sets[:1], truncated_lcm=4).tolist() == [False]
@@ -0,0 +1,26 @@
+import benchmark
+
+
+def report(**results):
+    return {"metadata": {}, "results": results}
+
+
+def test_compare_results_flags_regressions():
+    baseline = report(fast={"seconds": 0.01, "peak_memory_bytes": 1000},
+                      slow={"seconds": 1.0, "peak_memory_bytes": 1000},
+                      removed={"seconds": 1.0, "peak_memory_bytes": 1000})
+    current = report(fast={"seconds": 0.04, "peak_memory_bytes": 1100},     # 低于噪声阈值，耗时不判定退化
+                     slow={"seconds": 1.5, "peak_memory_bytes": 2000},
+                     added={"seconds": 9.0, "peak_memory_bytes": 9000})     # 基准中没有的用例不比较
+    regressions = benchmark.compare_results(baseline, current, threshold=0.2)
+    assert [(name, metric) for name, metric, *_ in regressions] == [("slow", "seconds"), ("slow", "peak_memory_bytes")]
+    assert benchmark.compare_results(baseline, baseline, threshold=0.2) == []
+
+
+def test_run_benchmarks_report():
+    current = benchmark.run_benchmarks(seed=0, repeat=1, case_filter="scheduler_run/small/short/")
+    assert sorted(current["results"]) == ["scheduler_run/small/short/event_queue", "scheduler_run/small/short/rescan"]
+    for result in current["results"].values():
+        assert result["events"] > 0 and result["simulations"] == benchmark.TASK_SETS_PER_CASE
+        assert result["events_per_second"] > 0 and result["peak_memory_bytes"] > 0
+    assert benchmark.compare_results(current, current, threshold=0.2) == []
@@ -0,0 +1,55 @@
+import pytest
+
+
+def interrupt_after(dg, monkeypatch, iterations):
+    """第 iterations 次搜索（并行时为合并）结束、保存检查点之前中断，已写入文件的结果在检查点之后"""
+    calls = []
+    checkpoint_due = dg.checkpoint_due
+
+    def interrupted():
+        calls.append(None)
+        if len(calls) == iterations:
+            dg.result_sink.flush()
+            raise KeyboardInterrupt
+        return checkpoint_due()
+    monkeypatch.setattr(dg, "checkpoint_due", interrupted)
+
+
+def search(make_generator, name, batch_size=None, workers=None, **options):
+    dg = make_generator(name, seed=6, number_of_tasks=25, **options)
+    dg.SIMULATION_LIMIT = 20000
+    dg.generate_hyperedge(6, 12, batch_size=batch_size, workers=workers)
+    dg.result_sink.close()
+    return dg
+
+
+@pytest.mark.parametrize("batch_size, workers, strategy", [(None, None, "top_down"), (4, None, "top_down"),
+                                                           (None, None, "bottom_up"), (None, 2, "top_down")])
+def test_resume_matches_uninterrupted_run(make_generator, read_results, monkeypatch, batch_size, workers, strategy):
+    expected = search(make_generator, "expected", batch_size, workers, strategy=strategy)
+
+    dg = make_generator("data", seed=6, number_of_tasks=25, checkpoint_interval=0, strategy=strategy)
+    dg.SIMULATION_LIMIT = 20000
+    interrupt_after(dg, monkeypatch, 2)
+    with pytest.raises(KeyboardInterrupt):
+        dg.generate_hyperedge(6, 12, batch_size=batch_size, workers=workers)
+    dg.result_sink.close()
+    assert (dg.data_path / "checkpoint.pkl").exists()
+
+    resumed = search(make_generator, "data", batch_size, workers, checkpoint_interval=0, resume=True, strategy=strategy)
+    assert read_results(resumed.data_path) == read_results(expected.data_path)
+    assert resumed.terminations == expected.terminations
+    assert not (resumed.data_path / "checkpoint.pkl").exists()
+
+
+def test_resume_rejects_different_settings(make_generator, monkeypatch):
+    """检查点只能由参数和可调度性判定设置都相同的搜索恢复"""
+    dg = make_generator("data", seed=6, number_of_tasks=25, checkpoint_interval=0)
+    interrupt_after(dg, monkeypatch, 2)
+    with pytest.raises(KeyboardInterrupt):
+        dg.generate_hyperedge(6, 12)
+    dg.result_sink.close()
+
+    resumed = make_generator("data", seed=6, number_of_tasks=25, resume=True, horizon="adaptive")
+    with pytest.raises(ValueError):
+        resumed.generate_hyperedge(6, 12)
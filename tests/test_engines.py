@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+import batch_scheduler as bs
+import scheduler as sc
+
+PERIODS = [2, 3, 4, 5, 6, 8, 10, 12]
+PLATFORMS = [[1, 1], [3, 2, 1], [1.5, 1, 0.5], [2.5, 0.75]]
+
+
+def random_task_rows(rng, number_of_tasks):
+    """随机任务集 (e, d, T)，周期从少量取值中抽取，使绝对期限相同的平局经常出现"""
+    rows = []
+    for _ in range(number_of_tasks):
+        period = rng.choice(PERIODS)
+        deadline = rng.randint(1, period + 2)
+        rows.append((rng.randint(1, 3), deadline, period))
+    return rows
+
+
+@pytest.mark.parametrize("speeds", PLATFORMS)
+def test_event_queue_matches_rescan(make_scheduler, speeds):
+    rng = random.Random(f"{speeds}")
+    for _ in range(300):
+        task_rows = random_task_rows(rng, rng.randint(1, 6))
+        expected = make_scheduler(speeds, task_rows, "rescan").run(truncated_lcm=1000, enable_history=False)
+        assert make_scheduler(speeds, task_rows, "event_queue").run(truncated_lcm=1000, enable_history=False) == expected, \
+            task_rows
+
+
+def test_equal_deadlines_follow_insertion_order(make_scheduler):
+    """绝对期限相同时先加入调度器的任务优先，两个引擎的分配顺序相同"""
+    task_rows = [(2, 2, 4), (2, 2, 4)]
+    for engine in ("rescan", "event_queue"):
+        scheduler = make_scheduler([1], task_rows, engine, task_ids=[7, 3])
+        assert scheduler.run(truncated_lcm=4) is False
+        assert [task_id for task_id, *_ in scheduler.processors[0].history] == [7]
+
+
+def test_late_completion_is_a_deadline_miss(make_scheduler):
+    """作业在两个调度事件之间、期限之后才完成时同样判定为错过期限：
+    (3, 2, 4) 在速度1的处理器上 t=3 完成，晚于期限2，完成时已更新为下一个作业
+    """
+    for engine in ("rescan", "event_queue"):
+        assert make_scheduler([1], [(3, 2, 4)], engine).run(truncated_lcm=4) is False
+        assert make_scheduler([2, 1], [(3, 2, 4), (3, 2, 4)], engine).run(truncated_lcm=4) is False
+
+
+@pytest.mark.parametrize("engine", ["rescan", "event_queue"])
+def test_adaptive_horizon_matches_fixed(make_scheduler, engine):
+    """约束期限（d <= T）的同步任务集在一个超周期内的模拟是精确的，adaptive 提前结束后结论与 fixed 相同"""
+    rng = random.Random(engine)
+    for _ in range(300):
+        task_rows = [(e, min(d, T), T) for e, d, T in random_task_rows(rng, rng.randint(1, 6))]
+        speeds = rng.choice(PLATFORMS)
+        expected = make_scheduler(speeds, task_rows, engine).run(truncated_lcm=100000, enable_history=False)
+        scheduler = make_scheduler(speeds, task_rows, engine)
+        assert scheduler.run(truncated_lcm=100000, enable_history=False, horizon="adaptive") == expected, task_rows
+        assert scheduler.termination in sc.Scheduler.TERMINATIONS
+
+
+def test_batch_horizon_terminations(make_scheduler):
+    """BatchScheduler 记录的结束原因与 Scheduler 相同"""
+    rng = random.Random(0)
+    task_sets = [[(e, min(d, T), T) for e, d, T in random_task_rows(rng, rng.randint(1, 6))] for _ in range(100)]
+    batch_scheduler = bs.BatchScheduler([2, 1], scalar_threshold=0)
+    feasibilities = batch_scheduler.run(task_sets, truncated_lcm=100000, horizon="adaptive")
+    for task_rows, feasible, termination in zip(task_sets, feasibilities, batch_scheduler.terminations):
+        scheduler = make_scheduler([2, 1], task_rows)
+        assert scheduler.run(truncated_lcm=100000, enable_history=False, horizon="adaptive") == bool(feasible), task_rows
+        assert scheduler.termination == termination, task_rows
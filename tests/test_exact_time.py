@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+import pytest
+
+import batch_scheduler as bs
+import scheduler as sc
+from simulation_context import SimulationContext
+
+
+def random_task_rows(rng, number_of_tasks):
+    rows = []
+    for _ in range(number_of_tasks):
+        period = rng.choice([3, 4, 5, 6, 10, 12, 15, 20])
+        rows.append((rng.randint(1, 4), rng.randint(1, period), period))
+    return rows
+
+
+def test_integer_speeds():
+    assert sc.integer_speeds([0.3, 0.1]) == ([3, 1], 10)
+    assert sc.integer_speeds([2, 1.5, 0.25]) == ([8, 6, 1], 4)
+    assert sc.integer_speeds([3, 2]) == ([3, 2], 1)
+
+
+@pytest.mark.parametrize("engine", ["rescan", "event_queue"])
+@pytest.mark.parametrize("horizon", ["fixed", "adaptive"])
+def test_exact_matches_float_for_integral_speeds(engine, horizon):
+    speeds = [4, 3, 1]
+    default = SimulationContext(speeds, engine=engine)
+    exact = SimulationContext(speeds, engine=engine, exact=True)
+    rng = random.Random(f"{engine}-{horizon}")
+    task_sets = [random_task_rows(rng, rng.randint(1, 6)) for _ in range(300)]
+    for task_rows in task_sets:
+        assert exact.run(task_rows, truncated_lcm=2000, horizon=horizon) == \
+            default.run(task_rows, truncated_lcm=2000, horizon=horizon), task_rows
+
+    batch = [np.array(task_rows) for task_rows in task_sets]
+    assert list(bs.BatchScheduler(speeds, exact=True).run(batch, truncated_lcm=2000, horizon=horizon)) == \
+        list(bs.BatchScheduler(speeds).run(batch, truncated_lcm=2000, horizon=horizon))
+
+
+def test_exact_fixes_rounding_with_fractional_speeds():
+    """处理器速度为 0.3 和 0.1 时，浮点运算的舍入误差使默认模式误判错过期限
+    放大10倍后速度为 3 和 1，任务的执行工作量为 20 和 10：
+        t=0: 任务1（期限4）在速度3的处理器上 4 个时刻完成；任务0（期限12）在速度1的处理器上完成 4
+        t=4: 任务0 剩余 16，在速度3的处理器上 6 个时刻完成，t=10 时完成，不晚于期限12
+    之后的作业重复同样的调度，任务集可调度
+    """
+    task_rows = [(2, 12, 12), (1, 4, 10)]
+    for engine in ("rescan", "event_queue"):
+        assert SimulationContext([0.3, 0.1], engine=engine, exact=True).run(task_rows, truncated_lcm=2000)[0]
+        assert not SimulationContext([0.3, 0.1], engine=engine).run(task_rows, truncated_lcm=2000)[0]
+    assert list(bs.BatchScheduler([0.3, 0.1], exact=True).run([np.array(task_rows)], truncated_lcm=2000)) == [True]
+
+
+def test_exact_time_search_matches_default_for_integral_platform(make_generator, read_results):
+    results = []
+    for exact_time in (False, True):
+        dg = make_generator(str(exact_time), seed=4, exact_time=exact_time)
+        dg.SIMULATION_LIMIT = 20000
+        dg.generate_hyperedge(6, 10)
+        dg.result_sink.close()
+        results.append(read_results(dg.data_path))
+    assert results[0] == results[1]
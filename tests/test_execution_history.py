@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+import pytest
+
+from execution_history import ExecutionHistory
+
+
+class ListHistory(list):
+    '''原先的运行历史：四元组的列表'''
+    def append(self, task_id, instance_id, start, duration):
+        super().append((task_id, instance_id, start, duration))
+
+
+@pytest.mark.parametrize("engine", ["rescan", "event_queue"])
+def test_history_matches_list_history(make_scheduler, engine):
+    """按列保存的运行历史与原先的四元组列表相同，包括超过初始容量后的扩展"""
+    rng = random.Random(engine)
+    task_rows = [(rng.randint(1, 3), period, period) for period in rng.choices([7, 9, 10, 11, 13], k=6)]
+    columnar = make_scheduler([3, 2, 1], task_rows, engine)
+    columnar.run(truncated_lcm=1000)
+    baseline = make_scheduler([3, 2, 1], task_rows, engine)
+    for processor in baseline.processors:
+        processor.history = ListHistory()
+    baseline.run(truncated_lcm=1000)
+
+    assert max(len(processor.history) for processor in columnar.processors) > ExecutionHistory.INITIAL_CAPACITY
+    for processor, baseline_processor in zip(columnar.processors, baseline.processors):
+        assert list(processor.history) == list(baseline_processor.history)
+
+
+def test_history_of_a_small_run(make_scheduler):
+    scheduler = make_scheduler([1], [(1, 2, 2), (2, 4, 4)])
+    scheduler.run(truncated_lcm=4)
+    assert list(scheduler.processors[0].history) == [(0, 0, 0, 1), (1, 0, 1, 1), (0, 1, 2, 1), (1, 0, 3, 1), (0, 2, 4, 1)]
+
+
+def test_cap_and_ring_modes():
+    records = [(i % 3, i, float(i), 1.0) for i in range(10)]
+    cap = ExecutionHistory(max_records=4, mode="cap")
+    ring = ExecutionHistory(max_records=4, mode="ring")
+    for record in records:
+        cap.append(*record)
+        ring.append(*record)
+    assert list(cap) == records[:4] and cap.dropped == 6
+    assert list(ring) == records[-4:] and ring.dropped == 6
+
+
+def test_window_clips_slices():
+    history = ExecutionHistory()
+    for record in [(0, 0, 0.0, 2.0), (1, 0, 2.0, 3.0), (0, 1, 5.0, 1.0)]:
+        history.append(*record)
+    window = history.window(1, 4)
+    assert window["task_id"].tolist() == [0, 1]
+    assert np.allclose(window["start"], [1, 2]) and np.allclose(window["duration"], [1, 2])
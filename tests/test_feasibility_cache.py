@@ -0,0 +1,69 @@
+from feasibility_cache import FeasibilityCache
+
+SPEEDS = [2.0, 1.0]
+
+
+def task_rows(i):
+    return [(1, i + 2, i + 2), (1, 5, 5)]
+
+
+def test_replace_does_not_grow_size(tmp_path):
+    cache = FeasibilityCache(tmp_path / "cache.sqlite", max_entries=10)
+    cache.put(SPEEDS, task_rows(0), True)
+    cache.put(SPEEDS, task_rows(0), False)
+    assert cache.size == 1
+    assert cache.get(SPEEDS, task_rows(0)) is False
+    cache.close()
+
+
+def test_hits_keep_entries_from_eviction(tmp_path):
+    """命中后批量写入的 last_used 在淘汰时生效，最近命中的条目不被淘汰"""
+    cache = FeasibilityCache(tmp_path / "cache.sqlite", max_entries=10)
+    for i in range(10):
+        cache.put(SPEEDS, task_rows(i), True)
+    assert cache.get(SPEEDS, task_rows(0)) is True
+    cache.put(SPEEDS, task_rows(10), True)
+    assert cache.evictions == 2
+    assert cache.size == 9
+    assert cache.get(SPEEDS, task_rows(0)) is True
+    assert cache.get(SPEEDS, task_rows(1)) is None
+    cache.close()
+
+
+def test_recency_survives_reopening(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = FeasibilityCache(path, max_entries=10)
+    for i in range(10):
+        cache.put(SPEEDS, task_rows(i), i % 2 == 0)
+    cache.get(SPEEDS, task_rows(0))
+    cache.close()
+
+    cache = FeasibilityCache(path, max_entries=9)
+    assert cache.size == 8
+    assert cache.get(SPEEDS, task_rows(0)) is True
+    assert cache.get(SPEEDS, task_rows(1)) is None
+    assert cache.get(SPEEDS, task_rows(2)) is None
+    assert cache.get(SPEEDS, task_rows(3)) is False
+    cache.close()
+
+
+def test_key_keeps_simulation_order(tmp_path, make_scheduler):
+    """截止时间相同的任务按添加顺序决定优先级，交换顺序后可调度性不同，缓存不能把两者当作同一个任务集"""
+    speeds = [2, 1]
+    rows = [(2, 2, 4), (1, 2, 4), (1, 2, 3), (1, 2, 3)]
+    permuted = [rows[1], rows[0]] + rows[2:]
+    expected = [make_scheduler(speeds, task_rows).run(truncated_lcm=1000000, enable_history=False)
+                for task_rows in (rows, permuted)]
+    assert expected == [True, False]
+
+    cache = FeasibilityCache(tmp_path / "cache.sqlite")
+    verdicts = []
+    for task_rows in (rows, permuted):
+        feasible = cache.get(speeds, task_rows)
+        if feasible is None:
+            feasible = make_scheduler(speeds, task_rows).run(truncated_lcm=1000000, enable_history=False)
+            cache.put(speeds, task_rows, feasible)
+        verdicts.append(feasible)
+    assert verdicts == expected
+    assert cache.get(speeds, rows) is True and cache.get(speeds, permuted) is False
+    cache.close()
@@ -0,0 +1,38 @@
+import pytest
+
+
+def search(make_generator, name, seed, **options):
+    dg = make_generator(name, seed=seed, **options)
+    dg.SIMULATION_LIMIT = 20000
+    dg.generate_hyperedge(6, 10)
+    dg.result_sink.close()
+    return dg
+
+
+@pytest.mark.parametrize("multiset_memo", [False, True])
+@pytest.mark.parametrize("engine", ["rescan", "event_queue"])
+@pytest.mark.parametrize("strategy,bottom_up_budget", [("top_down", None), ("bottom_up", None), ("bottom_up", 5)])
+def test_incremental_matches_full_simulation(make_generator, read_results, strategy, bottom_up_budget, engine,
+                                             multiset_memo):
+    reused = 0
+    for seed in (1, 2, 3):
+        options = dict(strategy=strategy, bottom_up_budget=bottom_up_budget, engine=engine, multiset_memo=multiset_memo)
+        full = search(make_generator, f"full_{seed}", seed, **options)
+        dg = search(make_generator, f"incremental_{seed}", seed, incremental=True, **options)
+        assert read_results(dg.data_path) == read_results(full.data_path), seed
+        assert not dg.miss_records  # 子集搜索完毕后记录全部释放
+        reused += dg.search_statistics["witness_pruned"] + dg.search_statistics["replayed_simulations"]
+    if strategy == "bottom_up" and bottom_up_budget is None:
+        assert reused == 0  # 完整枚举的结果回答了所有子集，没有需要模拟的任务集
+    else:
+        assert reused > 0
+
+
+def test_lattice_keeps_no_miss_records(make_generator):
+    """自底向上逐层枚举不保存增量模拟的记录"""
+    dg = make_generator("data", incremental=True)
+    dg.SIMULATION_LIMIT = 20000
+    verdicts, _ = dg.enumerate_feasible_subsets(frozenset(range(6)))
+    assert not all(verdicts.values())
+    assert not dg.miss_records
+    assert not dg.incremental_paused
@@ -0,0 +1,58 @@
+import itertools
+
+import numpy as np
+import pytest
+
+
+def duplicated_generator(make_generator, name, **options):
+    """任务池由 10 个任务重复 3 次组成，参数多重集相同的任务集很多"""
+    dg = make_generator(name, seed=5, number_of_processors=3, number_of_tasks=10, **options)
+    dg.tasks = np.tile(dg.tasks, (3, 1))
+    dg.task_classes = None
+    dg.SIMULATION_LIMIT = 20000
+    return dg
+
+
+@pytest.mark.parametrize("batch_size", [None, 8])
+def test_memo_matches_canonical_order_search(make_generator, read_results, monkeypatch, batch_size):
+    """启用 multiset_memo 与同样按参数顺序模拟、但不共享结果的搜索得到相同的结果文件"""
+    dg = duplicated_generator(make_generator, "memo", multiset_memo=True)
+    dg.generate_hyperedge(6, 15, batch_size=batch_size)
+    dg.result_sink.close()
+    assert dg.search_statistics["multiset_memo_saved"] > 0
+
+    reference = duplicated_generator(make_generator, "reference", multiset_memo=True)
+    # 每个任务集的键互不相同：仍按参数顺序加入调度器，但结果不推广到其他任务集
+    monkeypatch.setattr(reference, "multiset_key", lambda task_id_set: tuple(sorted(task_id_set)))
+    reference.generate_hyperedge(6, 15, batch_size=batch_size)
+    reference.result_sink.close()
+    assert reference.search_statistics["multiset_memo_saved"] == 0
+
+    # 批量搜索时多重集剪枝使子集在不同的批次中判断，文件中的顺序可能不同，比较结果集合
+    expected = {file_name: set(rows) for file_name, rows in read_results(reference.data_path).items()}
+    assert {file_name: set(rows) for file_name, rows in read_results(dg.data_path).items()} == expected
+
+
+def test_same_multiset_same_verdict(make_generator):
+    """参数相同的任务集在启用 multiset_memo 时结论相同"""
+    dg = duplicated_generator(make_generator, "data", multiset_memo=True)
+    for task_id_set in itertools.islice(itertools.combinations(range(30), 4), 0, 200, 7):
+        feasible = dg.judge_feasibility(frozenset(task_id_set))
+        shifted = frozenset((task_id + 10) % 30 for task_id in task_id_set)   # 参数多重集相同的另一组任务
+        dg.multiset_verdicts.clear()
+        assert dg.judge_feasibility(shifted) == feasible
+
+
+def test_prefilter_verdicts_are_memoized(make_generator):
+    """prefilter 为 "on" 时检验得出的结论同样按多重集记录"""
+    dg = duplicated_generator(make_generator, "data", multiset_memo=True, prefilter="on")
+    task_id_sets = [frozenset(task_id_set) for task_id_set in itertools.combinations(range(10), 3)]
+    verdicts = [dg.judge_feasibility(task_id_set) for task_id_set in task_id_sets]
+    assert sum(count for name, count in dg.schedulability_tests.statistics.items() if name != "simulation") > 0
+    for task_id_set, feasible in zip(task_id_sets, verdicts):
+        assert dg.multiset_verdicts[dg.multiset_key(task_id_set)] == feasible
+
+    tests = dict(dg.schedulability_tests.statistics)
+    assert [dg.judge_feasibility(frozenset(task_id + 20 for task_id in task_id_set))
+            for task_id_set in task_id_sets] == verdicts
+    assert dict(dg.schedulability_tests.statistics) == tests    # 参数相同的任务集不再检验
@@ -0,0 +1,25 @@
+import csv
+
+import pytest
+
+
+def search(make_generator, name, workers=None, batch_size=None):
+    dg = make_generator(name, seed=3)
+    dg.generate_hyperedge(6, 12, batch_size=batch_size, workers=workers)
+    return dg
+
+
+@pytest.mark.parametrize("batch_size", [None, 4])
+def test_parallel_matches_serial_search(tmp_path, make_generator, batch_size):
+    """并行搜索与串行搜索的负采样和最小不可调度组合相同，超边互相覆盖：每条超边都是另一方某条超边的子集"""
+    serial = search(make_generator, "serial")
+    parallel = search(make_generator, "parallel", workers=3, batch_size=batch_size)
+    assert parallel.negative_samples == serial.negative_samples
+    assert set(parallel.minimal_unschedulable_combinations) == set(serial.minimal_unschedulable_combinations)
+    for covered, covering in ((serial.hyperedges, parallel.hyperedges), (parallel.hyperedges, serial.hyperedges)):
+        assert all(any(task_id_set <= hyperedge for hyperedge in covering) for task_id_set in covered)
+
+    # 与串行搜索一样，不记录已记录的超边的子集
+    with open(tmp_path / "parallel" / "hyperedges.csv") as file:
+        hyperedges = [frozenset(int(task_id) for task_id in row) for row in csv.reader(file)]
+    assert not any(hyperedge <= earlier for i, hyperedge in enumerate(hyperedges) for earlier in hyperedges[:i])
@@ -0,0 +1,51 @@
+import pytest
+
+import data_generater as data
+import scheduler as sc
+from platform_sweep import PlatformSweep
+
+
+@pytest.fixture(autouse=True)
+def short_simulations(monkeypatch):
+    monkeypatch.setattr(data.DataGenerator, "SIMULATION_LIMIT", 20000)
+
+
+def generator(data_path, speeds):
+    dg = data.DataGenerator(11, data_path)
+    dg.processors = [sc.Processor(id=f"P{i}", speed=speed) for i, speed in enumerate(speeds)]
+    dg.generate_tasks(30, implicit_deadline=False)
+    return dg
+
+
+def test_sweep_on_faster_platform_keeps_feasible_sets(tmp_path, make_scheduler):
+    """任务池在 [9, 6, 6] 上生成，在最快处理器更快的 [90, 90, 90] 上只有模拟确认不可调度的任务集才是负采样"""
+    dg = generator(tmp_path / "sweep", [9, 6, 6])
+    slow, fast = dg.sweep_platforms([[9, 6, 6], [90, 90, 90]], 6, 15)
+    for task_id_set in fast.negative_samples:
+        scheduler = make_scheduler(fast.platform_speeds(), fast.task_rows(task_id_set))
+        assert not scheduler.run(truncated_lcm=data.DataGenerator.SIMULATION_LIMIT, enable_history=False), sorted(task_id_set)
+    assert all(fast.hyperedges.has_superset(task_id_set) for task_id_set in slow.hyperedges)
+
+
+def test_sweep_matches_single_platform_search(tmp_path, read_results):
+    """在生成任务池的平台上，扫描与单独搜索的结果相同"""
+    single = generator(tmp_path / "single", [9, 6, 6])
+    single.generate_hyperedge(6, 15)
+    single.result_sink.close()
+    sweep = generator(tmp_path / "sweep", [9, 6, 6])
+    sweep.sweep_platforms([[9, 6, 6], [90, 90, 90]], 6, 15)
+    assert read_results(tmp_path / "sweep" / "platform_0") == read_results(tmp_path / "single")
+
+
+def test_verdicts_released_after_last_query():
+    sweep = PlatformSweep(None, [[2, 1], [3, 3], [1]], fastest_speed=2)
+    assert sweep.last_query == [2, 2, -1]
+    task_id_set = frozenset({1, 2})
+    sweep.record(0, task_id_set, True)
+    sweep.record(2, task_id_set, True)
+    assert sweep.verdicts[2] == {}
+    sweep.finish(0)
+    sweep.finish(1)
+    assert sweep.verdicts[0] == {task_id_set: True}
+    sweep.finish(2)
+    assert sweep.verdicts == [{}, {}, {}]
@@ -0,0 +1,57 @@
+import json
+import pickle
+
+from profiler import NULL_PROFILER, SearchProfiler
+
+
+def search(make_generator, read_results, name, workers=None, **options):
+    dg = make_generator(name, seed=9, number_of_tasks=25, **options)
+    dg.SIMULATION_LIMIT = 20000
+    dg.generate_hyperedge(6, 10, workers=workers)
+    dg.result_sink.close()
+    return dg, read_results(dg.data_path)
+
+
+def test_profiler_does_not_change_results(make_generator, read_results):
+    dg, expected = search(make_generator, read_results, "plain")
+    assert dg.options.profiler is NULL_PROFILER
+    _, results = search(make_generator, read_results, "profiled", profiler=SearchProfiler())
+    assert results == expected
+
+
+def test_report(make_generator, read_results, tmp_path):
+    dg, results = search(make_generator, read_results, "data", profiler=SearchProfiler())
+    report = dg.options.profiler.report()
+    assert {"utilization", "unschedulable_combination_scan", "superset_scan", "judge_feasibility",
+            "simulate", "output"} <= set(report["stages"])
+    # 每次模拟都计入模拟开销，每条写入的结果都计入 "output" 阶段
+    assert report["stages"]["simulate"]["calls"] == sum(dg.terminations.values())
+    assert report["simulations"]["runs"] == sum(dg.terminations.values())
+    assert sum(size["runs"] for size in report["simulations"]["by_task_set_size"].values()) == report["simulations"]["runs"]
+    assert sum(report["simulations"]["events_histogram"].values()) == report["simulations"]["runs"]
+    assert report["stages"]["output"]["calls"] == sum(len(rows) for rows in results.values())
+    assert report["pruning"]["single_task"] > 0
+
+    dg.options.profiler.save(tmp_path / "profile.json")
+    saved = json.loads((tmp_path / "profile.json").read_text())
+    assert saved["stages"].keys() == report["stages"].keys()
+
+
+def test_merge():
+    first, second = SearchProfiler(), SearchProfiler()
+    for profiler, calls in ((first, 2), (second, 3)):
+        for _ in range(calls):
+            with profiler.stage("simulate"):
+                profiler.hit("utilization")
+    second = pickle.loads(pickle.dumps(second))     # 工作进程的分析器经 pickle 返回
+    first.merge(second)
+    assert first.stages["simulate"].calls == 5
+    assert first.pruning["utilization"] == 5
+
+
+def test_parallel_workers_merge_into_parent(make_generator, read_results):
+    """工作进程的统计在合并结果时合并到主进程的分析器中"""
+    dg, _ = search(make_generator, read_results, "data", workers=2, profiler=SearchProfiler())
+    report = dg.options.profiler.report()
+    assert report["simulations"]["runs"] == sum(dg.terminations.values()) > 0
+    assert report["stages"]["judge_feasibility"]["calls"] >= report["simulations"]["runs"]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+
+def csr_columns(indptr, indices, shape):
+    """将 节点 × 任务集 的 CSR 关联矩阵还原为各列（任务集）中的节点"""
+    columns = [set() for _ in range(shape[1])]
+    for node in range(shape[0]):
+        for column in indices[indptr[node]:indptr[node + 1]]:
+            columns[column].add(node)
+    return [frozenset(column) for column in columns]
+
+
+def test_npz_matches_csv(make_generator, read_results):
+    dg = make_generator("npz", seed=2)
+    dg.generate_hyperedge(5, 15)
+    dg.result_sink.close()
+    dg.save_hypergraph(dg.data_path / "hypergraph.npz")
+    results = read_results(dg.data_path)
+
+    hypergraph = np.load(dg.data_path / "hypergraph.npz")
+    hyperedges = csr_columns(hypergraph["indptr"], hypergraph["indices"], hypergraph["shape"])
+    negative_samples = csr_columns(hypergraph["negative_indptr"], hypergraph["negative_indices"],
+                                   hypergraph["negative_shape"])
+    assert hyperedges and negative_samples
+    assert sorted(map(sorted, hyperedges)) == sorted(map(sorted, results["hyperedges.csv"]))
+    assert sorted(map(sorted, negative_samples)) == sorted(map(sorted, results["negative_samples.csv"]))
+    assert np.array_equal(hypergraph["features"], dg.tasks)
+
+
+def test_npz_loads_with_scipy(make_generator, read_results):
+    sparse = pytest.importorskip("scipy.sparse")
+    dg = make_generator("scipy", seed=2)
+    dg.generate_hyperedge(5, 15)
+    dg.result_sink.close()
+    dg.save_hypergraph(dg.data_path / "hypergraph.npz")
+
+    matrix = sparse.load_npz(dg.data_path / "hypergraph.npz").tocsc()
+    hyperedges = [frozenset(matrix[:, j].nonzero()[0]) for j in range(matrix.shape[1])]
+    assert sorted(map(sorted, hyperedges)) == sorted(map(sorted, read_results(dg.data_path)["hyperedges.csv"]))
+
+
+def test_buffered_rows_reach_the_files(make_generator, read_results):
+    """缓冲的结果在 generate_hyperedge 结束时写入文件，与内存中的搜索结果一致"""
+    dg = make_generator("buffered", seed=3)
+    dg.result_sink.buffer_rows = 7
+    dg.generate_hyperedge(5, 15)
+    results = read_results(dg.data_path)
+    assert set(results["hyperedges.csv"]) == set(dg.hyperedges)
+    assert set(results["negative_samples.csv"]) == dg.negative_samples
+    assert set(results["minimal_unschedulable_combinations.csv"]) == set(dg.minimal_unschedulable_combinations)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import schedulability_tests as st
+
+
+def test_chain_reports_the_deciding_tier():
+    chain = st.SchedulabilityTestChain([2, 1])
+    assert chain.decide([(5, 2, 4)]) == (False, "task_speed_test")          # 最快的处理器上也要 2.5 个时刻
+    assert chain.decide([(4, 4, 4)] * 4) == (False, "total_utilization_test")
+    assert chain.decide([(1, 4, 4), (1, 4, 4)]) == (True, "density_bound_test")
+    assert chain.decide([(3, 2, 2), (3, 2, 2)]) == (None, "simulation")
+    assert chain.statistics == {"task_speed_test": 1, "total_utilization_test": 1, "density_bound_test": 1,
+                                "simulation": 1}
+    # 总利用率 3.3 不超过 S_m = 4，但最大的两个利用率之和 3.2 超过最快的两个处理器的速度之和 3
+    chain = st.SchedulabilityTestChain([2, 1, 1])
+    assert chain.decide([(8, 5, 5), (8, 5, 5), (1, 10, 10)]) == (False, "largest_utilization_test")
+
+
+def test_tiers_agree_with_simulation(make_scheduler):
+    """每个检验得出的结论都与模拟结果一致"""
+    rng = np.random.default_rng(0)
+    chain = st.SchedulabilityTestChain([3, 2, 1])
+    decided = 0
+    for _ in range(300):
+        number_of_tasks = rng.integers(1, 6)
+        period = rng.choice([2, 3, 4, 6, 12], size=number_of_tasks)
+        task_rows = np.column_stack((rng.integers(1, 9, size=number_of_tasks), rng.integers(1, period + 1), period))
+        verdict, test_name = chain.decide(task_rows)
+        if verdict is not None:
+            decided += 1
+            assert make_scheduler([3, 2, 1], task_rows.tolist()).run(enable_history=False) == verdict, (test_name, task_rows)
+    assert decided > 0
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_prefilter_verify_agrees_with_simulation(make_generator, seed):
+    """校验模式下每个检验的结论都与模拟结果一致"""
+    dg = make_generator("data", seed, prefilter="verify")
+    dg.generate_hyperedge(5, 15)
+    tests = dg.schedulability_tests
+    assert sum(count for name, count in tests.statistics.items() if name != "simulation") > 0
+    assert not tests.mismatches
@@ -0,0 +1,44 @@
+import pytest
+
+
+def search(make_generator, read_results, name, batch_size=None, **options):
+    dg = make_generator(name, seed=5, number_of_processors=3, number_of_tasks=30, **options)
+    dg.SIMULATION_LIMIT = 20000    # 缩短截断的模拟，两种搜索方式的结果仍然可以比较
+    dg.generate_hyperedge(7, 20, batch_size=batch_size)
+    dg.result_sink.close()
+    return dg, read_results(dg.data_path)
+
+
+@pytest.mark.parametrize("batch_size", [None, 8])
+def test_bottom_up_matches_top_down(make_generator, read_results, batch_size):
+    """不限制模拟次数时枚举完每个随机任务集的可调度子集，结果文件与自顶向下搜索逐行相同"""
+    _, expected = search(make_generator, read_results, "top_down")
+    dg, results = search(make_generator, read_results, "bottom_up", batch_size, strategy="bottom_up")
+    assert results == expected
+    assert dg.search_statistics["bottom_up_seeds"] == 20
+    assert dg.search_statistics["bottom_up_fallbacks"] == 0
+
+
+def test_budget_falls_back_to_top_down(make_generator, read_results):
+    _, expected = search(make_generator, read_results, "top_down")
+    dg, results = search(make_generator, read_results, "bottom_up", strategy="bottom_up", bottom_up_budget="auto")
+    assert results == expected
+    assert dg.search_statistics["bottom_up_fallbacks"] > 0
+
+
+def test_enumeration_stops_at_budget(make_generator):
+    """枚举需要的模拟超出上限时停止，已判断的结果仍然保留"""
+    dg = make_generator("data", seed=5, number_of_tasks=30)
+    dg.SIMULATION_LIMIT = 20000
+    seed = frozenset(range(6))
+    verdicts, complete = dg.enumerate_feasible_subsets(seed)
+    assert complete and verdicts[seed] is False
+    simulations = dg.search_statistics["bottom_up_simulations"]
+    assert simulations > len(seed) + 1
+
+    dg = make_generator("budget", seed=5, number_of_tasks=30)
+    dg.SIMULATION_LIMIT = 20000
+    partial, complete = dg.enumerate_feasible_subsets(seed, budget=len(seed) + 1)
+    assert not complete
+    assert dg.search_statistics["bottom_up_simulations"] <= len(seed) + 1
+    assert partial.items() <= verdicts.items()
@@ -0,0 +1,58 @@
+import os
+import time
+
+from shard_queue import ShardQueue
+
+
+def search(make_generator, name):
+    dg = make_generator(name, seed=8, number_of_tasks=25)
+    dg.SIMULATION_LIMIT = 20000
+    return dg
+
+
+def test_shards_merge_to_serial_search(make_generator, read_results):
+    """两个进程先后搜索两个分片：第一个进程时另一个分片被其他进程认领，认领过期后由第二个进程接管并合并，
+    合并结果与单进程的 generate_hyperedge 逐行相同
+    """
+    expected = search(make_generator, "expected")
+    expected.generate_hyperedge(6, 12)
+    expected.result_sink.close()
+
+    claim_file = ShardQueue(expected.data_path.parent / "data" / "shards", 2).claim_file(1)
+    with open(claim_file, "w") as file:
+        file.write("other.1 0\n")
+    first = search(make_generator, "data")
+    assert not first.generate_hyperedge_sharded(6, 12, shard_size=6, claim_timeout=60)
+    first.result_sink.close()
+
+    os.utime(claim_file, (time.time() - 120, time.time() - 120))   # 认领的进程已退出
+    second = search(make_generator, "data")
+    assert second.generate_hyperedge_sharded(6, 12, shard_size=6, claim_timeout=60)
+    second.result_sink.close()
+    assert read_results(second.data_path) == read_results(expected.data_path)
+
+
+def test_take_over_keeps_live_claim(tmp_path):
+    """判断过期之后其他进程已经写入了新的认领，重命名移走的是新的认领，确认后放回"""
+    queue = ShardQueue(tmp_path, 1, claim_timeout=60)
+    with open(queue.claim_file(0), "w") as file:
+        file.write("other.1 0\n")
+    assert not queue.take_over(0)
+    with open(queue.claim_file(0)) as file:
+        assert file.read() == "other.1 0\n"
+    assert sorted(os.listdir(tmp_path / "claims")) == ["00000.claim"]
+    assert list(queue.claims()) == []
+
+
+def test_claims_rescan_for_stale_claims(tmp_path):
+    """搜索其他分片期间过期的认领在再次扫描时被接管"""
+    queue = ShardQueue(tmp_path, 2, claim_timeout=60)
+    with open(queue.claim_file(0), "w") as file:
+        file.write("other.1 0\n")
+    claims = queue.claims()
+    assert next(claims) == 1
+    os.makedirs(queue.result_path(1))
+    os.utime(queue.claim_file(0), (time.time() - 120, time.time() - 120))
+    assert next(claims) == 0
+    os.makedirs(queue.result_path(0))
+    assert list(claims) == []
@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from simulation_context import SimulationContext
+
+
+@pytest.mark.parametrize("engine", ["rescan", "event_queue"])
+@pytest.mark.parametrize("horizon", ["fixed", "adaptive"])
+def test_pooled_context_matches_fresh_scheduler(make_scheduler, engine, horizon):
+    """同一个模拟环境依次模拟大小不同的任务集，每次的结论和结束原因都与新建的 Scheduler 相同"""
+    speeds = [2.5, 1, 0.5]
+    context = SimulationContext(speeds, engine=engine)
+    rng = random.Random(f"{engine}{horizon}")
+    for _ in range(200):
+        task_rows = []
+        for _ in range(rng.randint(1, 8)):
+            period = rng.choice([4, 5, 6, 8, 10, 12])
+            task_rows.append((rng.randint(1, 6), rng.randint(1, period + 3), period))
+        task_ids = rng.sample(range(100), len(task_rows))
+
+        scheduler = make_scheduler(speeds, task_rows, engine, task_ids)
+        expected = scheduler.run(truncated_lcm=1000, enable_history=False, horizon=horizon)
+        assert context.run(task_rows, task_ids, truncated_lcm=1000, horizon=horizon) == (expected, scheduler.termination), \
+            task_rows
+    assert len(context.task_pool) <= 8   # Task 对象只在任务集变大时分配
+
+
+def test_history_is_cleared_between_runs():
+    context = SimulationContext([1])
+    context.run([(2, 2, 4), (1, 4, 4)], truncated_lcm=4, enable_history=True)
+    context.run([(1, 2, 2)], truncated_lcm=2, enable_history=True)
+    assert list(context.processors[0].history) == [(0, 0, 0, 1), (0, 1, 2, 1)]
+
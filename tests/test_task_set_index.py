@@ -0,0 +1,16 @@
+import random
+
+from task_set_index import TaskSetIndex
+
+
+def test_queries_match_linear_scan():
+    rng = random.Random(0)
+    stored = [frozenset(rng.sample(range(16), rng.randint(1, 6))) for _ in range(200)]
+    index = TaskSetIndex(stored)
+    assert len(index) == len(set(stored))
+    assert set(index) == set(stored)
+    for _ in range(500):
+        query = frozenset(rng.sample(range(16), rng.randint(0, 8)))
+        assert (query in index) == (query in stored)
+        assert index.has_superset(query) == any(query <= task_id_set for task_id_set in stored), sorted(query)
+        assert index.has_subset(query) == any(task_id_set <= query for task_id_set in stored), sorted(query)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import data_generater as data
+from task_store import generate_utilizations, randfixedsum, task_classes, uunifast
+
+
+def generator(data_path, seed=4):
+    dg = data.DataGenerator(seed, data_path)
+    dg.generate_platform(3)
+    return dg
+
+
+@pytest.mark.parametrize("utilization", ["uniform", "uunifast", "randfixedsum"])
+def test_single_chunk_matches_generate_tasks(tmp_path, utilization):
+    """只有一块时 generate_tasks_chunked 与 generate_tasks 的随机数调用相同，同一种子生成相同的任务池"""
+    expected = generator(tmp_path / "memory").generate_tasks(30, False, utilization)
+    tasks = generator(tmp_path / "chunked").generate_tasks_chunked(30, False, 30, utilization)
+    assert isinstance(tasks, np.memmap)
+    assert np.array_equal(tasks, expected)
+
+
+def test_chunked_pool(tmp_path):
+    """分块生成的任务池可由种子复现，每个任务满足与 generate_tasks 相同的约束"""
+    tasks = generator(tmp_path / "first").generate_tasks_chunked(1000, False, 64)
+    assert np.array_equal(generator(tmp_path / "second").generate_tasks_chunked(1000, False, 64), tasks)
+    e, d, T, u = tasks.T
+    assert tasks.shape == (1000, 4)
+    assert np.all((1 <= d) & (d < T)) and np.all((0 <= u) & (u < 1)) and np.all(e > 0)
+    assert not tasks.flags.writeable
+
+
+def test_search_on_memmap_matches_in_memory_pool(tmp_path, read_results):
+    dg = generator(tmp_path / "memmap")
+    dg.generate_tasks_chunked(20, False, 8)
+    dg.generate_hyperedge(5, 10)
+    dg.result_sink.close()
+
+    in_memory = generator(tmp_path / "memory")
+    in_memory.tasks = np.array(dg.tasks)
+    in_memory.generate_hyperedge(5, 10)
+    in_memory.result_sink.close()
+    assert read_results(dg.data_path) == read_results(in_memory.data_path)
+
+
+@pytest.mark.parametrize("generate", [uunifast, randfixedsum])
+@pytest.mark.parametrize("group_size, total_utilization", [(1, 0.5), (3, 0.9), (4, 2.5), (8, 8)])
+def test_group_sums_hit_target(generate, group_size, total_utilization):
+    np.random.seed(0)
+    utilizations = generate(200, group_size, total_utilization)
+    assert utilizations.shape == (200, group_size)
+    assert np.allclose(utilizations.sum(axis=1), total_utilization)
+    assert np.all((0 <= utilizations) & (utilizations <= 1))
+
+
+def test_last_group_is_scaled():
+    """不足 group_size 个任务的最后一组，利用率之和按任务数量等比例缩小"""
+    np.random.seed(0)
+    utilizations = generate_utilizations(10, "uunifast", group_size=4, total_utilization=2)
+    assert len(utilizations) == 10 and np.all(np.diff(utilizations) >= 0)
+    assert np.isclose(utilizations.sum(), 2 * 2 + 2 * 2 / 4)
+
+
+def test_task_classes_chunked_matches_unchunked(tmp_path):
+    """分块计算的等价类序号与对整个任务池调用 np.unique 相同，块的边界不影响结果"""
+    tasks = generator(tmp_path / "data").generate_tasks_chunked(500, True, 64)
+    tasks = np.vstack([tasks, tasks[::3]])     # 加入跨块的重复任务
+    _, expected = np.unique(tasks[:, 0:3], axis=0, return_inverse=True)
+    for chunk_size in (1, 7, 64, 10000):
+        assert np.array_equal(task_classes(tasks, chunk_size), expected.ravel())
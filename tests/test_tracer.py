@@ -0,0 +1,67 @@
+import tracer as tr
+
+
+class RecordingTracer(tr.NullTracer):
+    '''按顺序记录收到的回调'''
+    enabled = True
+
+    def __init__(self):
+        self.events = []
+
+    def on_run_start(self, scheduler, limit):
+        self.events.append(("run_start", limit))
+
+    def on_arrival(self, task, timepoint):
+        self.events.append(("arrival", task.id, timepoint))
+
+    def on_dispatch(self, processor, task, timepoint):
+        self.events.append(("dispatch", processor.id, task.id, timepoint))
+
+    def on_completion(self, processor, task, timepoint):
+        self.events.append(("completion", task.id, timepoint))
+
+    def on_deadline_miss(self, task, timepoint):
+        self.events.append(("deadline_miss", task.id, timepoint))
+
+    def on_run_end(self, scheduler, feasible):
+        self.events.append(("run_end", feasible, scheduler.termination))
+
+
+def run_traced(make_scheduler, engine, task_rows, speeds, tracer, truncated_lcm):
+    scheduler = make_scheduler(speeds, task_rows, engine)
+    scheduler.tracer = tracer
+    for processor in scheduler.processors:
+        processor.tracer = tracer
+    return scheduler.run(truncated_lcm=truncated_lcm, enable_history=False)
+
+
+def test_tracer_receives_events(make_scheduler):
+    for engine in ("rescan", "event_queue"):
+        tracer = RecordingTracer()
+        assert run_traced(make_scheduler, engine, [(1, 2, 2), (2, 4, 4)], [1], tracer, truncated_lcm=4) is True
+        assert tracer.events == [("run_start", 4),
+                                 ("arrival", 0, 0), ("arrival", 1, 0),
+                                 ("dispatch", "P0", 0, 0), ("completion", 0, 1),
+                                 ("dispatch", "P0", 1, 1), ("arrival", 0, 2),
+                                 ("dispatch", "P0", 0, 2), ("completion", 0, 3),
+                                 ("dispatch", "P0", 1, 3), ("completion", 1, 4),
+                                 ("arrival", 0, 4), ("arrival", 1, 4),
+                                 ("dispatch", "P0", 0, 4), ("completion", 0, 5),
+                                 ("run_end", True, "hyperperiod")], engine
+
+
+def test_tracer_reports_deadline_miss(make_scheduler):
+    tracer = RecordingTracer()
+    assert run_traced(make_scheduler, "rescan", [(2, 2, 4), (2, 2, 4)], [1], tracer, truncated_lcm=4) is False
+    assert ("deadline_miss", 1, 2) in tracer.events
+    assert tracer.events[-1] == ("run_end", False, "deadline_miss")
+
+
+def test_counting_tracer_in_search(make_generator):
+    """DataGenerator 的每次模拟都经过 SearchOptions 中的追踪器"""
+    tracer = tr.CountingTracer()
+    dg = make_generator("count", seed=2, tracer=tracer)
+    dg.generate_hyperedge(5, 10)
+    assert tracer.counts["runs"] == sum(dg.terminations.values()) > 0
+    assert tracer.counts["events"] >= tracer.counts["runs"]
+    assert tracer.counts["dispatches"] > 0 and tracer.counts["arrivals"] > 0
@@ -0,0 +1,97 @@
+import pickle
+import random
+
+import data_generater as data
+from visited_set import VisitedSetStore
+
+
+def random_task_id_sets(seed, count):
+    rng = random.Random(seed)
+    return [frozenset(rng.sample(range(1000), rng.randint(1, 8))) for _ in range(count)]
+
+
+def test_spill_keeps_membership(tmp_path):
+    store = VisitedSetStore(tmp_path / "visited", memory_limit=16)
+    task_id_sets = random_task_id_sets(0, 100)
+    for task_id_set in task_id_sets:
+        store.add(task_id_set)
+    expected = set(task_id_sets)
+    assert store.spilled > 0 and store.runs
+    assert len(store) == len(expected)
+    assert set(store) == expected
+    assert all(task_id_set in store for task_id_set in expected)
+    assert not any(task_id_set in store for task_id_set in random_task_id_sets(1, 200) if task_id_set not in expected)
+
+
+def test_compaction_merges_runs(tmp_path):
+    store = VisitedSetStore(tmp_path / "visited", memory_limit=4)
+    task_id_sets = random_task_id_sets(2, 4 * (VisitedSetStore.MAX_RUNS + 2))
+    for task_id_set in task_id_sets:
+        store.add(task_id_set)
+    assert len(store.runs) <= VisitedSetStore.MAX_RUNS
+    assert sorted(path.name for path in (tmp_path / "visited").iterdir()) == sorted(store.runs)
+    assert set(store) == set(task_id_sets)
+
+
+def test_bloom_filter_rebuilt_when_full(tmp_path):
+    store = VisitedSetStore(tmp_path / "visited", memory_limit=8)
+    task_id_sets = random_task_id_sets(3, 200)
+    capacities = set()
+    for task_id_set in task_id_sets:
+        store.add(task_id_set)
+        if store.bloom is not None:
+            capacities.add(store.bloom.capacity)
+    assert len(capacities) > 1
+    assert store.bloom.capacity >= store.spilled
+    # 重建后的布隆过滤器覆盖所有已溢出的键
+    spilled_keys = {VisitedSetStore.encode(task_id_set) for task_id_set in task_id_sets} - store.memory
+    assert len(spilled_keys) == store.spilled
+    assert all(key in store.bloom for key in spilled_keys)
+
+
+def test_pickle_across_checkpoint(tmp_path):
+    """检查点中保存的集合在之后的合并删除旧文件前仍然可以恢复"""
+    store = VisitedSetStore(tmp_path / "visited", memory_limit=4, keep_obsolete_runs=True)
+    first = random_task_id_sets(4, 20)
+    for task_id_set in first:
+        store.add(task_id_set)
+    checkpoint = pickle.dumps(store)
+
+    for task_id_set in random_task_id_sets(5, 4 * VisitedSetStore.MAX_RUNS):
+        store.add(task_id_set)
+    assert store.obsolete_runs  # 合并后旧文件仍被检查点引用
+
+    restored = pickle.loads(checkpoint)
+    assert set(restored) == set(first)
+    assert all(task_id_set in restored for task_id_set in first)
+
+    store.remove_obsolete_runs()
+    assert sorted(path.name for path in (tmp_path / "visited").iterdir()) == sorted(store.runs)
+
+
+def test_parallel_workers_spill(make_generator, read_results):
+    """并行搜索的工作进程按 visited_memory_limit 溢出负采样，结果与不限制时相同"""
+    results = []
+    for limit in (None, 2):
+        dg = make_generator(f"limit_{limit}", seed=7, visited_memory_limit=limit)
+        dg.SIMULATION_LIMIT = 20000
+        dg.generate_hyperedge(6, 6, workers=2)
+        dg.result_sink.close()
+        results.append(read_results(dg.data_path))
+        assert not (dg.data_path / "visited_workers").exists()
+    assert results[0] == results[1]
+
+
+def test_search_worker_uses_own_store(tmp_path, make_generator):
+    dg = make_generator("data", seed=7, visited_memory_limit=2)
+    dg.SIMULATION_LIMIT = 20000
+    data.init_search_worker(dg.processors, dg.tasks, dg.options, None, [], [], tmp_path / "workers")
+    try:
+        _, negative_samples, _, _ = data.search_worker([frozenset(range(6))], (0, 0))
+        store = data.search_worker_state["generator"].negative_samples
+    finally:
+        data.search_worker_state.clear()
+    assert isinstance(store, VisitedSetStore)
+    assert store.path.parent == tmp_path / "workers"
+    assert len(negative_samples) > store.memory_limit
+    assert len(store) == 0 and not store.path.exists()  # 结果返回后删除溢出的文件
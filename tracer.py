@@ -0,0 +1,151 @@
+from collections import Counter
+from logger_config import logger
+from tqdm import tqdm
+
+class NullTracer(object):
+    '''调度模拟的追踪器接口，默认的空追踪器
+    Scheduler 和 Processor 只在 tracer.enabled 为 True 时调用回调，空追踪器在模拟中没有任何开销。
+    自定义追踪器继承此类，将 enabled 设为 True 并重写需要的回调。
+    BatchScheduler 的向量化批量模拟不经过追踪器，只有其中改用 Scheduler 逐个模拟的部分会回调
+    '''
+    enabled = False
+
+    def on_run_start(self, scheduler, limit):
+        '''开始模拟，limit 为模拟时长的上限（可能为 math.inf）'''
+
+    def on_event(self, scheduler):
+        '''每个调度事件完成任务分配之后'''
+
+    def on_arrival(self, task, timepoint):
+        '''作业到达'''
+
+    def on_dispatch(self, processor, task, timepoint):
+        '''调度事件中将作业分配到处理器上'''
+
+    def on_completion(self, processor, task, timepoint):
+        '''作业执行完毕，在更新为下一个作业之前调用'''
+
+    def on_deadline_miss(self, task, timepoint):
+        '''检查出作业错过期限'''
+
+    def on_run_end(self, scheduler, feasible: bool):
+        '''模拟结束，结束原因见 scheduler.termination'''
+
+NULL_TRACER = NullTracer()
+
+class MultiTracer(NullTracer):
+    '''将回调依次转发给多个追踪器'''
+    enabled = True
+
+    def __init__(self, *tracers):
+        self.tracers = [tracer for tracer in tracers if tracer.enabled]
+
+    def on_run_start(self, scheduler, limit):
+        for tracer in self.tracers:
+            tracer.on_run_start(scheduler, limit)
+
+    def on_event(self, scheduler):
+        for tracer in self.tracers:
+            tracer.on_event(scheduler)
+
+    def on_arrival(self, task, timepoint):
+        for tracer in self.tracers:
+            tracer.on_arrival(task, timepoint)
+
+    def on_dispatch(self, processor, task, timepoint):
+        for tracer in self.tracers:
+            tracer.on_dispatch(processor, task, timepoint)
+
+    def on_completion(self, processor, task, timepoint):
+        for tracer in self.tracers:
+            tracer.on_completion(processor, task, timepoint)
+
+    def on_deadline_miss(self, task, timepoint):
+        for tracer in self.tracers:
+            tracer.on_deadline_miss(task, timepoint)
+
+    def on_run_end(self, scheduler, feasible: bool):
+        for tracer in self.tracers:
+            tracer.on_run_end(scheduler, feasible)
+
+class LoggingTracer(NullTracer):
+    '''以 debug 日志记录作业到达、完成、错过期限，以及每个调度事件的处理器分配情况'''
+    enabled = True
+
+    def on_event(self, scheduler):
+        processor_allocation = [(processor.id, processor.current_task.id)
+                                for processor in scheduler.processors if processor.current_task is not None]
+        logger.debug(f"Processor Allocation:{processor_allocation}")
+
+    def on_arrival(self, task, timepoint):
+        logger.debug(f"task {task.id} arrives at time {timepoint}")
+
+    def on_completion(self, processor, task, timepoint):
+        logger.debug(f"task {task.id} is completed at timepoint {timepoint}")
+
+    def on_deadline_miss(self, task, timepoint):
+        logger.debug(f"task {task.id} exceeded the deadline")
+
+    def on_run_end(self, scheduler, feasible: bool):
+        logger.debug(f"simulation ended at {scheduler.current_timepoint}: feasible={feasible}, termination={scheduler.termination}")
+
+class ProgressTracer(NullTracer):
+    '''用 tqdm 进度条显示模拟进度'''
+    enabled = True
+
+    def __init__(self):
+        self.pbar = None
+
+    def on_run_start(self, scheduler, limit):
+        self.pbar = tqdm(total=limit if limit != float("inf") else None, desc="Simulation Processing:", leave=False)
+        self.pbar.update(scheduler.current_timepoint)
+
+    def on_event(self, scheduler):
+        self.pbar.update(scheduler.current_timepoint - self.pbar.n)
+
+    def on_run_end(self, scheduler, feasible: bool):
+        self.pbar.close()
+        self.pbar = None
+
+    def __getstate__(self):
+        # 并行搜索时追踪器随 SearchOptions 传给工作进程，进度条不能序列化
+        return {"pbar": None}
+
+class CountingTracer(NullTracer):
+    '''统计模拟中各类事件的次数
+    Attributes:
+        last_run:   上一次模拟的事件统计
+        counts:     所有模拟的事件统计之和，"runs" 为模拟次数
+    '''
+    enabled = True
+
+    def __init__(self):
+        self.last_run = Counter()
+        self.counts = Counter()
+        self.start_timepoint = 0
+
+    def on_run_start(self, scheduler, limit):
+        self.last_run = Counter()
+        self.start_timepoint = scheduler.current_timepoint
+
+    def on_event(self, scheduler):
+        self.last_run["events"] += 1
+
+    def on_arrival(self, task, timepoint):
+        self.last_run["arrivals"] += 1
+
+    def on_dispatch(self, processor, task, timepoint):
+        self.last_run["dispatches"] += 1
+
+    def on_completion(self, processor, task, timepoint):
+        self.last_run["completions"] += 1
+
+    def on_deadline_miss(self, task, timepoint):
+        self.last_run["deadline_misses"] += 1
+
+    def on_run_end(self, scheduler, feasible: bool):
+        self.last_run["simulated_time"] = scheduler.current_timepoint - self.start_timepoint
+        self.counts.update(self.last_run)
+        self.counts["runs"] += 1
+
+TRACERS = {"none": NullTracer, "log": LoggingTracer, "progress": ProgressTracer, "count": CountingTracer}
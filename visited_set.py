@@ -0,0 +1,189 @@
+import hashlib
+import math
+import os
+import shutil
+import struct
+import numpy as np
+from pathlib import Path
+
+class BloomFilter(object):
+    '''布隆过滤器：判断键是否“可能存在”，不存在的键以 error_rate 的概率被误判为存在，存在的键不会被误判为不存在
+    每个键由 blake2b 摘要的两半做双重哈希得到 number_of_hashes 个位置，与进程无关，可随检查点保存
+    '''
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.number_of_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.number_of_hashes = max(1, round(self.number_of_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.number_of_bits + 7) // 8)
+
+    def positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.number_of_bits for i in range(self.number_of_hashes)]
+
+    def add(self, key: bytes):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[position >> 3] >> (position & 7) & 1 for position in self.positions(key))
+
+class VisitedSetStore(object):
+    '''紧凑、可溢出到磁盘的任务集集合，用于保存搜索中数量无上限的负采样
+    每个任务集编码为升序任务id的大端 uint32 字节串（键），约为 frozenset 的四分之一到十分之一大小。
+        内存层:     最多 memory_limit 个键的 set，达到上限后整体排序写入磁盘，成为一个只读的有序文件（run）
+        磁盘层:     path 中的 .npy 文件，定长字节串（较短的任务集以 0xFFFFFFFF 补齐）升序排列，以内存映射打开，二分查找
+        布隆过滤器: 覆盖所有磁盘层的键，不存在的任务集（搜索中的绝大多数查询）不需要读磁盘
+    磁盘层文件超过 MAX_RUNS 个时合并为一个，合并时需要将这些文件读入内存一次。
+    用法与 set 相同：add()、in、len()、迭代（返回 frozenset）、clear()
+    keep_obsolete_runs:
+        合并后不立即删除旧文件，由 remove_obsolete_runs 在新的检查点保存后删除，使旧检查点中引用的文件始终存在
+    '''
+    MAX_RUNS = 8
+    BLOOM_ERROR_RATE = 0.01
+    PADDING = b"\xff\xff\xff\xff"
+
+    def __init__(self, path: Path, memory_limit: int = 1000000, keep_obsolete_runs: bool = False):
+        self.path = Path(path)
+        self.memory_limit = memory_limit
+        self.keep_obsolete_runs = keep_obsolete_runs
+        self.memory = set()
+        self.runs = []              # 磁盘层文件名，按写入顺序
+        self.run_arrays = {}        # 文件名 -> 内存映射，不随检查点保存
+        self.obsolete_runs = []
+        self.spilled = 0            # 磁盘层的键数量
+        self.next_run = 0
+        self.bloom: BloomFilter = None
+
+    @staticmethod
+    def encode(task_id_set) -> bytes:
+        task_ids = sorted(task_id_set)
+        return struct.pack(f">{len(task_ids)}I", *task_ids)
+
+    @staticmethod
+    def decode(key: bytes) -> frozenset:
+        return frozenset(struct.unpack(f">{len(key) // 4}I", key))
+
+    def __contains__(self, task_id_set) -> bool:
+        key = self.encode(task_id_set)
+        if key in self.memory:
+            return True
+        if not self.runs or key not in self.bloom:
+            return False
+        return any(self.run_contains(self.run_arrays[run], key) for run in reversed(self.runs))
+
+    def run_contains(self, array: np.ndarray, key: bytes) -> bool:
+        width = array.dtype.itemsize
+        if len(key) > width:
+            return False
+        padded = key + self.PADDING * ((width - len(key)) // 4)
+        i = np.searchsorted(array, np.array([padded], dtype=array.dtype))[0]
+        # numpy 读出定长字节串时去掉末尾的 0 字节，比较前同样去掉
+        return i < len(array) and array[i] == padded.rstrip(b"\0")
+
+    def __len__(self) -> int:
+        return len(self.memory) + self.spilled
+
+    def __iter__(self):
+        for key in self.memory:
+            yield self.decode(key)
+        for run in self.runs:
+            array = self.run_arrays[run]
+            width = array.dtype.itemsize // 4
+            for start in range(0, len(array), 65536):
+                rows = np.ascontiguousarray(array[start:start + 65536]).view(">u4").reshape(-1, width)
+                for row in rows.tolist():
+                    yield frozenset(task_id for task_id in row if task_id != 0xFFFFFFFF)
+
+    def add(self, task_id_set):
+        if task_id_set in self:
+            return
+        self.memory.add(self.encode(task_id_set))
+        if len(self.memory) >= self.memory_limit:
+            self.spill()
+
+    def spill(self):
+        '''将内存层排序后写入一个新的磁盘层文件'''
+        if not self.memory:
+            return
+        width = max(len(key) for key in self.memory)
+        array = np.array([key + self.PADDING * ((width - len(key)) // 4) for key in self.memory], dtype=f"S{width}")
+        array.sort()
+        self.write_run(array)
+        self.spilled += len(self.memory)
+
+        if self.bloom is None or self.spilled > self.bloom.capacity:
+            self.rebuild_bloom() # 容量不足时误判率上升，按两倍的容量重建
+        else:
+            for key in self.memory:
+                self.bloom.add(key)
+        self.memory.clear()
+
+        if len(self.runs) > self.MAX_RUNS:
+            self.compact()
+
+    def write_run(self, array: np.ndarray):
+        os.makedirs(self.path, exist_ok=True)
+        run = f"run{self.next_run:05d}.npy"
+        self.next_run += 1
+        np.save(self.path / run, array)
+        self.runs.append(run)
+        self.run_arrays[run] = np.load(self.path / run, mmap_mode="r")
+
+    def rebuild_bloom(self):
+        self.bloom = BloomFilter(max(2 * self.spilled, self.memory_limit), self.BLOOM_ERROR_RATE)
+        for run in self.runs:
+            array = self.run_arrays[run]
+            width = array.dtype.itemsize
+            for start in range(0, len(array), 65536):
+                rows = np.ascontiguousarray(array[start:start + 65536])
+                lengths = (rows.view(">u4").reshape(len(rows), -1) != 0xFFFFFFFF).sum(axis=1) * 4
+                data = rows.tobytes()
+                for i, length in enumerate(lengths.tolist()):
+                    self.bloom.add(data[i * width:i * width + length])
+
+    def compact(self):
+        '''将所有磁盘层文件合并为一个，布隆过滤器中的键不变'''
+        width = max(self.run_arrays[run].dtype.itemsize for run in self.runs)
+        arrays = []
+        for run in self.runs:
+            array = np.ascontiguousarray(self.run_arrays[run]).view(np.uint8).reshape(-1, self.run_arrays[run].dtype.itemsize)
+            padding = np.full((len(array), width - array.shape[1]), 0xFF, dtype=np.uint8)
+            arrays.append(np.hstack((array, padding)))
+        array = np.ascontiguousarray(np.vstack(arrays)).view(f"S{width}").reshape(-1)
+        array.sort()
+
+        obsolete_runs = self.runs
+        self.runs = []
+        self.run_arrays = {}
+        self.write_run(array)
+        self.obsolete_runs.extend(obsolete_runs)
+        if not self.keep_obsolete_runs:
+            self.remove_obsolete_runs()
+
+    def remove_obsolete_runs(self):
+        for run in self.obsolete_runs:
+            if os.path.exists(self.path / run):
+                os.remove(self.path / run)
+        self.obsolete_runs = []
+
+    def clear(self):
+        '''清空集合并删除磁盘层文件'''
+        self.memory.clear()
+        self.runs = []
+        self.run_arrays = {}
+        self.obsolete_runs = []
+        self.spilled = 0
+        self.next_run = 0
+        self.bloom = None
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["run_arrays"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.run_arrays = {run: np.load(self.path / run, mmap_mode="r") for run in self.runs}